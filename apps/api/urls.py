@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import health_view
+from .views import cache_stats_view, health_view
 
 urlpatterns = [
     path("health/", health_view, name="health"),
+    path("cache-stats/", cache_stats_view, name="cache_stats"),
 ]
@@ -1,5 +1,16 @@
+from django.contrib.auth.decorators import login_required, user_passes_test
 from django.http import JsonResponse
 
+from apps.portfolio.cache import page_cache_stats
+
+_staff = lambda u: u.is_staff  # noqa: E731
+
 
 def health_view(_request):
     return JsonResponse({"status": "ok"})
+
+
+@login_required
+@user_passes_test(_staff)
+def cache_stats_view(_request):
+    return JsonResponse({"page_cache": page_cache_stats()})
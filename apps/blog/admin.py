@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import BlogPost, Category
+from .models import BlogPost, Category, PostTag, Tag
 
 
 @admin.register(Category)
@@ -9,9 +9,24 @@ class CategoryAdmin(admin.ModelAdmin):
     prepopulated_fields = {"slug": ("name",)}
 
 
+@admin.register(Tag)
+class TagAdmin(admin.ModelAdmin):
+    list_display = ("name", "slug")
+    search_fields = ("name", "slug")
+    prepopulated_fields = {"slug": ("name",)}
+
+
+class PostTagInline(admin.TabularInline):
+    model = PostTag
+    autocomplete_fields = ("tag",)
+    extra = 1
+
+
 @admin.register(BlogPost)
 class BlogPostAdmin(admin.ModelAdmin):
-    list_display = ("title", "author", "status", "published_at", "created_at")
+    list_display = ("title", "author", "status", "approved_comment_count", "pending_comment_count", "published_at")
     list_filter = ("status", "category")
-    search_fields = ("title", "content", "excerpt", "tags")
+    search_fields = ("title", "content", "excerpt", "tags__name")
+    inlines = [PostTagInline]
+    readonly_fields = ("approved_comment_count", "pending_comment_count")
     prepopulated_fields = {"slug": ("title",)}
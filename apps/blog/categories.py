@@ -0,0 +1,22 @@
+"""Published-post counts per category, cached until a post or category changes (see ``signals.py``)."""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import BlogPost, Category
+
+CATEGORY_COUNTS_KEY = "blog-category-counts"
+CATEGORY_COUNTS_TIMEOUT = 60 * 60
+
+
+def category_counts() -> list:
+    """Every category as ``{"name", "slug", "num_posts"}``, alphabetically."""
+    categories = cache.get(CATEGORY_COUNTS_KEY)
+    if categories is None:
+        published = Q(blogpost__status=BlogPost.Status.PUBLISHED)
+        categories = list(
+            Category.objects.annotate(num_posts=Count("blogpost", filter=published))
+            .order_by("name")
+            .values("name", "slug", "num_posts")
+        )
+        cache.set(CATEGORY_COUNTS_KEY, categories, CATEGORY_COUNTS_TIMEOUT)
+    return categories
@@ -4,6 +4,18 @@ from .models import BlogPost
 
 
 class BlogPostForm(forms.ModelForm):
+    tags = forms.CharField(required=False, max_length=220, help_text="Comma-separated tags")
+    field_order = ["title", "category", "excerpt", "content", "cover_image", "tags", "status"]
+
     class Meta:
         model = BlogPost
-        fields = ["title", "category", "excerpt", "content", "cover_image", "tags", "status"]
+        fields = ["title", "category", "excerpt", "content", "cover_image", "status"]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.instance.pk:
+            self.initial.setdefault("tags", self.instance.tag_text)
+
+    def _save_m2m(self):
+        super()._save_m2m()
+        self.instance.set_tags(self.cleaned_data["tags"])
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.models import BlogPost
+
+
+class Command(BaseCommand):
+    help = "Recompute word count, reading time and summary for existing blog posts in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        posts = BlogPost.objects.only("id", "excerpt", "content").order_by("pk")
+        last_pk = 0
+        updated = 0
+        while True:
+            batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for post in batch:
+                post.refresh_text_stats()
+            BlogPost.objects.bulk_update(batch, BlogPost.TEXT_STATS_FIELDS)
+            updated += len(batch)
+            last_pk = batch[-1].pk
+            self.stdout.write(f"Updated {updated} posts...")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled text stats for {updated} posts."))
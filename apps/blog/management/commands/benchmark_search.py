@@ -0,0 +1,81 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.blog.search import FIELD_WEIGHTS, InvertedIndex, document_terms
+
+
+class _Post:
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+
+
+class Command(BaseCommand):
+    help = "Measure built-in search latency on a synthetic corpus (no database writes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=50_000)
+        parser.add_argument("--queries", type=int, default=500)
+        parser.add_argument("--vocabulary", type=int, default=20_000)
+        parser.add_argument("--budget-ms", type=float, default=10.0)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        words = [f"w{i}" for i in range(options["vocabulary"])]
+        # Zipf-like word frequencies, as in natural text
+        cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+        stream = iter(rng.choices(words, cum_weights=cum_weights, k=options["posts"] * 84))
+
+        def text(n):
+            return " ".join(itertools.islice(stream, n))
+
+        def post():
+            return _Post(title=text(6), tag_text=text(3), excerpt=text(15), content=text(60))
+
+        posts = [post() for _ in range(options["posts"])]
+        started = time.perf_counter()
+        index = InvertedIndex()
+        for doc_id, item in enumerate(posts, start=1):
+            index.add(doc_id, document_terms(item))
+        build = time.perf_counter() - started
+        del posts
+
+        # Queries mix common and rare words, one to three terms each
+        queries = [
+            " ".join(rng.choices(words[:2000], k=rng.randint(1, 3))) for _ in range(options["queries"])
+        ]
+
+        def timed(query, before=None):
+            if before:
+                before()
+            started = time.perf_counter()
+            index.search(query)
+            return (time.perf_counter() - started) * 1000
+
+        # Cold: the first query of each term builds its candidate tier
+        cold = [timed(query) for query in queries]
+        warm = [timed(query) for query in queries]
+        # After save: an edited post is re-added before every query, as the save signal does
+        resave = lambda: index.add(rng.randint(1, options["posts"]), document_terms(post()))  # noqa: E731
+        after_save = [timed(query, resave) for query in queries]
+
+        self.stdout.write(f"Posts indexed:  {len(index)} ({len(index.postings)} terms, fields {', '.join(FIELD_WEIGHTS)})")
+        self.stdout.write(f"Index build:    {build:.1f}s")
+        p95s = {}
+        for label, timings in (("cold", cold), ("warm", warm), ("after-save", after_save)):
+            timings.sort()
+            p95s[label] = timings[int(len(timings) * 0.95) - 1]
+            self.stdout.write(
+                f"{label.capitalize() + ':':<16}p50 {statistics.median(timings):.2f} ms, "
+                f"p95 {p95s[label]:.2f} ms, max {timings[-1]:.2f} ms"
+            )
+
+        # Cold latency is reported only: tiers are built once per term per process.
+        over = [f"{label} p95 {p95s[label]:.2f} ms" for label in ("warm", "after-save") if p95s[label] > options["budget_ms"]]
+        if over:
+            raise CommandError(f"{'; '.join(over)} exceeds the {options['budget_ms']:.0f} ms budget.")
+        self.stdout.write(self.style.SUCCESS(f"Warm and after-save p95 within the {options['budget_ms']:.0f} ms budget."))
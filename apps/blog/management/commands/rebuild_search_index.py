@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.search import rebuild_index, use_postgres
+
+
+class Command(BaseCommand):
+    help = "Rebuild the built-in blog search index from every published post."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if use_postgres():
+            self.stdout.write("SEARCH_BACKEND is postgres; the GIN index is maintained by the database.")
+            return
+        indexed = rebuild_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} published posts."))
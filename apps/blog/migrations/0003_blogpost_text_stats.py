@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:04
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+# Frozen copies of BlogPost.WORDS_PER_MINUTE / SUMMARY_WORDS / refresh_text_stats
+WORDS_PER_MINUTE = 200
+SUMMARY_WORDS = 40
+BATCH_SIZE = 500
+
+
+def backfill_text_stats(apps, schema_editor):
+    BlogPost = apps.get_model("blog", "BlogPost")
+    posts = BlogPost.objects.only("id", "excerpt", "content").order_by("pk")
+    last_pk = 0
+    while batch := list(posts.filter(pk__gt=last_pk)[:BATCH_SIZE]):
+        for post in batch:
+            post.word_count = len(strip_tags(post.content).split())
+            post.reading_minutes = max(1, round(post.word_count / WORDS_PER_MINUTE))
+            post.summary = Truncator(strip_tags(post.excerpt or post.content)).words(SUMMARY_WORDS)
+        BlogPost.objects.bulk_update(batch, ["word_count", "reading_minutes", "summary"])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_blogpost_notification_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='reading_minutes',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='summary',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_text_stats, migrations.RunPython.noop),
+    ]
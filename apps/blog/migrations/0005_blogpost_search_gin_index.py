@@ -0,0 +1,32 @@
+from django.db import migrations
+
+INDEX_NAME = "blog_post_search_gin"
+
+
+def _search_index():
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    # Must match the expression built by ``apps.blog.search._postgres_search``.
+    return GinIndex(SearchVector("title", "tags", "excerpt", "content", config="english"), name=INDEX_NAME)
+
+
+def create_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(apps.get_model("blog", "BlogPost"), _search_index())
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(apps.get_model("blog", "BlogPost"), _search_index())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0004_postsearchdocument"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,134 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.template.defaultfilters import slugify
+
+SEARCH_INDEX_NAME = "blog_post_search_gin"
+BATCH_SIZE = 1000
+
+
+def _parse_tags(text):
+    # Frozen copy of ``apps.blog.models.parse_tags``
+    tags = {}
+    for name in (text or "").split(","):
+        name = " ".join(name.split())[:50]
+        slug = slugify(name)[:60]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
+def copy_tags(apps, schema_editor):
+    BlogPost = apps.get_model("blog", "BlogPost")
+    Tag = apps.get_model("blog", "Tag")
+    PostTag = apps.get_model("blog", "PostTag")
+
+    post_tags = []
+    names = {}
+    for post_id, text in BlogPost.objects.exclude(legacy_tags="").values_list("id", "legacy_tags").iterator():
+        parsed = _parse_tags(text)
+        post_tags.extend((post_id, slug) for slug in parsed)
+        for slug, name in parsed.items():
+            names.setdefault(slug, name)
+
+    Tag.objects.bulk_create(
+        [Tag(slug=slug, name=name) for slug, name in names.items()], batch_size=BATCH_SIZE, ignore_conflicts=True
+    )
+    tag_ids = dict(Tag.objects.values_list("slug", "id"))
+    PostTag.objects.bulk_create(
+        [PostTag(post_id=post_id, tag_id=tag_ids[slug]) for post_id, slug in post_tags],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def restore_tags(apps, schema_editor):
+    BlogPost = apps.get_model("blog", "BlogPost")
+    PostTag = apps.get_model("blog", "PostTag")
+
+    names = {}
+    for post_id, name in PostTag.objects.order_by("pk").values_list("post_id", "tag__name").iterator():
+        names.setdefault(post_id, []).append(name)
+    posts = list(BlogPost.objects.filter(pk__in=names).only("id"))
+    for post in posts:
+        post.legacy_tags = ", ".join(names[post.pk])[:220]
+    BlogPost.objects.bulk_update(posts, ["legacy_tags"], batch_size=BATCH_SIZE)
+
+
+def _search_index(*fields):
+    from django.contrib.postgres.indexes import GinIndex
+    from django.contrib.postgres.search import SearchVector
+
+    return GinIndex(SearchVector(*fields, config="english"), name=SEARCH_INDEX_NAME)
+
+
+def _swap_search_index(old_fields, new_fields):
+    def swap(apps, schema_editor):
+        if schema_editor.connection.vendor == "postgresql":
+            BlogPost = apps.get_model("blog", "BlogPost")
+            if old_fields:
+                schema_editor.remove_index(BlogPost, _search_index(*old_fields))
+            if new_fields:
+                schema_editor.add_index(BlogPost, _search_index(*new_fields))
+
+    return swap
+
+
+# The search vector indexed tag text; tags now live in their own table.
+WITH_TAGS = ("title", "legacy_tags", "excerpt", "content")
+WITHOUT_TAGS = ("title", "excerpt", "content")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_blogpost_search_gin_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Tag",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=50)),
+                ("slug", models.SlugField(max_length=60, unique=True)),
+            ],
+            options={
+                "ordering": ["name"],
+            },
+        ),
+        migrations.RenameField(
+            model_name="blogpost",
+            old_name="tags",
+            new_name="legacy_tags",
+        ),
+        migrations.CreateModel(
+            name="PostTag",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("post", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="blog.blogpost")),
+                ("tag", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="blog.tag")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["tag", "post"], name="blog_posttag_tag_post")],
+                "constraints": [models.UniqueConstraint(fields=("post", "tag"), name="blog_posttag_unique")],
+            },
+        ),
+        migrations.AddField(
+            model_name="blogpost",
+            name="tags",
+            field=models.ManyToManyField(blank=True, related_name="posts", through="blog.PostTag", to="blog.tag"),
+        ),
+        migrations.RunPython(copy_tags, restore_tags),
+        migrations.RunPython(
+            _swap_search_index(WITH_TAGS, None),
+            _swap_search_index(None, WITH_TAGS),
+        ),
+        migrations.RemoveField(
+            model_name="blogpost",
+            name="legacy_tags",
+        ),
+        migrations.RunPython(
+            _swap_search_index(None, WITHOUT_TAGS),
+            _swap_search_index(WITHOUT_TAGS, None),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:27
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_counts(apps, schema_editor):
+    BlogPost = apps.get_model("blog", "BlogPost")
+    Comment = apps.get_model("comments", "Comment")
+
+    def count(is_approved):
+        counts = (
+            Comment.objects.filter(post=OuterRef("pk"), is_approved=is_approved)
+            .order_by()
+            .values("post")
+            .annotate(n=Count("pk"))
+            .values("n")
+        )
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    BlogPost.objects.update(approved_comment_count=count(True), pending_comment_count=count(False))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_hot_query_indexes'),
+        ('comments', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='approved_comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='blogpost',
+            name='pending_comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,8 @@ from django.conf import settings
 from django.db import models, transaction
 from django.template.defaultfilters import slugify
 from django.urls import reverse
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
 
 
 class Category(models.Model):
@@ -17,6 +19,31 @@ class Category(models.Model):
         return self.name
 
 
+class Tag(models.Model):
+    name = models.CharField(max_length=50)
+    slug = models.SlugField(unique=True, max_length=60)
+
+    class Meta:
+        ordering = ["name"]
+
+    def get_absolute_url(self):
+        return reverse("blog_tag", kwargs={"slug": self.slug})
+
+    def __str__(self):
+        return self.name
+
+
+def parse_tags(text: str) -> dict:
+    """``{slug: name}`` for a comma-separated tag string; later duplicates of a slug are dropped."""
+    tags = {}
+    for name in (text or "").split(","):
+        name = " ".join(name.split())[:50]
+        slug = slugify(name)[:60]
+        if slug and slug not in tags:
+            tags[slug] = name
+    return tags
+
+
 class BlogPost(models.Model):
     class Status(models.TextChoices):
         DRAFT = "draft", "Draft"
@@ -29,14 +56,47 @@ class BlogPost(models.Model):
     excerpt = models.TextField(blank=True)
     content = models.TextField()
     cover_image = models.ImageField(upload_to="blog/", blank=True, null=True)
-    tags = models.CharField(max_length=220, blank=True, help_text="Comma-separated tags")
+    tags = models.ManyToManyField(Tag, through="PostTag", related_name="posts", blank=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.DRAFT)
+    # Derived from excerpt/content in save() so list pages never need to load ``content``
+    word_count = models.PositiveIntegerField(default=0)
+    reading_minutes = models.PositiveIntegerField(default=1)
+    summary = models.TextField(blank=True)
     published_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Maintained with F() updates by apps.comments.services; `reconcile_comment_counts` repairs drift
+    approved_comment_count = models.PositiveIntegerField(default=0)
+    pending_comment_count = models.PositiveIntegerField(default=0)
+
+    # Aggregated subscriber-notification results (written by the chord callback)
+    notified_sent = models.PositiveIntegerField(default=0)
+    notified_failed = models.PositiveIntegerField(default=0)
+    notified_skipped = models.PositiveIntegerField(default=0)
+    notified_at = models.DateTimeField(blank=True, null=True)
+
     class Meta:
         ordering = ["-published_at", "-created_at"]
+        indexes = [
+            # Category pages: WHERE category_id = ? AND status = 'published' ORDER BY published_at DESC, id DESC
+            models.Index(fields=["category", "status", "-published_at", "-id"], name="blog_post_cat_status_pub"),
+            # WHERE status = ? in the default ordering (home page, dashboard counts)
+            models.Index(fields=["status", "-published_at", "-created_at"], name="blog_post_status_recent"),
+            # Blog list / feed keyset pages: WHERE status = ? ORDER BY published_at DESC, id DESC.
+            # Not partial: the status arrives as a query parameter, which a partial index cannot match.
+            models.Index(fields=["status", "-published_at", "-id"], name="blog_post_published_keyset"),
+        ]
+
+    TEXT_STATS_FIELDS = ("word_count", "reading_minutes", "summary")
+    WORDS_PER_MINUTE = 200
+    SUMMARY_WORDS = 40
+
+    def refresh_text_stats(self):
+        """Recompute ``word_count``, ``reading_minutes`` and ``summary`` from the post text."""
+        self.word_count = len(strip_tags(self.content).split())
+        self.reading_minutes = max(1, round(self.word_count / self.WORDS_PER_MINUTE))
+        self.summary = Truncator(strip_tags(self.excerpt or self.content)).words(self.SUMMARY_WORDS)
 
     def save(self, *args, **kwargs):
         from django.utils import timezone
@@ -49,6 +109,11 @@ class BlogPost(models.Model):
             self.slug = slugify(self.title)
         if self.status == BlogPost.Status.PUBLISHED and not self.published_at:
             self.published_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"content", "excerpt"} & set(update_fields):
+            self.refresh_text_stats()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *self.TEXT_STATS_FIELDS}
         super().save(*args, **kwargs)
 
         newly_published = self.status == BlogPost.Status.PUBLISHED and not was_published
@@ -62,8 +127,43 @@ class BlogPost(models.Model):
             # Run AFTER the transaction commits so the post is readable by the task
             transaction.on_commit(_notify)
 
+    def set_tags(self, text: str):
+        """Replace this post's tags with those in a comma-separated string, creating new tags in bulk."""
+        parsed = parse_tags(text)
+        Tag.objects.bulk_create([Tag(slug=slug, name=name) for slug, name in parsed.items()], ignore_conflicts=True)
+        self.tags.set(Tag.objects.filter(slug__in=parsed))
+
+    @property
+    def tag_text(self) -> str:
+        return ", ".join(tag.name for tag in self.tags.all())
+
     def get_absolute_url(self):
         return reverse("blog_detail", kwargs={"slug": self.slug})
 
     def __str__(self):
         return self.title
+
+
+class PostTag(models.Model):
+    post = models.ForeignKey(BlogPost, on_delete=models.CASCADE)
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["post", "tag"], name="blog_posttag_unique")]
+        # Tag archives and counts scan by tag; the unique constraint covers lookups by post.
+        indexes = [models.Index(fields=["tag", "post"], name="blog_posttag_tag_post")]
+
+    def __str__(self):
+        return f"{self.post_id} → {self.tag_id}"
+
+
+class PostSearchDocument(models.Model):
+    """A published post's analysed terms for the built-in search index (see ``search.py``)."""
+
+    post = models.OneToOneField(BlogPost, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    terms = models.JSONField(default=dict)
+    length = models.FloatField(default=0)
+    indexed_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    def __str__(self):
+        return f"Search document for post {self.post_id}"
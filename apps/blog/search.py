@@ -0,0 +1,321 @@
+"""
+Full-text search over published blog posts.
+
+The built-in backend keeps a BM25-ranked inverted index in process memory.
+Each post's analysed terms are persisted in ``PostSearchDocument`` so every
+process can load the index without re-tokenising the whole blog, and saves
+and deletes update it incrementally (see ``signals.py``). A shared cache
+version tells other processes to pull the documents that changed since their
+last sync.
+
+With ``SEARCH_BACKEND = "postgres"`` on PostgreSQL, queries go to a
+``SearchVector`` expression backed by a GIN index instead.
+"""
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.template.defaultfilters import slugify
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import BlogPost, PostSearchDocument, PostTag
+
+VERSION_KEY = "blog-search-version"
+# How long a process trusts its in-memory index before re-checking the shared version.
+LOCAL_TTL = 5
+# Each sync re-reads documents stamped this long before the previous sync: a document
+# stamped before it but committed after it, or stamped by a host whose clock lags, is
+# not missed. Re-adding a document is idempotent.
+SYNC_OVERLAP = timedelta(minutes=2)
+
+# Term frequency multiplier per field: a title match outranks a body match.
+FIELD_WEIGHTS = {"title": 3, "tag_text": 2, "excerpt": 2, "content": 1}
+# Columns behind FIELD_WEIGHTS; tag changes are picked up from ``m2m_changed`` instead.
+TEXT_FIELDS = ("title", "excerpt", "content")
+INDEXED_FIELDS = frozenset({"status", *TEXT_FIELDS})
+K1 = 1.2
+B = 0.75
+# Candidates come from each term's highest-impact postings (its tier). The tier also
+# bounds what any other document can score, so when the best results beat that bound
+# they are exact; otherwise the query falls back to scoring every posting.
+CANDIDATE_TIER = 1000
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have how i if in into is it its of on or our "
+    "so than that the their then there these this to was we were what when which who why "
+    "will with you your".split()
+)
+
+
+def tokenize(text: str) -> list:
+    text = text or ""
+    if "<" in text:
+        text = strip_tags(text)
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def document_terms(post) -> dict:
+    """Weighted term frequencies of a post across ``FIELD_WEIGHTS``."""
+    terms = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        for token in tokenize(getattr(post, field)):
+            terms[token] += weight
+    return dict(terms)
+
+
+def _impact(tf, length, avg_length):
+    """The length-normalised tf factor of BM25, in ``[0, 1)``."""
+    return tf / (tf + K1 * (1 - B + B * length / avg_length))
+
+
+class InvertedIndex:
+    """
+    In-memory BM25 index: ``term -> {doc_id: weighted tf}``.
+
+    A common term's tier is ``[doc ids, bound, average length]``: its top
+    ``CANDIDATE_TIER`` postings by impact and the highest impact of any posting
+    left out, both at the average document length of the time. ``add`` and
+    ``remove`` keep tiers current instead of discarding them.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0.0
+        self._tiers = {}
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, doc_id, terms: dict, length: float = None):
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        length = float(sum(terms.values()) if length is None else length)
+        self.doc_terms[doc_id] = tuple(terms)
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+            tier = self._tiers.get(term)
+            # Below the bound the document is already covered by it.
+            if tier is not None and _impact(tf, length, tier[2]) > tier[1]:
+                tier[0].add(doc_id)
+
+    def remove(self, doc_id):
+        if doc_id not in self.doc_lengths:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in self.doc_terms.pop(doc_id):
+            docs = self.postings[term]
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+                self._tiers.pop(term, None)
+            elif term in self._tiers:
+                self._tiers[term][0].discard(doc_id)
+
+    def _candidates(self, term, docs, avg_length):
+        """``(doc ids to score, upper bound on the impact of every other posting)``."""
+        if len(docs) <= CANDIDATE_TIER:
+            return docs.keys(), 0.0
+        tier = self._tiers.get(term)
+        if tier is None or len(tier[0]) > 2 * CANDIDATE_TIER:
+            lengths = self.doc_lengths
+            ranked = heapq.nlargest(
+                CANDIDATE_TIER + 1, docs, key=lambda d: _impact(docs[d], lengths[d], avg_length)
+            )
+            left_out = ranked.pop()
+            tier = self._tiers[term] = [set(ranked), _impact(docs[left_out], lengths[left_out], avg_length), avg_length]
+        # A longer average raises every impact, by at most the same ratio.
+        return tier[0], tier[1] * max(1.0, avg_length / tier[2])
+
+    def _score(self, candidates, weighted, avg_length) -> dict:
+        lengths = self.doc_lengths
+        scores = {}
+        for doc_id in candidates:
+            length = lengths[doc_id]
+            score = 0.0
+            for docs, idf in weighted:
+                tf = docs.get(doc_id)
+                if tf:
+                    score += idf * (K1 + 1) * _impact(tf, length, avg_length)
+            scores[doc_id] = score
+        return scores
+
+    def search(self, query: str, limit: int = 20) -> list:
+        """``[(doc_id, score), ...]`` best first."""
+        n_docs = len(self.doc_lengths)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+        weighted = []
+        candidates = set()
+        # Best score a document outside every tier could reach
+        ceiling = 0.0
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if docs:
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                weighted.append((docs, idf))
+                tier, bound = self._candidates(term, docs, avg_length)
+                candidates.update(tier)
+                ceiling += idf * (K1 + 1) * bound
+        if not weighted:
+            return []
+
+        key = lambda item: (item[1], item[0])  # noqa: E731
+        best = heapq.nlargest(limit, self._score(candidates, weighted, avg_length).items(), key=key)
+        if ceiling and (len(best) < limit or best[-1][1] <= ceiling):
+            candidates = set().union(*(docs.keys() for docs, _ in weighted))
+            best = heapq.nlargest(limit, self._score(candidates, weighted, avg_length).items(), key=key)
+        return best
+
+
+_lock = threading.Lock()
+_local = {"index": None, "version": None, "synced_at": None, "checked_at": 0.0}
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _bump_version():
+    try:
+        version = cache.incr(VERSION_KEY)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(VERSION_KEY, version, timeout=None)
+    return version
+
+
+def _load(index, documents):
+    for doc in documents.values_list("post_id", "terms", "length").iterator(chunk_size=2000):
+        index.add(*doc)
+
+
+def get_index() -> InvertedIndex:
+    """This process's index, loaded on first use and synced when another process changed it."""
+    with _lock:
+        now = time.monotonic()
+        index = _local["index"]
+        if index is not None and now - _local["checked_at"] < LOCAL_TTL:
+            return index
+
+        version = _current_version()
+        started = timezone.now()
+        if index is None:
+            index = InvertedIndex()
+            _load(index, PostSearchDocument.objects.all())
+        elif version != _local["version"]:
+            _load(index, PostSearchDocument.objects.filter(indexed_at__gte=_local["synced_at"] - SYNC_OVERLAP))
+            live = set(PostSearchDocument.objects.values_list("post_id", flat=True))
+            for doc_id in set(index.doc_lengths) - live:
+                index.remove(doc_id)
+        else:
+            started = _local["synced_at"]
+        _local.update(index=index, version=version, synced_at=started, checked_at=now)
+        return index
+
+
+def reset_index():
+    """Forget this process's index; the next search reloads it from the database."""
+    with _lock:
+        _local.update(index=None, version=None, synced_at=None, checked_at=0.0)
+
+
+def use_postgres() -> bool:
+    return getattr(settings, "SEARCH_BACKEND", "builtin") == "postgres" and connection.vendor == "postgresql"
+
+
+def index_post(post):
+    """Store (or drop, if unpublished) a post's search document and apply it to the local index."""
+    if use_postgres():
+        return
+    if post.status != BlogPost.Status.PUBLISHED:
+        remove_post(post.pk)
+        return
+    terms = document_terms(post)
+    length = float(sum(terms.values()))
+    PostSearchDocument.objects.update_or_create(post_id=post.pk, defaults={"terms": terms, "length": length})
+    with _lock:
+        if _local["index"] is not None:
+            _local["index"].add(post.pk, terms, length)
+    _bump_version()
+
+
+def remove_post(post_id):
+    if use_postgres():
+        return
+    PostSearchDocument.objects.filter(post_id=post_id).delete()
+    with _lock:
+        if _local["index"] is not None:
+            _local["index"].remove(post_id)
+    _bump_version()
+
+
+def rebuild_index(batch_size: int = 500) -> int:
+    """Re-analyse every published post into ``PostSearchDocument``; returns the number indexed."""
+    PostSearchDocument.objects.all().delete()
+    posts = (
+        BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED)
+        .only("id", *TEXT_FIELDS)
+        .prefetch_related("tags")
+        .order_by("pk")
+    )
+    last_pk = 0
+    indexed = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk)[:batch_size])
+        if not batch:
+            break
+        documents = []
+        for post in batch:
+            terms = document_terms(post)
+            documents.append(PostSearchDocument(post=post, terms=terms, length=float(sum(terms.values()))))
+        PostSearchDocument.objects.bulk_create(documents)
+        indexed += len(batch)
+        last_pk = batch[-1].pk
+    reset_index()
+    _bump_version()
+    return indexed
+
+
+def _postgres_search(query, limit):
+    from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+
+    # Must match the GIN index expression created in migration 0006_tags.
+    vector = SearchVector(*TEXT_FIELDS, config="english")
+    search_query = SearchQuery(query, config="english")
+    # Two id sets joined with UNION rather than one OR: each half can use its own
+    # index (the GIN index, the tag slug), which an OR with EXISTS rules out.
+    matched = BlogPost.objects.annotate(search=vector).filter(search=search_query).order_by().values("pk")
+    tagged = PostTag.objects.filter(tag__slug=slugify(query)).order_by().values("post_id")
+    return list(
+        BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED, pk__in=matched.union(tagged))
+        .annotate(rank=SearchRank(vector, search_query))
+        .order_by("-rank", "-pk")
+        .values_list("pk", "rank")[:limit]
+    )
+
+
+def search_posts(query: str, limit: int = 20) -> list:
+    """Ranked ``[(post_id, score), ...]`` for ``query`` from the configured backend."""
+    if not query.strip():
+        return []
+    if use_postgres():
+        return _postgres_search(query, limit)
+    return get_index().search(query, limit)
@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .categories import CATEGORY_COUNTS_KEY
+from .models import BlogPost, Category, Tag
+from .search import INDEXED_FIELDS, index_post, remove_post
+from .tags import TAG_CLOUD_KEY
+
+
+def _index_post(sender, instance, update_fields=None, **kwargs):
+    # Counter and notification updates don't change what the index holds.
+    if update_fields is not None and not INDEXED_FIELDS & set(update_fields):
+        return
+    index_post(instance)
+
+
+def _remove_post(sender, instance, **kwargs):
+    remove_post(instance.pk)
+
+
+def _tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    cache.delete(TAG_CLOUD_KEY)
+    posts = BlogPost.objects.filter(pk__in=pk_set or ()) if reverse else [instance]
+    for post in posts:
+        index_post(post)
+
+
+def _invalidate_listing_counts(sender, **kwargs):
+    cache.delete_many([TAG_CLOUD_KEY, CATEGORY_COUNTS_KEY])
+
+
+post_save.connect(_index_post, sender=BlogPost, dispatch_uid="blog-search-index")
+post_delete.connect(_remove_post, sender=BlogPost, dispatch_uid="blog-search-remove")
+m2m_changed.connect(_tags_changed, sender=BlogPost.tags.through, dispatch_uid="blog-tags-changed")
+for _model in (BlogPost, Category, Tag):
+    post_save.connect(_invalidate_listing_counts, sender=_model, dispatch_uid=f"listing-counts-save-{_model.__name__}")
+    post_delete.connect(_invalidate_listing_counts, sender=_model, dispatch_uid=f"listing-counts-delete-{_model.__name__}")
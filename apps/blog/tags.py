@@ -0,0 +1,36 @@
+"""Tag cloud: published-post counts per tag, cached until a post or tag changes (see ``signals.py``)."""
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import BlogPost, Tag
+
+TAG_CLOUD_KEY = "blog-tag-cloud"
+TAG_CLOUD_TIMEOUT = 60 * 60
+TAG_CLOUD_SIZE = 30
+# Font-size steps used by the template (``tag-cloud-1`` … ``tag-cloud-5``)
+TAG_CLOUD_STEPS = 5
+
+
+def _build_tag_cloud() -> list:
+    published = Q(posts__status=BlogPost.Status.PUBLISHED)
+    tags = list(
+        Tag.objects.annotate(num_posts=Count("posts", filter=published))
+        .filter(num_posts__gt=0)
+        .order_by("-num_posts", "name")
+        .values("name", "slug", "num_posts")[:TAG_CLOUD_SIZE]
+    )
+    if tags:
+        most = tags[0]["num_posts"]
+        for tag in tags:
+            tag["weight"] = 1 + round((TAG_CLOUD_STEPS - 1) * tag["num_posts"] / most) if most > 1 else 1
+        tags.sort(key=lambda tag: tag["name"].lower())
+    return tags
+
+
+def tag_cloud() -> list:
+    """The most used tags as ``{"name", "slug", "num_posts", "weight"}`` dicts, alphabetically."""
+    tags = cache.get(TAG_CLOUD_KEY)
+    if tags is None:
+        tags = _build_tag_cloud()
+        cache.set(TAG_CLOUD_KEY, tags, TAG_CLOUD_TIMEOUT)
+    return tags
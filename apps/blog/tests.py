@@ -1,7 +1,19 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
 
-from .models import BlogPost
+from . import search
+from .categories import category_counts
+from .models import BlogPost, Category, PostSearchDocument, Tag, parse_tags
+from .tags import tag_cloud
+from .views import BLOG_PAGE_SIZE
 
 
 class BlogPostModelTest(TestCase):
@@ -15,3 +27,261 @@ class BlogPostModelTest(TestCase):
         )
         self.assertEqual(post.slug, "my-first-article")
         self.assertIsNotNone(post.published_at)
+
+    def test_text_stats_are_stored_on_save(self):
+        author = User.objects.create_user(username="writer", password="pass1234")
+        post = BlogPost.objects.create(title="Long read", author=author, content="word " * 450)
+        self.assertEqual(post.word_count, 450)
+        self.assertEqual(post.reading_minutes, 2)
+        self.assertEqual(len(post.summary.split()), BlogPost.SUMMARY_WORDS)
+
+        post.excerpt = "Short teaser"
+        post.save(update_fields=["excerpt"])
+        post.refresh_from_db()
+        self.assertEqual(post.summary, "Short teaser")
+
+    def test_backfill_command_recomputes_stale_stats(self):
+        author = User.objects.create_user(username="writer", password="pass1234")
+        post = BlogPost.objects.create(title="Old post", author=author, content="one two three")
+        BlogPost.objects.filter(pk=post.pk).update(word_count=0, summary="")
+        call_command("backfill_post_stats", "--batch-size", "1", stdout=StringIO())
+        post.refresh_from_db()
+        self.assertEqual(post.word_count, 3)
+        self.assertEqual(post.summary, "one two three")
+
+
+class BlogListPaginationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        author = User.objects.create_user(username="writer", password="pass1234")
+        published_at = timezone.now()
+        for i in range(BLOG_PAGE_SIZE + 3):
+            BlogPost.objects.create(
+                title=f"Post {i}",
+                author=author,
+                content="word " * 50,
+                status=BlogPost.Status.PUBLISHED,
+                # Several posts share a timestamp so the id tie-breaker is exercised.
+                published_at=published_at - timedelta(minutes=i // 3),
+            )
+
+    def test_cursor_pages_cover_every_post_once(self):
+        response = self.client.get(reverse("blog_list"))
+        first_page = [post.pk for post in response.context["posts"]]
+        self.assertEqual(len(first_page), BLOG_PAGE_SIZE)
+
+        data = self.client.get(reverse("blog_feed"), {"cursor": response.context["next_cursor"]}).json()
+        self.assertEqual(len(data["posts"]), 3)
+        self.assertIsNone(data["next_cursor"])
+        titles = [post.title for post in response.context["posts"]] + [post["title"] for post in data["posts"]]
+        self.assertCountEqual(titles, [f"Post {i}" for i in range(BLOG_PAGE_SIZE + 3)])
+
+    def test_list_does_not_load_post_bodies(self):
+        response = self.client.get(reverse("blog_list"))
+        self.assertIn("content", response.context["posts"][0].get_deferred_fields())
+
+    def test_invalid_cursor_is_rejected_by_feed(self):
+        self.assertEqual(self.client.get(reverse("blog_feed"), {"cursor": "not-a-cursor"}).status_code, 400)
+
+
+class BlogSearchTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        search.reset_index()
+        self.author = User.objects.create_user(username="writer", password="pass1234")
+
+    def tearDown(self):
+        search.reset_index()
+
+    def _post(self, title, content, **kwargs):
+        kwargs.setdefault("status", BlogPost.Status.PUBLISHED)
+        return BlogPost.objects.create(title=title, author=self.author, content=content, **kwargs)
+
+    def test_title_match_outranks_body_match(self):
+        body = self._post("Notes on deployment", "We tuned postgres indexes for the blog.")
+        title = self._post("Postgres indexes explained", "A walkthrough of index types.")
+        self._post("Unrelated", "Nothing to see here.")
+        ranked = [post_id for post_id, _ in search.search_posts("postgres indexes")]
+        self.assertEqual(ranked, [title.pk, body.pk])
+
+    def test_drafts_are_not_indexed_and_unpublishing_removes_post(self):
+        self._post("Draft about celery", "celery", status=BlogPost.Status.DRAFT)
+        post = self._post("Celery retries", "Backoff and retries.")
+        self.assertEqual([pid for pid, _ in search.search_posts("celery")], [post.pk])
+
+        post.status = BlogPost.Status.DRAFT
+        post.save()
+        self.assertEqual(search.search_posts("celery"), [])
+        self.assertFalse(PostSearchDocument.objects.exists())
+
+    def test_edits_and_deletes_update_the_index(self):
+        post = self._post("Caching pages", "Versioned keys.")
+        search.get_index()  # loaded before the edit, so the edit must be applied incrementally
+        post.title = "Keyset pagination"
+        post.save()
+        self.assertEqual(search.search_posts("caching"), [])
+        self.assertEqual([pid for pid, _ in search.search_posts("keyset")], [post.pk])
+
+        post.delete()
+        self.assertEqual(search.search_posts("keyset"), [])
+
+    def test_index_syncs_changes_made_by_another_process(self):
+        post = self._post("Redis streams", "Consumer groups.")
+        index = search.get_index()
+        # Another process rebuilds; this process only notices through the shared version.
+        PostSearchDocument.objects.filter(post=post).update(terms={"kafka": 3}, indexed_at=timezone.now())
+        search._bump_version()
+        search._local["checked_at"] = 0.0
+        self.assertIs(search.get_index(), index)
+        self.assertEqual([pid for pid, _ in search.search_posts("kafka")], [post.pk])
+
+    def test_sync_picks_up_documents_committed_after_they_were_stamped(self):
+        post = self._post("Redis streams", "Consumer groups.")
+        search.get_index()
+        # Stamped before this process's last sync, but its transaction committed only now.
+        stamped = search._local["synced_at"] - timedelta(seconds=30)
+        PostSearchDocument.objects.filter(post=post).update(terms={"kafka": 3}, indexed_at=stamped)
+        search._bump_version()
+        search._local["checked_at"] = 0.0
+        self.assertEqual([pid for pid, _ in search.search_posts("kafka")], [post.pk])
+
+    def test_rebuild_command_reindexes_every_published_post(self):
+        post = self._post("Celery chords", "Fan out, fan in.")
+        PostSearchDocument.objects.all().delete()
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual([pid for pid, _ in search.search_posts("chords")], [post.pk])
+
+    def test_search_view_renders_html_and_json(self):
+        post = self._post("Django signals", "Receivers and senders.", excerpt="All about signals.")
+        response = self.client.get(reverse("blog_search"), {"q": "signals"})
+        self.assertContains(response, post.title)
+
+        data = self.client.get(reverse("blog_search"), {"q": "signals", "format": "json"}).json()
+        self.assertEqual([r["url"] for r in data["results"]], [post.get_absolute_url()])
+        self.assertEqual(self.client.get(reverse("blog_search"), {"q": "zzz", "format": "json"}).json()["results"], [])
+
+    def test_candidate_tier_keeps_best_matches_for_common_terms(self):
+        index = search.InvertedIndex()
+        for doc_id in range(1, search.CANDIDATE_TIER * 2):
+            index.add(doc_id, {"common": 1, "filler": 20})
+        index.add(0, {"common": 5})
+        self.assertEqual(index.search("common", limit=1)[0][0], 0)
+
+    def test_document_outside_every_tier_still_wins_on_all_terms(self):
+        index = search.InvertedIndex()
+        n = search.CANDIDATE_TIER * 2
+        # Each term's tier holds its own heavy hitters; document 0 is outside both tiers.
+        for doc_id in range(1, n + 1):
+            index.add(doc_id, {"alpha": 3, "filler": 1} if doc_id % 2 else {"beta": 3, "filler": 1})
+        for doc_id in range(n + 1, n * 2):
+            index.add(doc_id, {"alpha": 1, "beta": 1, "filler": 30})
+        index.add(0, {"alpha": 2, "beta": 2, "filler": 2})
+        self.assertEqual(index.search("alpha beta", limit=1)[0][0], 0)
+        tiered = index.search("alpha beta")
+        with mock.patch.object(search, "CANDIDATE_TIER", len(index)):
+            self.assertEqual(tiered, index.search("alpha beta"))
+
+    def test_saves_keep_candidate_tiers(self):
+        index = search.InvertedIndex()
+        for doc_id in range(1, search.CANDIDATE_TIER * 2):
+            index.add(doc_id, {"common": 1, "filler": 20})
+        index.search("common")
+        tier = index._tiers["common"]
+        index.add(1, {"common": 9})
+        index.remove(2)
+        self.assertIs(index._tiers["common"], tier)
+        self.assertEqual(index.search("common", limit=1)[0][0], 1)
+        self.assertNotIn(2, tier[0])
+
+
+class TagTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        search.reset_index()
+        self.staff = User.objects.create_user(username="editor", password="pass1234", is_staff=True)
+
+    def tearDown(self):
+        search.reset_index()
+
+    def _post(self, title, tags, status=BlogPost.Status.PUBLISHED):
+        post = BlogPost.objects.create(title=title, author=self.staff, content="Body", status=status)
+        post.set_tags(tags)
+        return post
+
+    def test_parse_tags_normalises_and_dedupes(self):
+        self.assertEqual(parse_tags(" Django ,  Deep   Learning, django,, "), {"django": "Django", "deep-learning": "Deep Learning"})
+
+    def test_set_tags_reuses_existing_tags(self):
+        first = self._post("One", "Django, Celery")
+        second = self._post("Two", "django, Redis")
+        self.assertEqual(Tag.objects.count(), 3)
+        self.assertEqual(second.tag_text, "Django, Redis")
+        first.set_tags("Redis")
+        self.assertEqual([tag.slug for tag in first.tags.all()], ["redis"])
+
+    def test_editor_form_saves_tags(self):
+        self.client.force_login(self.staff)
+        self.client.post(reverse("blog_create"), {
+            "title": "Tagged from the editor", "content": "Body", "tags": "Python, Django", "status": "published",
+        })
+        post = BlogPost.objects.get(title="Tagged from the editor")
+        self.assertEqual(post.tag_text, "Django, Python")
+
+        response = self.client.get(reverse("blog_edit", kwargs={"slug": post.slug}))
+        self.assertEqual(response.context["form"].initial["tags"], "Django, Python")
+        self.assertEqual([pid for pid, _ in search.search_posts("python")], [post.pk])
+
+    def test_tag_archive_lists_only_published_posts_with_the_tag(self):
+        tagged = self._post("Tagged", "ml")
+        self._post("Draft", "ml", status=BlogPost.Status.DRAFT)
+        self._post("Other", "web")
+        response = self.client.get(reverse("blog_tag", kwargs={"slug": "ml"}))
+        self.assertEqual([post.pk for post in response.context["posts"]], [tagged.pk])
+        self.assertEqual(self.client.get(reverse("blog_tag", kwargs={"slug": "missing"})).status_code, 404)
+
+    def test_tag_cloud_is_cached_and_invalidated(self):
+        self._post("One", "ml, web")
+        self._post("Two", "ml")
+        self.assertEqual([(t["slug"], t["num_posts"]) for t in tag_cloud()], [("ml", 2), ("web", 1)])
+        with self.assertNumQueries(0):
+            tag_cloud()
+
+        self._post("Three", "web")
+        self.assertEqual([(t["slug"], t["num_posts"]) for t in tag_cloud()], [("ml", 2), ("web", 2)])
+
+
+class CategoryPageTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        author = User.objects.create_user(username="writer", password="pass1234")
+        self.ml = Category.objects.create(name="Machine Learning")
+        self.web = Category.objects.create(name="Web")
+        published = BlogPost.Status.PUBLISHED
+        for i in range(BLOG_PAGE_SIZE + 2):
+            BlogPost.objects.create(title=f"ML {i}", author=author, content="Body", category=self.ml, status=published)
+        BlogPost.objects.create(title="Web 1", author=author, content="Body", category=self.web, status=published)
+        BlogPost.objects.create(title="Web draft", author=author, content="Body", category=self.web)
+
+    def test_category_page_renders_only_its_posts(self):
+        response = self.client.get(reverse("blog_category", kwargs={"slug": "web"}))
+        self.assertEqual([post.title for post in response.context["posts"]], ["Web 1"])
+        self.assertNotContains(response, "ML 0")
+        self.assertEqual(self.client.get(reverse("blog_category", kwargs={"slug": "nope"})).status_code, 404)
+
+    def test_feed_pages_within_a_category(self):
+        response = self.client.get(reverse("blog_category", kwargs={"slug": self.ml.slug}))
+        self.assertEqual(len(response.context["posts"]), BLOG_PAGE_SIZE)
+        data = self.client.get(
+            reverse("blog_feed"), {"category": self.ml.slug, "cursor": response.context["next_cursor"]}
+        ).json()
+        self.assertEqual(len(data["posts"]), 2)
+        self.assertTrue(all(post["category"] == "Machine Learning" for post in data["posts"]))
+
+    def test_category_counts_are_cached_and_invalidated_on_save(self):
+        self.assertEqual([(c["slug"], c["num_posts"]) for c in category_counts()], [("machine-learning", BLOG_PAGE_SIZE + 2), ("web", 1)])
+        with self.assertNumQueries(0):
+            category_counts()
+        draft = BlogPost.objects.get(title="Web draft")
+        draft.status = BlogPost.Status.PUBLISHED
+        draft.save()
+        self.assertEqual(category_counts()[1]["num_posts"], 2)
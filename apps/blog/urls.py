@@ -1,9 +1,23 @@
 from django.urls import path
 
-from .views import blog_create_view, blog_delete_view, blog_detail_view, blog_edit_view, blog_list_view
+from .views import (
+    blog_category_view,
+    blog_create_view,
+    blog_delete_view,
+    blog_detail_view,
+    blog_edit_view,
+    blog_feed_view,
+    blog_list_view,
+    blog_search_view,
+    blog_tag_view,
+)
 
 urlpatterns = [
     path("", blog_list_view, name="blog_list"),
+    path("feed/", blog_feed_view, name="blog_feed"),
+    path("search/", blog_search_view, name="blog_search"),
+    path("tag/<slug:slug>/", blog_tag_view, name="blog_tag"),
+    path("category/<slug:slug>/", blog_category_view, name="blog_category"),
     path("new/", blog_create_view, name="blog_create"),
     path("<slug:slug>/", blog_detail_view, name="blog_detail"),
     path("<slug:slug>/edit/", blog_edit_view, name="blog_edit"),
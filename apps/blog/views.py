@@ -1,27 +1,141 @@
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 
 from apps.comments.forms import CommentForm
 from apps.comments.models import Comment
+from apps.portfolio.cache import cache_public_page
 
 from .forms import BlogPostForm
-from .models import BlogPost, Category
+from .categories import category_counts
+from .models import BlogPost, Category, Tag
+from .pagination import keyset_page
+from .search import search_posts
+from .tags import tag_cloud
 
 _staff = lambda u: u.is_staff  # noqa: E731
 
 
+BLOG_PAGE_SIZE = 9
+
+
+def _post_cards():
+    """Published posts with only the columns a list card renders."""
+    return (
+        BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED)
+        .select_related("category")
+        .only(
+            "title", "slug", "summary", "reading_minutes", "approved_comment_count", "cover_image", "published_at",
+            "category__name", "category__slug",
+        )
+    )
+
+
+@cache_public_page("posts")
 def blog_list_view(request):
-    posts      = BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED).select_related("category")
-    categories = Category.objects.all()
-    return render(request, "blog/list.html", {"posts": posts, "categories": categories})
+    return _render_post_list(request, _post_cards())
+
+
+@cache_public_page("posts")
+def blog_category_view(request, slug):
+    category = get_object_or_404(Category, slug=slug)
+    return _render_post_list(request, _post_cards().filter(category=category), category=category)
+
+
+def _render_post_list(request, posts_qs, category=None):
+    cursor = request.GET.get("cursor") or None
+    try:
+        posts, next_cursor = keyset_page(posts_qs, cursor, BLOG_PAGE_SIZE)
+    except ValueError:
+        cursor = None
+        posts, next_cursor = keyset_page(posts_qs, None, BLOG_PAGE_SIZE)
+    return render(request, "blog/list.html", {
+        "posts": posts,
+        "category": category,
+        "categories": category_counts(),
+        "tag_cloud": tag_cloud(),
+        "next_cursor": next_cursor,
+        "is_first_page": cursor is None,
+    })
+
+
+@cache_public_page("posts")
+def blog_feed_view(request):
+    """Infinite-scroll endpoint: the next page of post cards after ``?cursor=``, optionally in ``?category=``."""
+    posts_qs = _post_cards()
+    if request.GET.get("category"):
+        posts_qs = posts_qs.filter(category__slug=request.GET["category"])
+    try:
+        posts, next_cursor = keyset_page(posts_qs, request.GET.get("cursor") or None, BLOG_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({"error": "Invalid cursor."}, status=400)
+    return JsonResponse({
+        "posts": [
+            {
+                "title": post.title,
+                "url": post.get_absolute_url(),
+                "published_at": post.published_at.isoformat(),
+                "category": post.category.name if post.category else None,
+            }
+            for post in posts
+        ],
+        "html": render_to_string("blog/_post_cards.html", {"posts": posts}, request=request),
+        "next_cursor": next_cursor,
+    })
+
+
+@cache_public_page("posts")
+def blog_tag_view(request, slug):
+    """Archive of published posts with a tag, keyset-paginated like the main list."""
+    tag = get_object_or_404(Tag, slug=slug)
+    posts_qs = _post_cards().filter(tags=tag)
+    try:
+        posts, next_cursor = keyset_page(posts_qs, request.GET.get("cursor") or None, BLOG_PAGE_SIZE)
+    except ValueError:
+        posts, next_cursor = keyset_page(posts_qs, None, BLOG_PAGE_SIZE)
+    return render(request, "blog/tag.html", {
+        "tag": tag,
+        "posts": posts,
+        "tag_cloud": tag_cloud(),
+        "next_cursor": next_cursor,
+    })
+
+
+SEARCH_RESULTS_LIMIT = 20
+
+
+def blog_search_view(request):
+    """Ranked search over published posts; ``?format=json`` for the API/autocomplete."""
+    query = request.GET.get("q", "").strip()[:200]
+    ranked = search_posts(query, SEARCH_RESULTS_LIMIT) if query else []
+    cards = _post_cards().in_bulk([post_id for post_id, _ in ranked])
+    posts = [cards[post_id] for post_id, _ in ranked if post_id in cards]
+
+    if request.GET.get("format") == "json":
+        scores = dict(ranked)
+        return JsonResponse({
+            "query": query,
+            "results": [
+                {
+                    "title": post.title,
+                    "url": post.get_absolute_url(),
+                    "summary": post.summary,
+                    "published_at": post.published_at.isoformat() if post.published_at else None,
+                    "score": round(scores[post.pk], 4),
+                }
+                for post in posts
+            ],
+        })
+    return render(request, "blog/search.html", {"query": query, "posts": posts})
 
 
 def blog_detail_view(request, slug):
     # Staff can preview drafts
     qs = BlogPost.objects.all() if (request.user.is_authenticated and request.user.is_staff) \
          else BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED)
-    post = get_object_or_404(qs, slug=slug)
+    post = get_object_or_404(qs.prefetch_related("tags"), slug=slug)
     comments = Comment.objects.filter(post=post, is_approved=True).select_related("author")
     pending  = Comment.objects.filter(post=post, is_approved=False).select_related("author") \
                if (request.user.is_authenticated and request.user.is_staff) else []
@@ -42,6 +156,7 @@ def blog_create_view(request):
         post = form.save(commit=False)
         post.author = request.user
         post.save()
+        form.save_m2m()
         messages.success(request, f'Post "{post.title}" created.')
         return redirect(post.get_absolute_url())
     return render(request, "blog/editor.html", {"form": form, "is_create": True})
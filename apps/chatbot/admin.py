@@ -1,9 +1,17 @@
 from django.contrib import admin
 
-from .models import ChatMessage
+from .models import ChatMessage, KnowledgeChunk
 
 
 @admin.register(ChatMessage)
 class ChatMessageAdmin(admin.ModelAdmin):
     list_display = ("user", "session_key", "created_at")
     search_fields = ("user_message", "assistant_message", "session_key")
+
+
+@admin.register(KnowledgeChunk)
+class KnowledgeChunkAdmin(admin.ModelAdmin):
+    list_display = ("source", "object_id", "position", "row", "indexed_at")
+    list_filter = ("source",)
+    search_fields = ("text",)
+    readonly_fields = ("source", "object_id", "position", "row", "text", "indexed_at")
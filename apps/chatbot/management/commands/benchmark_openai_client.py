@@ -0,0 +1,136 @@
+import asyncio
+import json
+import logging
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from openai import OpenAI
+
+from apps.chatbot.services.openai_client import clients, generate_chat_reply, stream_chat_reply
+
+STUB_REPLY = "Hello from the stub."
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal ``/v1/chat/completions``: a canned reply, streamed word by word when asked to."""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        self.server.connections.add(self.client_address)
+        base = {"id": "chatcmpl-stub", "created": 0, "model": request.get("model", "stub")}
+        if request.get("stream"):
+            first, *rest = STUB_REPLY.split(" ")
+            events = [
+                {**base, "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": part}}]}
+                for part in [first, *(f" {word}" for word in rest)]
+            ]
+            body = "".join(f"data: {json.dumps(event)}\n\n" for event in events) + "data: [DONE]\n\n"
+            content_type = "text/event-stream"
+        else:
+            body = json.dumps({
+                **base,
+                "object": "chat.completion",
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": STUB_REPLY},
+                    "finish_reason": "stop",
+                }],
+            })
+            content_type = "application/json"
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubOpenAIServer:
+    """An OpenAI-compatible server on localhost; ``connections`` counts distinct client sockets."""
+
+    def __enter__(self):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.connections = set()
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/v1"
+        return self
+
+    @property
+    def connections(self) -> int:
+        return len(self.httpd.connections)
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _timed(calls, fn):
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+class Command(BaseCommand):
+    help = "Compare a fresh OpenAI client per request with the pooled client manager against a local stub server."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args, **options):
+        calls = options["requests"]
+        for name in ("httpx", "httpx2"):
+            logging.getLogger(name).setLevel(logging.WARNING)
+        with StubOpenAIServer() as stub, override_settings(OPENAI_API_KEY="stub", OPENAI_BASE_URL=stub.base_url):
+            clients.reset()
+
+            def fresh_client():
+                # The old code path: a new client, and so a new connection, every time
+                client = OpenAI(api_key="stub", base_url=stub.base_url)
+                client.chat.completions.create(model="stub", messages=[{"role": "user", "content": "hi"}])
+                client.close()
+
+            def pooled_client():
+                assert generate_chat_reply("hi") == STUB_REPLY
+
+            async def pooled_stream():
+                async def one():
+                    return "".join([part async for part in stream_chat_reply("hi")])
+
+                timings = []
+                for _ in range(calls):
+                    started = time.perf_counter()
+                    assert await one() == STUB_REPLY
+                    timings.append((time.perf_counter() - started) * 1000)
+                return timings
+
+            _timed(5, pooled_client)  # warm imports and the pool
+            results = {"Fresh client per request": _timed(calls, fresh_client)}
+            before = stub.connections
+            results["Pooled client (sync)"] = _timed(calls, pooled_client)
+            pooled_connections = stub.connections - before
+            results["Pooled client (async stream)"] = asyncio.run(pooled_stream())
+            clients.reset()
+
+        for label, timings in results.items():
+            timings = sorted(timings)
+            self.stdout.write(
+                f"{label:<30} mean {statistics.fmean(timings):6.2f}ms   p95 {timings[int(len(timings) * 0.95) - 1]:6.2f}ms"
+            )
+        fresh = statistics.fmean(results["Fresh client per request"])
+        pooled = statistics.fmean(results["Pooled client (sync)"])
+        self.stdout.write(f"New connections opened by the warm pooled client: {pooled_connections}")
+        self.stdout.write(self.style.SUCCESS(f"Saved per request: {fresh - pooled:.2f}ms ({fresh / pooled:.1f}x)"))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from apps.chatbot.services import answer_cache
+
+
+class Command(BaseCommand):
+    help = "Report chatbot answer-cache hit rate and the upstream latency it saved."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after reporting.")
+        parser.add_argument("--clear", action="store_true", help="Also drop every cached answer.")
+
+    def handle(self, *args, **options):
+        stats = answer_cache.stats()
+        self.stdout.write(f"Lookups:          {stats['lookups']}")
+        self.stdout.write(f"Exact hits:       {stats['hits_exact']}")
+        self.stdout.write(f"Similar hits:     {stats['hits_similar']}")
+        self.stdout.write(f"Misses:           {stats['misses']}")
+        self.stdout.write(f"Avg upstream:     {stats['avg_upstream_ms']:.0f}ms over {stats['upstream_calls']} calls")
+        self.stdout.write(self.style.SUCCESS(
+            f"Hit rate {stats['hit_rate']:.1%}, saved ~{stats['saved_ms'] / 1000:.1f}s of upstream latency"
+        ))
+        if options["reset"]:
+            answer_cache.reset_stats()
+        if options["clear"]:
+            answer_cache.invalidate()
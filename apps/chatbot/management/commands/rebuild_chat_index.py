@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.chatbot.services import answer_cache
+from apps.chatbot.services.retrieval import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Re-chunk portfolio and published blog content into the chatbot retrieval index."
+
+    def handle(self, *args, **options):
+        indexed = rebuild_index()
+        answer_cache.invalidate()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} passages."))
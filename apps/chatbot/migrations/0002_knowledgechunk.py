@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KnowledgeChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('text', models.TextField()),
+                ('row', models.PositiveIntegerField(unique=True)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['source', 'object_id', 'position'],
+                'indexes': [models.Index(fields=['source', 'object_id'], name='chunk_source_object')],
+            },
+        ),
+    ]
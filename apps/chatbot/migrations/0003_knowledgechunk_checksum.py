@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:11
+
+import zlib
+
+from django.db import migrations, models
+
+
+def fill_checksums(apps, schema_editor):
+    # Same as apps.chatbot.services.retrieval.text_checksum
+    KnowledgeChunk = apps.get_model("chatbot", "KnowledgeChunk")
+    chunks = list(KnowledgeChunk.objects.only("pk", "text"))
+    for chunk in chunks:
+        chunk.checksum = zlib.crc32(chunk.text.encode()) or 1
+    KnowledgeChunk.objects.bulk_update(chunks, ["checksum"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0002_knowledgechunk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='knowledgechunk',
+            name='checksum',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_checksums, migrations.RunPython.noop),
+    ]
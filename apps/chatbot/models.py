@@ -20,3 +20,23 @@ class ChatMessage(models.Model):
 
     def __str__(self):
         return f"Chat at {self.created_at}"
+
+
+class KnowledgeChunk(models.Model):
+    """A passage of portfolio or blog text the chatbot can retrieve; ``row`` is its vector's row in the index file."""
+
+    source = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    position = models.PositiveIntegerField(default=0)
+    text = models.TextField()
+    row = models.PositiveIntegerField(unique=True)
+    # crc32 of ``text``, also stored next to the row's vector in each host's index file
+    checksum = models.PositiveBigIntegerField(default=0)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["source", "object_id", "position"]
+        indexes = [models.Index(fields=["source", "object_id"], name="chunk_source_object")]
+
+    def __str__(self):
+        return f"{self.source} {self.object_id} #{self.position}"
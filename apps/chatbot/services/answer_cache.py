@@ -0,0 +1,184 @@
+"""
+Cache of chatbot answers, so repeated questions skip the paid round-trip.
+
+Prompts are normalised (case, punctuation, whitespace) for an exact-match
+tier. Setting ``CHAT_CACHE_SIMILARITY`` above 0 (off by default) makes a miss
+there fall back to the closest cached prompt by cosine similarity of hashed
+term vectors (``vectors.py``), one matrix-vector product over every entry.
+Those vectors cannot tell entities apart: a question about Python projects
+scores 0.92 against the same question about Java, so the tier is only safe
+with a threshold close to 1. Entries expire
+after ``CHAT_CACHE_TIMEOUT`` seconds and the least recently used one is
+evicted beyond ``CHAT_CACHE_MAX_ENTRIES``.
+
+Answers live in process memory. A shared cache version, bumped when
+``Project``, ``Skill`` or ``Profile`` rows change (see ``signals.py``), clears
+them in every process; hit/miss counters are shared so
+``manage.py chat_cache_stats`` reports the whole site.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from .vectors import VECTOR_DIM, embed
+
+VERSION_KEY = "chat-answer-version"
+STATS_KEY = "chat-answer-stats:{}"
+STAT_NAMES = ("hits_exact", "hits_similar", "misses", "upstream_calls", "upstream_ms")
+# How long a process trusts its answers before re-checking the shared version.
+LOCAL_TTL = 5
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(_TOKEN_RE.findall(prompt.lower()))
+
+
+class AnswerCache:
+    """LRU + TTL map of normalised prompt -> answer, with a cosine-similarity fallback."""
+
+    def __init__(self, max_entries: int, timeout: float, threshold: float = 0.0):
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.threshold = threshold
+        self._entries = OrderedDict()  # key -> (answer, expires_at, row)
+        self._vectors = np.zeros((max_entries, VECTOR_DIM), dtype=np.float32)
+        self._row_keys = [None] * max_entries
+        self._free_rows = list(range(max_entries - 1, -1, -1))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, prompt: str):
+        """``(answer, "exact" | "similar")`` for ``prompt``, or ``None``."""
+        key = normalize_prompt(prompt)
+        entry = self._entries.get(key)
+        tier = "exact"
+        if entry is None and self.threshold > 0 and self._entries:
+            scores = self._vectors @ embed(key)
+            row = int(scores.argmax())
+            if scores[row] >= self.threshold:
+                key, tier = self._row_keys[row], "similar"
+                entry = self._entries[key]
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0], tier
+
+    def set(self, prompt: str, answer: str):
+        key = normalize_prompt(prompt)
+        if key in self._entries:
+            self._drop(key)
+        while len(self._entries) >= self.max_entries:
+            self._drop(next(iter(self._entries)))
+        row = self._free_rows.pop()
+        self._vectors[row] = embed(key)
+        self._row_keys[row] = key
+        self._entries[key] = (answer, time.monotonic() + self.timeout, row)
+
+    def _drop(self, key):
+        _, _, row = self._entries.pop(key)
+        self._vectors[row] = 0
+        self._row_keys[row] = None
+        self._free_rows.append(row)
+
+
+_lock = threading.Lock()
+_local = {"cache": None, "config": None, "version": None, "checked_at": 0.0}
+
+
+def _config():
+    return settings.CHAT_CACHE_MAX_ENTRIES, settings.CHAT_CACHE_TIMEOUT, settings.CHAT_CACHE_SIMILARITY
+
+
+def enabled() -> bool:
+    return settings.CHAT_CACHE_TIMEOUT > 0 and settings.CHAT_CACHE_MAX_ENTRIES > 0
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _get_cache() -> AnswerCache:
+    """This process's answers; emptied when another process invalidated them or the settings changed."""
+    now = time.monotonic()
+    config = _config()
+    if _local["cache"] is not None and _local["config"] == config and now - _local["checked_at"] < LOCAL_TTL:
+        return _local["cache"]
+    version = _current_version()
+    if _local["cache"] is None or _local["config"] != config or _local["version"] != version:
+        _local.update(cache=AnswerCache(*config), config=config, version=version)
+    _local["checked_at"] = now
+    return _local["cache"]
+
+
+def _count(name: str, amount: int = 1):
+    key = STATS_KEY.format(name)
+    try:
+        cache.incr(key, amount)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key, amount)
+
+
+def lookup(prompt: str):
+    """The cached answer for ``prompt`` (or a near-identical prompt), else ``None``."""
+    if not enabled():
+        return None
+    with _lock:
+        hit = _get_cache().get(prompt)
+    _count(f"hits_{hit[1]}" if hit else "misses")
+    return hit[0] if hit else None
+
+
+def remember(prompt: str, answer: str, latency: float):
+    """Store a fresh answer; ``latency`` (seconds) is what the next hit on it saves."""
+    if not enabled():
+        return
+    with _lock:
+        _get_cache().set(prompt, answer)
+    _count("upstream_calls")
+    _count("upstream_ms", round(latency * 1000))
+
+
+def invalidate():
+    """Forget every cached answer, in this process now and in others within ``LOCAL_TTL``."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+    with _lock:
+        _local.update(cache=None, config=None, version=None, checked_at=0.0)
+
+
+def stats() -> dict:
+    values = cache.get_many([STATS_KEY.format(name) for name in STAT_NAMES])
+    report = {name: values.get(STATS_KEY.format(name), 0) for name in STAT_NAMES}
+    hits = report["hits_exact"] + report["hits_similar"]
+    lookups = hits + report["misses"]
+    avg_ms = report["upstream_ms"] / report["upstream_calls"] if report["upstream_calls"] else 0.0
+    report.update(
+        hits=hits,
+        lookups=lookups,
+        hit_rate=hits / lookups if lookups else 0.0,
+        avg_upstream_ms=avg_ms,
+        saved_ms=hits * avg_ms,
+    )
+    return report
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(name) for name in STAT_NAMES])
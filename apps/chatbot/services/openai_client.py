@@ -1,27 +1,168 @@
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, Timeout
+
+from . import answer_cache, retrieval
 
 
 SYSTEM_PROMPT = (
     "You are a helpful assistant for a developer portfolio website. "
     "Answer clearly, keep it concise, and focus on portfolio/project context."
 )
+CONTEXT_PROMPT = "Facts from the site (use them when relevant, do not invent others):\n{context}"
+NOT_CONFIGURED_REPLY = "Chatbot is not configured yet. Add OPENAI_API_KEY in your .env file."
+UNAVAILABLE_REPLY = "AI service is temporarily unavailable. Please try again in a moment."
+
+
+class OpenAIClientManager:
+    """
+    Process-wide OpenAI clients.
+
+    A client owns a keep-alive connection pool, so reusing it skips the TCP and
+    TLS handshakes a fresh client pays on every request. ``slot()`` hands the
+    client out under a semaphore of ``OPENAI_MAX_CONCURRENCY``; a caller that
+    waits longer than ``OPENAI_QUEUE_TIMEOUT`` gets ``TimeoutError`` instead of
+    piling up. Async clients and their semaphores belong to an event loop, so
+    ``async_slot()`` keeps one set per loop. Changing the OPENAI_* settings
+    builds new clients on the next call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync = None
+        self._async = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _config():
+        return (
+            settings.OPENAI_API_KEY,
+            settings.OPENAI_BASE_URL or None,
+            settings.OPENAI_TIMEOUT,
+            settings.OPENAI_CONNECT_TIMEOUT,
+            settings.OPENAI_MAX_RETRIES,
+            settings.OPENAI_MAX_CONCURRENCY,
+        )
+
+    @staticmethod
+    def _client_kwargs(config) -> dict:
+        api_key, base_url, timeout, connect_timeout, max_retries, _ = config
+        return {
+            "api_key": api_key,
+            "base_url": base_url,
+            "timeout": Timeout(timeout, connect=connect_timeout),
+            "max_retries": max_retries,
+        }
+
+    def _sync_state(self):
+        config = self._config()
+        with self._lock:
+            if self._sync is None or self._sync[0] != config:
+                self._sync = (config, OpenAI(**self._client_kwargs(config)), threading.BoundedSemaphore(config[-1]))
+            return self._sync[1:]
+
+    def _async_state(self):
+        loop = asyncio.get_running_loop()
+        config = self._config()
+        with self._lock:
+            state = self._async.get(loop)
+            if state is None or state[0] != config:
+                state = self._async[loop] = (config, AsyncOpenAI(**self._client_kwargs(config)), asyncio.Semaphore(config[-1]))
+            return state[1:]
+
+    def client(self) -> OpenAI:
+        return self._sync_state()[0]
+
+    @contextmanager
+    def slot(self):
+        client, semaphore = self._sync_state()
+        if not semaphore.acquire(timeout=settings.OPENAI_QUEUE_TIMEOUT):
+            raise TimeoutError("No free OpenAI request slot.")
+        try:
+            yield client
+        finally:
+            semaphore.release()
+
+    @asynccontextmanager
+    async def async_slot(self):
+        client, semaphore = self._async_state()
+        await asyncio.wait_for(semaphore.acquire(), settings.OPENAI_QUEUE_TIMEOUT)
+        try:
+            yield client
+        finally:
+            semaphore.release()
+
+    def reset(self):
+        """Drop every cached client; the next call builds fresh ones."""
+        with self._lock:
+            self._sync = None
+            self._async = weakref.WeakKeyDictionary()
+
+
+clients = OpenAIClientManager()
+
+
+def _completion_kwargs(user_prompt: str, context: str = "") -> dict:
+    system = f"{SYSTEM_PROMPT}\n\n{CONTEXT_PROMPT.format(context=context)}" if context else SYSTEM_PROMPT
+    return {
+        "model": settings.OPENAI_MODEL,
+        "temperature": 0.3,
+        "messages": [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user_prompt},
+        ],
+    }
 
 
 def generate_chat_reply(user_prompt: str) -> str:
     if not settings.OPENAI_API_KEY:
-        return "Chatbot is not configured yet. Add OPENAI_API_KEY in your .env file."
+        return NOT_CONFIGURED_REPLY
+    cached = answer_cache.lookup(user_prompt)
+    if cached is not None:
+        return cached
 
+    started = time.perf_counter()
+    context = retrieval.context_for(user_prompt)
     try:
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        response = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            temperature=0.3,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-        )
-        return response.choices[0].message.content or "Sorry, no response."
+        with clients.slot() as client:
+            response = client.chat.completions.create(**_completion_kwargs(user_prompt, context))
+        answer = response.choices[0].message.content
+    except Exception:
+        return UNAVAILABLE_REPLY
+    if not answer:
+        return "Sorry, no response."
+    answer_cache.remember(user_prompt, answer, time.perf_counter() - started)
+    return answer
+
+
+async def stream_chat_reply(user_prompt: str):
+    """Async generator of reply text fragments, forwarded as the model produces them."""
+    if not settings.OPENAI_API_KEY:
+        yield NOT_CONFIGURED_REPLY
+        return
+    cached = await sync_to_async(answer_cache.lookup)(user_prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    started = time.perf_counter()
+    context = await sync_to_async(retrieval.context_for)(user_prompt)
+    try:
+        async with clients.async_slot() as client:
+            stream = await client.chat.completions.create(**_completion_kwargs(user_prompt, context), stream=True)
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
     except Exception:
-        return "AI service is temporarily unavailable. Please try again in a moment."
+        # Text that already reached the reader stays on screen; the notice follows it.
+        yield f"\n\n{UNAVAILABLE_REPLY}" if parts else UNAVAILABLE_REPLY
+        return
+    if parts:
+        await sync_to_async(answer_cache.remember)(user_prompt, "".join(parts), time.perf_counter() - started)
@@ -0,0 +1,324 @@
+"""
+Retrieval index that grounds chatbot answers in the site's own content.
+
+``Profile``, ``Education``, ``Skill``, ``Project`` and published ``BlogPost``
+rows are split into passages of at most ``CHUNK_WORDS`` words
+(``KnowledgeChunk``). Each passage's hashed vector (``vectors.py``) is a row
+of a float32 matrix (``ROW_DTYPE``) saved as ``.npy`` at ``CHAT_INDEX_PATH`` and memory-mapped
+by every process on the host. Saving or deleting a source object rewrites only
+its own rows in place (see ``signals.py``); the file is rewritten whole only
+when it has to grow. A query scores every row with one matrix-vector product
+and only the best ``CHAT_CONTEXT_CHUNKS`` passages go into the prompt, so
+prompt size stays flat as the blog grows.
+
+The file is a per-host cache of ``KnowledgeChunk``; each row stores the
+checksum of the text it was embedded from next to the vector. Another host's
+writes only reach this host's file through the table, so whenever the shared
+version changes a process compares the file's checksums with the table's and
+re-embeds the rows that differ (or rewrites the file if it is missing, too
+small or mostly stale). ``manage.py rebuild_chat_index`` re-chunks everything
+from the source models.
+"""
+import logging
+import os
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils.html import strip_tags
+
+from apps.blog.models import BlogPost
+from apps.portfolio.models import Education, Profile, Project, Skill
+
+from ..models import KnowledgeChunk
+from .vectors import VECTOR_DIM, embed
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, fine for a single dev server
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "chat-index-version"
+# How long a process trusts its mapping before re-checking the shared version.
+LOCAL_TTL = 5
+CHUNK_WORDS = 120
+CHUNK_OVERLAP = 20
+# Passages scoring below this share (almost) no terms with the question.
+MIN_SCORE = 0.05
+MIN_CAPACITY = 256
+# Row layout of the index file; a checksum of 0 marks an empty row.
+ROW_DTYPE = np.dtype([("checksum", "<u4"), ("vector", "<f4", (VECTOR_DIM,))])
+
+
+def text_checksum(text: str) -> int:
+    return zlib.crc32(text.encode()) or 1
+
+
+def _chunks(header: str, body: str = "") -> list:
+    """``header`` followed by overlapping windows of ``body``, each window repeating the header."""
+    words = body.split()
+    if not words:
+        return [header]
+    step = CHUNK_WORDS - CHUNK_OVERLAP
+    return [
+        f"{header} {' '.join(words[start:start + CHUNK_WORDS])}"
+        for start in range(0, max(len(words) - CHUNK_OVERLAP, 1), step)
+    ]
+
+
+def _profile_chunks(profile):
+    links = ", ".join(url for url in (profile.github_url, profile.linkedin_url, profile.twitter_url) if url)
+    facts = [f"Email: {profile.email}."]
+    if profile.location:
+        facts.append(f"Location: {profile.location}.")
+    if links:
+        facts.append(f"Links: {links}.")
+    return _chunks(f"{profile.full_name}, {profile.title}.", f"{profile.intro} {profile.about} {' '.join(facts)}")
+
+
+def _education_chunks(education):
+    years = f"{education.start_year}–{education.end_year or 'present'}"
+    return _chunks(f"Education: {education.degree} at {education.institution} ({years}).", education.description)
+
+
+def _skill_chunks(skill):
+    category = f" ({skill.category})" if skill.category else ""
+    return [f"Skill: {skill.name}{category}, proficiency {skill.level}%."]
+
+
+def _project_chunks(project):
+    details = [project.summary]
+    if project.tech_stack:
+        details.append(f"Tech stack: {project.tech_stack}.")
+    details.extend(f"{label}: {url}." for label, url in (("Demo", project.demo_url), ("Source", project.source_url)) if url)
+    return _chunks(f"Project: {project.title}.", " ".join(details))
+
+
+def _post_chunks(post):
+    if post.status != BlogPost.Status.PUBLISHED:
+        return []
+    return _chunks(f'Blog post "{post.title}" ({post.get_absolute_url()}):', f"{post.excerpt} {strip_tags(post.content)}")
+
+
+# Indexed model -> (source label, passages of one instance)
+SOURCES = {
+    Profile: ("profile", _profile_chunks),
+    Education: ("education", _education_chunks),
+    Skill: ("skill", _skill_chunks),
+    Project: ("project", _project_chunks),
+    BlogPost: ("post", _post_chunks),
+}
+
+
+def _path() -> Path:
+    return Path(settings.CHAT_INDEX_PATH)
+
+
+@contextmanager
+def _file_lock():
+    """Serialise writers of the index file on this host."""
+    path = _path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(f"{path}.lock", "a") as handle:
+        if fcntl:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        yield
+
+
+def _capacity(rows: int) -> int:
+    capacity = MIN_CAPACITY
+    while capacity < rows:
+        capacity *= 2
+    return capacity
+
+
+def _write_matrix(rows: int = 0):
+    """Write every chunk's vector to a fresh file with room for ``rows`` and swap it in."""
+    path = _path()
+    top = KnowledgeChunk.objects.aggregate(top=Max("row"))["top"]
+    capacity = _capacity(max(rows, (top or 0) + 1))
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    matrix = np.lib.format.open_memmap(tmp, mode="w+", dtype=ROW_DTYPE, shape=(capacity,))
+    for row, text in KnowledgeChunk.objects.values_list("row", "text").iterator(chunk_size=500):
+        matrix[row] = (text_checksum(text), embed(text))
+    matrix.flush()
+    del matrix
+    os.replace(tmp, path)
+
+
+def _load_matrix(mode="r"):
+    """The index file mapped with ``mode``, or ``None`` if it is missing or in an old layout."""
+    try:
+        matrix = np.load(_path(), mmap_mode=mode)
+    except (FileNotFoundError, ValueError):
+        return None
+    return matrix if matrix.dtype == ROW_DTYPE else None
+
+
+def _write_rows(texts: dict, cleared: list):
+    """Update rows in place, growing (rewriting) the file if a row does not fit."""
+    needed = max(texts, default=-1) + 1
+    matrix = _load_matrix("r+")
+    if matrix is None or len(matrix) < needed:
+        del matrix
+        _write_matrix(needed)
+        return
+    for row, text in texts.items():
+        matrix[row] = (text_checksum(text), embed(text))
+    matrix[cleared] = 0
+    matrix.flush()
+
+
+def _stale_rows(matrix) -> np.ndarray:
+    """Rows whose stored checksum differs from the table's (zero for rows the table no longer uses)."""
+    expected = np.zeros(len(matrix), dtype=np.uint32)
+    rows = np.array(KnowledgeChunk.objects.values_list("row", "checksum"), dtype=np.int64).reshape(-1, 2)
+    expected[rows[:, 0]] = rows[:, 1]
+    return np.flatnonzero(matrix["checksum"] != expected)
+
+
+def _repair_rows():
+    """Bring this host's file in line with the table, re-embedding only the rows that differ."""
+    top = KnowledgeChunk.objects.aggregate(top=Max("row"))["top"]
+    matrix = _load_matrix("r+")
+    if matrix is None or len(matrix) <= top:
+        del matrix
+        _write_matrix()
+        return
+    stale = _stale_rows(matrix)
+    if len(stale) * 2 > len(matrix):
+        del matrix
+        _write_matrix()
+        return
+    texts = dict(KnowledgeChunk.objects.filter(row__in=stale.tolist()).values_list("row", "text"))
+    for row in stale.tolist():
+        matrix[row] = (text_checksum(texts[row]), embed(texts[row])) if row in texts else 0
+    matrix.flush()
+
+
+def _bump_version():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def index_object(model, pk):
+    """Re-chunk one source object (or drop its passages if it is gone or unpublished)."""
+    source, make_chunks = SOURCES[model]
+    instance = model.objects.filter(pk=pk).first()
+    texts = make_chunks(instance) if instance else []
+
+    with _file_lock(), transaction.atomic():
+        existing = list(
+            KnowledgeChunk.objects.select_for_update().filter(source=source, object_id=pk).order_by("position")
+        )
+        rows = [chunk.row for chunk in existing]
+        if len(texts) > len(rows):
+            top = KnowledgeChunk.objects.aggregate(top=Max("row"))["top"]
+            start = -1 if top is None else top
+            rows += range(start + 1, start + 1 + len(texts) - len(rows))
+        KnowledgeChunk.objects.filter(pk__in=[chunk.pk for chunk in existing]).delete()
+        KnowledgeChunk.objects.bulk_create(
+            KnowledgeChunk(source=source, object_id=pk, position=i, text=text, row=rows[i], checksum=text_checksum(text))
+            for i, text in enumerate(texts)
+        )
+        _write_rows({rows[i]: text for i, text in enumerate(texts)}, rows[len(texts):])
+    _bump_version()
+    reset_index()
+
+
+def rebuild_index() -> int:
+    """Re-chunk every source object into consecutive rows and rewrite the file; returns the passage count."""
+    chunks = []
+    for model, (source, make_chunks) in SOURCES.items():
+        for instance in model.objects.all().iterator(chunk_size=500):
+            chunks.extend(
+                KnowledgeChunk(source=source, object_id=instance.pk, position=i, text=text, checksum=text_checksum(text))
+                for i, text in enumerate(make_chunks(instance))
+            )
+    for row, chunk in enumerate(chunks):
+        chunk.row = row
+    with _file_lock(), transaction.atomic():
+        KnowledgeChunk.objects.all().delete()
+        KnowledgeChunk.objects.bulk_create(chunks, batch_size=500)
+        _write_matrix()
+    _bump_version()
+    reset_index()
+    return len(chunks)
+
+
+_lock = threading.Lock()
+_local = {"matrix": None, "version": None, "checked_at": 0.0}
+
+
+def _open_matrix():
+    top = KnowledgeChunk.objects.aggregate(top=Max("row"))["top"]
+    if top is None:
+        return np.zeros(0, dtype=ROW_DTYPE)
+    matrix = _load_matrix()
+    if matrix is not None and len(matrix) > top and not len(_stale_rows(matrix)):
+        return matrix
+    # Fresh host, a file from before the table grew, or rows another host changed
+    with _file_lock():
+        _repair_rows()
+    return np.load(_path(), mmap_mode="r")
+
+
+def get_matrix():
+    """This process's read-only mapping of the index, reopened when another process changed it."""
+    with _lock:
+        now = time.monotonic()
+        if _local["matrix"] is not None and now - _local["checked_at"] < LOCAL_TTL:
+            return _local["matrix"]
+        version = _current_version()
+        if _local["matrix"] is None or version != _local["version"]:
+            _local.update(matrix=_open_matrix(), version=version)
+        _local["checked_at"] = now
+        return _local["matrix"]
+
+
+def reset_index():
+    with _lock:
+        _local.update(matrix=None, version=None, checked_at=0.0)
+
+
+def retrieve(query: str, k: int = None) -> list:
+    """The ``k`` passages most similar to ``query``, best first."""
+    k = k or settings.CHAT_CONTEXT_CHUNKS
+    matrix = get_matrix()
+    if not len(matrix):
+        return []
+    scores = matrix["vector"] @ embed(query)
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    rows = [int(row) for row in top[np.argsort(-scores[top])] if scores[row] >= MIN_SCORE]
+    chunks = KnowledgeChunk.objects.in_bulk(rows, field_name="row")
+    return [chunks[row] for row in rows if row in chunks]
+
+
+def context_for(prompt: str) -> str:
+    """Bullet list of the passages relevant to ``prompt``; empty if retrieval is unavailable."""
+    try:
+        chunks = retrieve(prompt)
+    except Exception:
+        logger.exception("Chat retrieval failed")
+        return ""
+    return "\n".join(f"- {chunk.text}" for chunk in chunks)
@@ -0,0 +1,35 @@
+"""
+Local text vectors: signed feature hashing of words and their character
+trigrams into a fixed number of dimensions, L2-normalised so a dot product
+is the cosine similarity. No model download; "projects" and "project" share
+most of their trigrams and so land close together.
+"""
+import zlib
+
+import numpy as np
+
+from apps.blog.search import tokenize
+
+VECTOR_DIM = 1024
+TRIGRAM_WEIGHT = 0.5
+
+
+def _features(text: str):
+    for token in tokenize(text):
+        yield token, 1.0
+        padded = f"#{token}#"
+        for i in range(len(padded) - 2):
+            yield padded[i:i + 3], TRIGRAM_WEIGHT
+
+
+def embed(text: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """Unit ``float32`` vector of ``text`` (all zeros if it has no indexable terms)."""
+    vector = np.zeros(dim, dtype=np.float32)
+    for feature, weight in _features(text):
+        # crc32 is stable across processes, unlike hash()
+        h = zlib.crc32(feature.encode())
+        vector[h % dim] += weight if h & 0x80000000 else -weight
+    norm = np.linalg.norm(vector)
+    if norm:
+        vector /= norm
+    return vector
@@ -0,0 +1,29 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from apps.blog.models import BlogPost
+from apps.blog.search import INDEXED_FIELDS
+
+from .services import answer_cache, retrieval
+
+
+def _reindex(model, pk):
+    retrieval.index_object(model, pk)
+    # Answers cached while the old passages were still indexed
+    answer_cache.invalidate()
+
+
+def _content_changed(sender, instance, update_fields=None, **kwargs):
+    # Counter and notification updates don't change what the assistant knows.
+    if sender is BlogPost and update_fields is not None and not INDEXED_FIELDS & set(update_fields):
+        return
+    answer_cache.invalidate()
+    transaction.on_commit(partial(_reindex, sender, instance.pk), robust=True)
+
+
+# Models the assistant answers questions about
+for _model in retrieval.SOURCES:
+    post_save.connect(_content_changed, sender=_model, dispatch_uid=f"chat-content-save-{_model.__name__}")
+    post_delete.connect(_content_changed, sender=_model, dispatch_uid=f"chat-content-delete-{_model.__name__}")
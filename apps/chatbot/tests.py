@@ -0,0 +1,281 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth.models import User
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.blog.models import BlogPost
+from apps.portfolio import ratelimit
+from apps.portfolio.models import Project, Skill
+
+from .management.commands.benchmark_openai_client import STUB_REPLY, StubOpenAIServer
+from .models import ChatMessage, KnowledgeChunk
+from .services import answer_cache, retrieval
+from .services.answer_cache import AnswerCache
+from .services.openai_client import UNAVAILABLE_REPLY, clients, generate_chat_reply, stream_chat_reply
+
+
+async def _fake_stream(prompt):
+    for part in ("Hello", ", ", "world"):
+        yield part
+
+
+class ChatStreamTest(TestCase):
+    async def _events(self, response):
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        return [frame for frame in body.split("\n\n") if frame]
+
+    @mock.patch("apps.chatbot.views.stream_chat_reply", _fake_stream)
+    async def test_streams_deltas_then_saves_message(self):
+        response = await self.async_client.post(
+            reverse("chat_stream"), json.dumps({"message": "Hi"}), content_type="application/json"
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(response.is_async)
+
+        events = await self._events(response)
+        deltas = [json.loads(frame.removeprefix("data: "))["delta"] for frame in events[:-1]]
+        self.assertEqual(deltas, ["Hello", ", ", "world"])
+        self.assertTrue(events[-1].startswith("event: done"))
+
+        message = await ChatMessage.objects.aget()
+        self.assertEqual(message.user_message, "Hi")
+        self.assertEqual(message.assistant_message, "Hello, world")
+
+    async def test_rejects_empty_message(self):
+        response = await self.async_client.post(
+            reverse("chat_stream"), json.dumps({"message": "  "}), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(await ChatMessage.objects.aexists())
+
+    async def test_unconfigured_key_streams_notice(self):
+        with self.settings(OPENAI_API_KEY=""):
+            response = await self.async_client.post(
+                reverse("chat_stream"), json.dumps({"message": "Hi"}), content_type="application/json"
+            )
+            events = await self._events(response)
+        self.assertIn("not configured", events[0])
+
+    @mock.patch("apps.chatbot.views.stream_chat_reply", _fake_stream)
+    async def test_rate_limit_returns_json_429(self):
+        ratelimit.reset()
+        self.addCleanup(ratelimit.reset)
+        with self.settings(RATE_LIMITS={"chat": {"ip": "1/m", "global": "100/m"}}):
+            statuses = []
+            for _ in range(2):
+                response = await self.async_client.post(
+                    reverse("chat_stream"), json.dumps({"message": "Hi"}), content_type="application/json"
+                )
+                statuses.append(response.status_code)
+        self.assertEqual(statuses, [200, 429])
+        self.assertEqual(json.loads(response.content)["error"], "Rate limit exceeded. Try again.")
+        self.assertIn("Retry-After", response)
+
+    @mock.patch("apps.chatbot.views.stream_chat_reply", _fake_stream)
+    async def test_rate_limit_renders_page_for_form_posts(self):
+        ratelimit.reset()
+        self.addCleanup(ratelimit.reset)
+        with self.settings(RATE_LIMITS={"chat": {"ip": "1/m", "global": "100/m"}}):
+            statuses = []
+            for _ in range(2):
+                response = await self.async_client.post(reverse("chat_stream"), {"message": "Hi"})
+                statuses.append(response.status_code)
+        self.assertEqual(statuses[1], 429)
+        self.assertContains(response, "Too Many Requests", status_code=429)
+        self.assertIn("Retry-After", response)
+
+
+@override_settings(CHAT_CACHE_TIMEOUT=0)
+class OpenAIClientManagerTest(TestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubOpenAIServer())
+        self.enterContext(override_settings(OPENAI_API_KEY="stub", OPENAI_BASE_URL=self.stub.base_url))
+        clients.reset()
+        self.addCleanup(clients.reset)
+
+    def test_sync_replies_reuse_one_connection(self):
+        for _ in range(3):
+            self.assertEqual(generate_chat_reply("Hi"), STUB_REPLY)
+        self.assertEqual(self.stub.connections, 1)
+        self.assertIs(clients.client(), clients.client())
+
+    def test_settings_change_builds_a_new_client(self):
+        client = clients.client()
+        with self.settings(OPENAI_TIMEOUT=1.0):
+            self.assertIsNot(clients.client(), client)
+            self.assertEqual(clients.client().timeout.read, 1.0)
+
+    @override_settings(OPENAI_MAX_CONCURRENCY=1, OPENAI_QUEUE_TIMEOUT=0.01)
+    def test_busy_slots_fail_fast(self):
+        with clients.slot():
+            self.assertEqual(generate_chat_reply("Hi"), UNAVAILABLE_REPLY)
+        self.assertEqual(generate_chat_reply("Hi"), STUB_REPLY)
+
+    async def test_async_stream_through_pooled_client(self):
+        for _ in range(2):
+            reply = "".join([part async for part in stream_chat_reply("Hi")])
+            self.assertEqual(reply, STUB_REPLY)
+        self.assertEqual(self.stub.connections, 1)
+
+
+class AnswerCacheTest(TestCase):
+    def test_exact_tier_ignores_case_and_punctuation(self):
+        answers = AnswerCache(max_entries=10, timeout=60)
+        answers.set("What projects have you built?", "Several.")
+        self.assertEqual(answers.get("what projects have you  built"), ("Several.", "exact"))
+        self.assertIsNone(answers.get("Which projects are public?"))
+
+    def test_similar_tier_matches_reordered_prompt(self):
+        answers = AnswerCache(max_entries=10, timeout=60, threshold=0.9)
+        answers.set("python projects built", "Django and FastAPI apps.")
+        self.assertEqual(answers.get("built python projects?"), ("Django and FastAPI apps.", "similar"))
+        self.assertIsNone(answers.get("java experience"))
+
+    def test_ttl_and_lru_eviction(self):
+        self.assertIsNone(self._filled(AnswerCache(max_entries=2, timeout=0)).get("first"))
+
+        answers = self._filled(AnswerCache(max_entries=2, timeout=60))
+        answers.get("first")
+        answers.set("third", "3")
+        self.assertIsNone(answers.get("second"))
+        self.assertEqual(answers.get("first"), ("1", "exact"))
+        self.assertEqual(len(answers), 2)
+
+    def _filled(self, answers):
+        answers.set("first", "1")
+        answers.set("second", "2")
+        return answers
+
+
+class CachedChatReplyTest(TestCase):
+    def setUp(self):
+        self.stub = self.enterContext(StubOpenAIServer())
+        self.enterContext(override_settings(OPENAI_API_KEY="stub", OPENAI_BASE_URL=self.stub.base_url))
+        for reset in (clients.reset, answer_cache.invalidate, answer_cache.reset_stats):
+            reset()
+            self.addCleanup(reset)
+
+    def test_repeated_question_is_served_from_cache(self):
+        self.assertEqual(generate_chat_reply("What skills?"), STUB_REPLY)
+        with mock.patch.object(clients, "slot", side_effect=AssertionError("upstream called")):
+            self.assertEqual(generate_chat_reply("what skills"), STUB_REPLY)
+
+        stats = answer_cache.stats()
+        self.assertEqual((stats["hits_exact"], stats["misses"], stats["upstream_calls"]), (1, 1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+        out = io.StringIO()
+        call_command("chat_cache_stats", stdout=out)
+        self.assertIn("Hit rate 50.0%", out.getvalue())
+
+    async def test_streamed_answer_is_cached(self):
+        first = "".join([part async for part in stream_chat_reply("What skills?")])
+        with mock.patch.object(clients, "async_slot", side_effect=AssertionError("upstream called")):
+            second = [part async for part in stream_chat_reply("What skills?")]
+        self.assertEqual(second, [first])
+
+    def test_prompts_differing_in_one_entity_do_not_share_an_answer(self):
+        python = "Can you tell me which of his projects were built using Python and deployed on cloud platforms?"
+        java = python.replace("Python", "Java")
+        answer_cache.remember(python, "The Python ones.", 0.1)
+        self.assertIsNone(answer_cache.lookup(java))
+        self.assertEqual(answer_cache.lookup(python), "The Python ones.")
+
+    def test_portfolio_changes_invalidate_answers(self):
+        generate_chat_reply("What projects?")
+        self.assertEqual(answer_cache.lookup("What projects?"), STUB_REPLY)
+        Project.objects.create(title="New", summary="Fresh work")
+        self.assertIsNone(answer_cache.lookup("What projects?"))
+
+
+class RetrievalIndexTest(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "index.npy"
+        self.enterContext(override_settings(CHAT_INDEX_PATH=str(self.path)))
+        retrieval.reset_index()
+        self.addCleanup(retrieval.reset_index)
+        self.author = User.objects.create_user(username="author", password="pass1234")
+
+    def _post(self, title, content, status=BlogPost.Status.PUBLISHED):
+        return BlogPost.objects.create(title=title, author=self.author, content=content, status=status)
+
+    def test_rebuild_indexes_every_source_and_ranks_passages(self):
+        Skill.objects.create(name="Django", category="Backend", level=90)
+        Project.objects.create(title="Inventory dashboard", summary="Warehouse stock tracking", tech_stack="Vue")
+        self._post("Kubernetes notes", "Deploying containers with kubernetes and helm charts.")
+        self._post("Draft", "kubernetes secrets", status=BlogPost.Status.DRAFT)
+
+        self.assertEqual(retrieval.rebuild_index(), 3)
+        self.assertEqual(np.load(self.path, mmap_mode="r")["vector"].shape[1], 1024)
+        passages = retrieval.retrieve("kubernetes deployment")
+        self.assertEqual(passages[0].source, "post")
+        self.assertNotIn("secrets", " ".join(p.text for p in passages))
+        self.assertIn("Skill: Django (Backend), proficiency 90%.", retrieval.context_for("django skills"))
+
+    def test_long_posts_are_split_into_bounded_chunks(self):
+        post = self._post("Long read", " ".join(f"word{i}" for i in range(300)))
+        texts = retrieval._post_chunks(post)
+        self.assertEqual(len(texts), 3)
+        self.assertTrue(all(text.startswith('Blog post "Long read"') for text in texts))
+        self.assertTrue(all(len(text.split()) <= retrieval.CHUNK_WORDS + 6 for text in texts))
+
+    def test_saves_update_only_their_own_rows(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            skill = Skill.objects.create(name="Rust", category="Systems")
+            project = Project.objects.create(title="Telemetry agent", summary="Collects metrics")
+        rows = dict(KnowledgeChunk.objects.values_list("source", "row"))
+        self.assertEqual(retrieval.retrieve("telemetry metrics")[0].source, "project")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            project.summary = "Ships logs to object storage"
+            project.save()
+        self.assertEqual(dict(KnowledgeChunk.objects.values_list("source", "row")), rows)
+        self.assertEqual(retrieval.retrieve("logs storage")[0].object_id, project.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            skill.delete()
+        self.assertFalse(KnowledgeChunk.objects.filter(source="skill").exists())
+        self.assertFalse(np.load(self.path, mmap_mode="r")[rows["skill"]]["vector"].any())
+        self.assertEqual(retrieval.retrieve("rust systems"), [])
+
+    def test_stale_rows_from_another_host_are_re_embedded(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(title="Telemetry agent", summary="Collects metrics")
+            Skill.objects.create(name="Rust", category="Systems")
+        other_host = self.path.with_name("other.npy")
+        other_host.write_bytes(self.path.read_bytes())
+
+        # This host applies the save; the other host's file keeps the old row.
+        with self.captureOnCommitCallbacks(execute=True):
+            project.summary = "Ships logs to object storage"
+            project.save()
+        with self.settings(CHAT_INDEX_PATH=str(other_host)):
+            retrieval.reset_index()
+            self.assertEqual(retrieval.retrieve("logs storage")[0].object_id, project.pk)
+            self.assertEqual(retrieval.retrieve("telemetry metrics")[0].source, "project")
+        self.assertEqual(
+            np.load(other_host)["checksum"].tolist(), np.load(self.path)["checksum"].tolist()
+        )
+
+    def test_prompt_carries_only_top_passages(self):
+        for i in range(10):
+            Skill.objects.create(name=f"Tool{i}", category="Ops")
+        retrieval.rebuild_index()
+        create = mock.Mock()
+        create.return_value.choices = [mock.Mock(message=mock.Mock(content="Answer"))]
+        fake = mock.MagicMock()
+        fake.__enter__.return_value.chat.completions.create = create
+        with self.settings(OPENAI_API_KEY="key", CHAT_CACHE_TIMEOUT=0, CHAT_CONTEXT_CHUNKS=2), \
+                mock.patch.object(clients, "slot", return_value=fake):
+            self.assertEqual(generate_chat_reply("Which ops tools?"), "Answer")
+        system = create.call_args.kwargs["messages"][0]["content"]
+        self.assertEqual(system.count("- Skill: Tool"), 2)
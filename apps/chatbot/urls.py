@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import chat_api_view
+from .views import chat_api_view, chat_stream_view
 
 urlpatterns = [
     path("", chat_api_view, name="chat_api"),
+    path("stream/", chat_stream_view, name="chat_stream"),
 ]
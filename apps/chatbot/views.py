@@ -1,44 +1,37 @@
 import json
 
-from django.core.cache import cache
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
+from apps.portfolio.ratelimit import rate_limit
+
 from .models import ChatMessage
-from .services.openai_client import generate_chat_reply
+from .services.openai_client import generate_chat_reply, stream_chat_reply
 
 
-def _is_rate_limited(ip: str, limit: int = 20, seconds: int = 60) -> bool:
-    key = f"chat-rate-{ip}"
-    try:
-        requests = cache.get(key, 0)
-        if requests >= limit:
-            return True
-        cache.set(key, requests + 1, timeout=seconds)
-        return False
-    except Exception:
-        # If cache backend is down, do not break chatbot endpoint.
-        return False
-
-
-@csrf_exempt
-@require_POST
-def chat_api_view(request):
-    ip = request.META.get("REMOTE_ADDR", "unknown")
-    if _is_rate_limited(ip):
-        return JsonResponse({"error": "Rate limit exceeded. Try again."}, status=429)
-
+def _read_prompt(request):
+    """``(prompt, None)`` for a valid chat request body, otherwise ``(None, error response)``."""
     try:
         payload = json.loads(request.body.decode("utf-8"))
         prompt = payload.get("message", "").strip()
     except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON payload."}, status=400)
+        return None, JsonResponse({"error": "Invalid JSON payload."}, status=400)
 
     if not prompt:
-        return JsonResponse({"error": "Message is required."}, status=400)
+        return None, JsonResponse({"error": "Message is required."}, status=400)
     if len(prompt) > 1200:
-        return JsonResponse({"error": "Message is too long."}, status=400)
+        return None, JsonResponse({"error": "Message is too long."}, status=400)
+    return prompt, None
+
+
+@csrf_exempt
+@require_POST
+@rate_limit("chat")
+def chat_api_view(request):
+    prompt, error = _read_prompt(request)
+    if error:
+        return error
 
     answer = generate_chat_reply(prompt)
     ChatMessage.objects.create(
@@ -48,3 +41,45 @@ def chat_api_view(request):
         assistant_message=answer,
     )
     return JsonResponse({"reply": answer})
+
+
+def _sse(data: dict, event: str = "") -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@csrf_exempt
+@require_POST
+@rate_limit("chat")
+async def chat_stream_view(request):
+    """
+    Server-sent events version of ``chat_api_view``: one ``data: {"delta": ...}``
+    event per fragment, then ``event: done``. Under ASGI the worker is free
+    while the model generates; the exchange is stored once the reply is complete.
+    """
+    prompt, error = _read_prompt(request)
+    if error:
+        return error
+
+    user = await request.auser()
+    session_key = request.session.session_key or ""
+
+    async def events():
+        parts = []
+        async for delta in stream_chat_reply(prompt):
+            parts.append(delta)
+            yield _sse({"delta": delta})
+        # A client that disconnects cancels this generator before we get here, so only finished replies are saved.
+        await ChatMessage.objects.acreate(
+            user=user if user.is_authenticated else None,
+            session_key=session_key,
+            user_message=prompt,
+            assistant_message="".join(parts),
+        )
+        yield _sse({}, event="done")
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx-style proxies from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
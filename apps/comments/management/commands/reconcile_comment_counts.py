@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.comments.services import drifted_posts, reconcile_comment_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute BlogPost approved/pending comment counters that drifted from the Comment table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report drifted posts without fixing them.")
+
+    def handle(self, *args, **options):
+        if options["dry_run"]:
+            for post in drifted_posts().only("id", "title", "approved_comment_count", "pending_comment_count"):
+                self.stdout.write(
+                    f"{post.title}: approved {post.approved_comment_count} → {post.actual_approved}, "
+                    f"pending {post.pending_comment_count} → {post.actual_pending}"
+                )
+            return
+        fixed = reconcile_comment_counts()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled comment counts on {fixed} posts."))
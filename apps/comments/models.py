@@ -11,6 +11,15 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # A post's approved comments, newest first. Partial because Django filters on the bare
+            # boolean ("WHERE is_approved"), which cannot match an index column but matches this condition.
+            models.Index(
+                fields=["post", "-created_at"], condition=models.Q(is_approved=True), name="comment_post_approved_recent"
+            ),
+            # The dashboard's moderation queue
+            models.Index(fields=["-created_at"], condition=models.Q(is_approved=False), name="comment_pending_recent"),
+        ]
 
     def __str__(self):
         return f"{self.author} on {self.post}"
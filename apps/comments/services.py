@@ -0,0 +1,108 @@
+"""
+Denormalised comment counters on ``BlogPost``.
+
+Views change ``approved_comment_count`` / ``pending_comment_count`` with
+``F()`` expressions in the same transaction as the comment itself, so
+concurrent requests never lose an increment. Anything that bypasses these
+helpers (the admin, the shell) can drift; ``manage.py reconcile_comment_counts``
+recomputes the counters from the ``Comment`` table.
+"""
+from django.db import models, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.blog.models import BlogPost
+from apps.portfolio.cache import invalidate_pages
+from apps.portfolio.kpis import invalidate_dashboard_kpis
+
+from .models import Comment
+
+
+def adjust_comment_counts(deltas: dict):
+    """Apply ``{post_id: (approved_delta, pending_delta)}`` with one ``UPDATE`` per distinct delta."""
+    by_delta = {}
+    for post_id, delta in deltas.items():
+        if any(delta):
+            by_delta.setdefault(tuple(delta), []).append(post_id)
+    for (approved, pending), post_ids in by_delta.items():
+        BlogPost.objects.filter(pk__in=post_ids).update(
+            approved_comment_count=Greatest(F("approved_comment_count") + approved, Value(0)),
+            pending_comment_count=Greatest(F("pending_comment_count") + pending, Value(0)),
+        )
+    # Blog cards show approved counts; the dashboard shows pending ones. Invalidate after
+    # the commit, or a request in between could cache the old counts again.
+    if any(approved for approved, _ in by_delta):
+        transaction.on_commit(lambda: invalidate_pages("posts"))
+    if any(pending for _, pending in by_delta):
+        transaction.on_commit(invalidate_dashboard_kpis)
+
+
+def _actual_count(is_approved: bool):
+    counts = (
+        Comment.objects.filter(post=OuterRef("pk"), is_approved=is_approved)
+        .order_by()
+        .values("post")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def drifted_posts():
+    """Posts whose stored counters disagree with the ``Comment`` table."""
+    return BlogPost.objects.annotate(
+        actual_approved=_actual_count(True), actual_pending=_actual_count(False)
+    ).filter(
+        ~Q(approved_comment_count=F("actual_approved")) | ~Q(pending_comment_count=F("actual_pending"))
+    )
+
+
+def reconcile_comment_counts() -> int:
+    """Recompute the counters of every drifted post in one ``UPDATE``; returns how many were fixed."""
+    post_ids = list(drifted_posts().values_list("pk", flat=True))
+    if post_ids:
+        BlogPost.objects.filter(pk__in=post_ids).update(
+            approved_comment_count=_actual_count(True), pending_comment_count=_actual_count(False)
+        )
+        transaction.on_commit(lambda: invalidate_pages("posts"))
+    return len(post_ids)
+
+
+class ModerationAction(models.TextChoices):
+    APPROVE = "approve", "Approve"
+    DELETE = "delete", "Delete"
+
+
+def moderate_comments(action: str, comments) -> dict:
+    """
+    Approve or delete every comment in ``comments`` with a single statement.
+
+    The matching rows are locked first so the counter deltas computed from
+    them are exactly what the ``UPDATE``/``DELETE`` changes.
+    """
+    if action not in ModerationAction.values:
+        raise ValueError(f"Unknown moderation action: {action!r}")
+    if action == ModerationAction.APPROVE:
+        comments = comments.filter(is_approved=False)
+
+    with transaction.atomic():
+        rows = list(comments.select_for_update().order_by().values_list("pk", "post_id", "is_approved"))
+        ids = [pk for pk, _, _ in rows]
+        deltas = {}
+        for _, post_id, is_approved in rows:
+            approved, pending = deltas.get(post_id, (0, 0))
+            if action == ModerationAction.APPROVE:
+                deltas[post_id] = (approved + 1, pending - 1)
+            elif is_approved:
+                deltas[post_id] = (approved - 1, pending)
+            else:
+                deltas[post_id] = (approved, pending - 1)
+
+        if ids:
+            matched = Comment.objects.filter(pk__in=ids)
+            if action == ModerationAction.APPROVE:
+                matched.update(is_approved=True)
+            else:
+                matched.delete()
+            adjust_comment_counts(deltas)
+    return {"action": action, "count": len(ids), "posts": sorted(deltas)}
@@ -1,9 +1,18 @@
+import json
+from io import StringIO
+from unittest import mock
+
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import transaction
 from django.test import TestCase
 from django.urls import reverse
 
 from apps.blog.models import BlogPost
 
+from .models import Comment
+from .services import ModerationAction, moderate_comments
+
 
 class CommentPermissionTest(TestCase):
     def setUp(self):
@@ -26,3 +35,121 @@ class CommentPermissionTest(TestCase):
         response = self.client.post(reverse("comment_create", kwargs={"slug": self.post.slug}), {"body": "Hi"})
         self.assertEqual(response.status_code, 302)
         self.assertEqual(self.post.comments.count(), 1)
+
+
+class CommentCounterTest(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        self.reader = User.objects.create_user(username="reader", password="pass1234")
+        self.post = BlogPost.objects.create(
+            title="Post", author=self.staff, content="Text", status=BlogPost.Status.PUBLISHED
+        )
+
+    def _counts(self):
+        self.post.refresh_from_db()
+        return self.post.approved_comment_count, self.post.pending_comment_count
+
+    def test_counters_follow_create_approve_and_delete(self):
+        self.client.force_login(self.reader)
+        self.client.post(reverse("comment_create", kwargs={"slug": self.post.slug}), {"body": "First"})
+        self.client.post(reverse("comment_create", kwargs={"slug": self.post.slug}), {"body": "Second"})
+        self.assertEqual(self._counts(), (0, 2))
+
+        first, second = Comment.objects.order_by("pk")
+        self.client.force_login(self.staff)
+        self.client.post(reverse("comment_approve", kwargs={"pk": first.pk}))
+        self.client.post(reverse("comment_approve", kwargs={"pk": first.pk}))  # double submit
+        self.assertEqual(self._counts(), (1, 1))
+
+        self.client.post(reverse("comment_delete", kwargs={"pk": first.pk}))
+        self.client.post(reverse("comment_delete", kwargs={"pk": second.pk}))
+        self.assertEqual(self._counts(), (0, 0))
+
+    def test_reconcile_command_repairs_drift(self):
+        Comment.objects.create(post=self.post, author=self.reader, body="a", is_approved=True)
+        Comment.objects.create(post=self.post, author=self.reader, body="b")
+        BlogPost.objects.filter(pk=self.post.pk).update(approved_comment_count=7)
+
+        out = StringIO()
+        call_command("reconcile_comment_counts", "--dry-run", stdout=out)
+        self.assertIn("approved 7 → 1", out.getvalue())
+        self.assertEqual(self._counts(), (7, 0))
+
+        call_command("reconcile_comment_counts", stdout=StringIO())
+        self.assertEqual(self._counts(), (1, 1))
+
+    def test_caches_are_invalidated_only_after_commit(self):
+        comment = Comment.objects.create(post=self.post, author=self.reader, body="a")
+        with mock.patch("apps.comments.services.invalidate_pages") as invalidate_pages, \
+                mock.patch("apps.comments.services.invalidate_dashboard_kpis") as invalidate_kpis:
+            with self.captureOnCommitCallbacks() as callbacks:
+                with transaction.atomic():
+                    moderate_comments(ModerationAction.APPROVE, Comment.objects.filter(pk=comment.pk))
+                    invalidate_pages.assert_not_called()
+                    invalidate_kpis.assert_not_called()
+            for callback in callbacks:
+                callback()
+        invalidate_pages.assert_called_once_with("posts")
+        invalidate_kpis.assert_called_once_with()
+
+
+class BulkModerationTest(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        reader = User.objects.create_user(username="reader", password="pass1234")
+        self.posts = [
+            BlogPost.objects.create(title=f"Post {i}", author=self.staff, content="Text", status=BlogPost.Status.PUBLISHED)
+            for i in range(2)
+        ]
+        for post in self.posts:
+            for i in range(3):
+                Comment.objects.create(post=post, author=reader, body=f"c{i}", is_approved=i == 0)
+        call_command("reconcile_comment_counts", stdout=StringIO())
+        self.client.force_login(self.staff)
+
+    def _moderate(self, **payload):
+        return self.client.post(reverse("comment_bulk_moderate"), json.dumps(payload), content_type="application/json")
+
+    def _counts(self):
+        return [
+            (post.approved_comment_count, post.pending_comment_count)
+            for post in BlogPost.objects.filter(pk__in=[p.pk for p in self.posts]).order_by("pk")
+        ]
+
+    def test_approve_all_pending_in_one_update(self):
+        with self.assertNumQueries(7):  # session, user, savepoint, lock, UPDATE comments, UPDATE posts, release
+            response = self._moderate(action="approve", status="pending")
+        self.assertEqual(response.json()["count"], 4)
+        self.assertEqual(self._counts(), [(3, 0), (3, 0)])
+
+    def test_delete_selected_ids_adjusts_each_post(self):
+        ids = list(Comment.objects.filter(post=self.posts[0]).values_list("pk", flat=True))
+        data = self._moderate(action="delete", ids=ids).json()
+        self.assertEqual((data["count"], data["posts"]), (3, [self.posts[0].pk]))
+        self.assertEqual(self._counts(), [(0, 0), (1, 2)])
+
+    def test_filter_by_post(self):
+        self._moderate(action="delete", status="pending", post=self.posts[1].pk)
+        self.assertEqual(self._counts(), [(1, 2), (1, 0)])
+
+    def test_requires_ids_or_status_and_a_valid_action(self):
+        self.assertEqual(self._moderate(action="approve").status_code, 400)
+        self.assertEqual(self._moderate(action="explode", status="all").status_code, 400)
+        self.assertEqual(Comment.objects.count(), 6)
+
+    def test_ids_must_be_a_list_of_integers(self):
+        first = Comment.objects.order_by("pk").first().pk
+        for ids in (f"{first}{first + 1}", [str(first)], [True], [first, 1.5], {"id": first}):
+            self.assertEqual(self._moderate(action="delete", ids=ids).status_code, 400, ids)
+        self.assertEqual(Comment.objects.count(), 6)
+
+    def test_form_post_redirects_to_dashboard(self):
+        ids = Comment.objects.filter(is_approved=False).values_list("pk", flat=True)[:2]
+        response = self.client.post(reverse("comment_bulk_moderate"), {"action": "approve", "ids": list(ids)})
+        self.assertRedirects(response, reverse("dashboard"), fetch_redirect_response=False)
+        self.assertEqual(Comment.objects.filter(is_approved=True).count(), 4)
+
+    def test_staff_only(self):
+        self.client.logout()
+        self._moderate(action="delete", status="all")
+        self.assertEqual(Comment.objects.count(), 6)
@@ -1,16 +1,27 @@
+import json
+
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.db import transaction
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.template.defaultfilters import pluralize
+from django.urls import reverse
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
 
 from apps.blog.models import BlogPost
+from apps.portfolio.ratelimit import rate_limit
 
 from .forms import CommentForm
 from .models import Comment
+from .services import ModerationAction, adjust_comment_counts, moderate_comments
 
 _staff = lambda u: u.is_staff  # noqa: E731
 
 
 @login_required
+@rate_limit("comment")
 def create_comment_view(request, slug):
     post = get_object_or_404(BlogPost, slug=slug, status=BlogPost.Status.PUBLISHED)
     if request.method == "POST":
@@ -19,7 +30,9 @@ def create_comment_view(request, slug):
             comment = form.save(commit=False)
             comment.post   = post
             comment.author = request.user
-            comment.save()
+            with transaction.atomic():
+                comment.save()
+                adjust_comment_counts({post.pk: (0, 1)})
             messages.success(request, "Comment submitted for review.")
     return redirect(post.get_absolute_url())
 
@@ -27,9 +40,11 @@ def create_comment_view(request, slug):
 @login_required
 @user_passes_test(_staff)
 def approve_comment_view(request, pk):
-    comment = get_object_or_404(Comment, pk=pk)
-    comment.is_approved = True
-    comment.save(update_fields=["is_approved"])
+    comment = get_object_or_404(Comment.objects.select_related("post"), pk=pk)
+    with transaction.atomic():
+        # Conditional update: a double-submitted approval only moves the counters once
+        if Comment.objects.filter(pk=pk, is_approved=False).update(is_approved=True):
+            adjust_comment_counts({comment.post_id: (1, -1)})
     messages.success(request, "Comment approved.")
     return redirect(comment.post.get_absolute_url())
 
@@ -37,11 +52,77 @@ def approve_comment_view(request, pk):
 @login_required
 @user_passes_test(_staff)
 def delete_comment_view(request, pk):
-    comment = get_object_or_404(Comment, pk=pk)
+    comment = get_object_or_404(Comment.objects.select_related("post"), pk=pk)
     post_url = comment.post.get_absolute_url()
     if request.method == "POST":
-        comment.delete()
+        with transaction.atomic():
+            comment = Comment.objects.select_for_update().filter(pk=pk).first()
+            if comment is not None:
+                comment.delete()
+                adjust_comment_counts({comment.post_id: (-1, 0) if comment.is_approved else (0, -1)})
         messages.success(request, "Comment deleted.")
         next_url = request.POST.get("next", post_url)
         return redirect(next_url)
     return redirect(post_url)
+
+
+BULK_STATUS_FILTERS = {"pending": {"is_approved": False}, "approved": {"is_approved": True}, "all": {}}
+
+
+def _moderation_params(request):
+    if request.content_type == "application/json":
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+    return {
+        "action": request.POST.get("action"),
+        "ids": [int(pk) if pk.isdigit() else pk for pk in request.POST.getlist("ids")],
+        "post": request.POST.get("post"),
+        "status": request.POST.get("status"),
+    }
+
+
+@login_required
+@user_passes_test(_staff)
+@require_POST
+def bulk_moderate_comments_view(request):
+    """
+    Approve or delete many comments in one request.
+
+    Target either explicit ``ids`` or a filter: ``status`` (pending/approved/all,
+    required so an empty request never matches everything) plus an optional
+    ``post`` id. Accepts JSON or form data; form posts redirect to ``next``.
+    """
+    params = _moderation_params(request)
+    if params is None:
+        return JsonResponse({"error": "Invalid JSON body."}, status=400)
+
+    ids = params.get("ids")
+    # A JSON string would otherwise be iterated character by character ("12" -> 1, 2).
+    if ids is not None and not (isinstance(ids, list) and all(type(pk) is int for pk in ids)):
+        return JsonResponse({"error": "ids must be a list of integers."}, status=400)
+
+    comments = Comment.objects.all()
+    try:
+        if ids:
+            comments = comments.filter(pk__in=ids)
+        elif params.get("status") in BULK_STATUS_FILTERS:
+            comments = comments.filter(**BULK_STATUS_FILTERS[params["status"]])
+        else:
+            return JsonResponse({"error": "Pass ids or a status filter."}, status=400)
+        if params.get("post"):
+            comments = comments.filter(post_id=int(params["post"]))
+        result = moderate_comments(params.get("action"), comments)
+    except (TypeError, ValueError) as exc:
+        return JsonResponse({"error": str(exc)}, status=400)
+
+    if request.content_type == "application/json":
+        return JsonResponse(result)
+    verb = "approved" if result["action"] == ModerationAction.APPROVE else "deleted"
+    messages.success(request, f"{result['count']} comment{pluralize(result['count'])} {verb}.")
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = reverse("dashboard")
+    return redirect(next_url)
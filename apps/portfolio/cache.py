@@ -0,0 +1,137 @@
+"""
+Full-page cache for the public pages anonymous visitors hit most.
+
+Pages are stored in the configured ``CACHES`` backend under a key built from
+the path, the query parameters the views read (``CACHE_KEY_PARAMS``) and the
+version of every content group the page depends on. Other parameters (UTM
+tags, cache busters) cannot change the page, so they share its entry.
+Saving or deleting a model bumps its group's version (see ``signals.py``), so
+editors see changes on the next request without flushing unrelated pages.
+"""
+import logging
+import re
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+
+logger = logging.getLogger(__name__)
+
+# Every page renders the site profile in base.html, so every page depends on it.
+ALWAYS_DEPENDS_ON = ("profile",)
+
+# Query parameters the cached views read; any other parameter is left out of the key.
+CACHE_KEY_PARAMS = ("category", "cursor", "q")
+
+_CSRF_INPUT_RE = re.compile(r'name="csrfmiddlewaretoken" value="[^"]*"')
+_CSRF_PLACEHOLDER = 'name="csrfmiddlewaretoken" value="__CSRF_TOKEN__"'
+
+
+def _timeout() -> int:
+    return getattr(settings, "PAGE_CACHE_TIMEOUT", 600)
+
+
+def _group_versions(groups) -> list:
+    keys = [f"page-cache-version:{group}" for group in groups]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed with a timestamp so an evicted counter never reuses an old version.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [str(versions[key]) for key in keys]
+
+
+def invalidate_pages(*groups):
+    """Bump the version of each content group, orphaning every page built from it."""
+    for group in groups:
+        key = f"page-cache-version:{group}"
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+        except Exception:
+            logger.exception("Could not invalidate page cache group %s", group)
+
+
+def _count(outcome: str):
+    key = f"page-cache-stats:{outcome}"
+    try:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+    except Exception:
+        pass
+
+
+def page_cache_stats() -> dict:
+    stats = cache.get_many(["page-cache-stats:hits", "page-cache-stats:misses"])
+    hits = stats.get("page-cache-stats:hits", 0)
+    misses = stats.get("page-cache-stats:misses", 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 3) if total else 0.0}
+
+
+def _page_key(request) -> str:
+    params = sorted((name, value) for name in CACHE_KEY_PARAMS for value in request.GET.getlist(name))
+    return f"{request.path}?{urlencode(params)}" if params else request.path
+
+
+def _is_cacheable(request) -> bool:
+    return (
+        request.method in ("GET", "HEAD")
+        and not request.user.is_authenticated
+        # A flash message is about to be rendered into this page for this visitor only.
+        and not len(get_messages(request))
+    )
+
+
+def cache_public_page(*groups):
+    """
+    Cache a view's HTML for anonymous visitors, keyed on the path, its
+    ``CACHE_KEY_PARAMS`` and ``groups``.
+
+    The CSRF hidden inputs are stored as placeholders and refilled with the
+    current visitor's token on every hit.
+    """
+    groups = tuple(groups) + ALWAYS_DEPENDS_ON
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not _is_cacheable(request):
+                return view(request, *args, **kwargs)
+
+            try:
+                key = "page-cache:{}:{}".format(":".join(_group_versions(groups)), _page_key(request))
+                cached = cache.get(key)
+            except Exception:
+                logger.exception("Page cache unavailable")
+                return view(request, *args, **kwargs)
+
+            if cached is not None:
+                _count("hits")
+                token_input = f'name="csrfmiddlewaretoken" value="{get_token(request)}"'
+                content = cached["content"].replace(_CSRF_PLACEHOLDER, token_input)
+                response = HttpResponse(content, content_type=cached["content_type"])
+                response["X-Page-Cache"] = "hit"
+                return response
+
+            _count("misses")
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                content = _CSRF_INPUT_RE.sub(_CSRF_PLACEHOLDER, response.content.decode(response.charset))
+                try:
+                    cache.set(key, {"content": content, "content_type": response["Content-Type"]}, _timeout())
+                except Exception:
+                    logger.exception("Could not store page %s", key)
+                response["X-Page-Cache"] = "miss"
+            return response
+
+        return wrapper
+
+    return decorator
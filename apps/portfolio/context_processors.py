@@ -1,11 +1,56 @@
+import time
 from types import SimpleNamespace
 
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
 from .models import Profile
 from .resume_defaults import DEFAULT_PROFILE
 
+VERSION_KEY = "site-profile-version"
+# How long a process trusts its in-memory copy before re-checking the shared version.
+LOCAL_TTL = 5
+
+_local = {"version": None, "profile": None, "checked_at": 0.0}
+
+
+def _current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def get_site_profile():
+    """Latest ``Profile`` (or the resume defaults), cached in process memory and the shared cache."""
+    now = time.monotonic()
+    if _local["profile"] is not None and now - _local["checked_at"] < LOCAL_TTL:
+        return _local["profile"]
+
+    version = _current_version()
+    if _local["profile"] is None or _local["version"] != version:
+        key = f"site-profile:{version}"
+        profile = cache.get(key)
+        if profile is None:
+            profile = Profile.objects.order_by("-updated_at").first()
+            if profile is None:
+                profile = SimpleNamespace(**DEFAULT_PROFILE, photo=None)
+            cache.set(key, profile, timeout=None)
+        _local["profile"], _local["version"] = profile, version
+    _local["checked_at"] = now
+    return _local["profile"]
+
+
+def invalidate_site_profile():
+    """Called on ``Profile`` save/delete: drop this process's copy and bump the shared version."""
+    _local["profile"] = None
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+
 
 def site_profile(_request):
-    profile = Profile.objects.order_by("-updated_at").first()
-    if profile is None:
-        profile = SimpleNamespace(**DEFAULT_PROFILE, photo=None)
-    return {"site_profile": profile}
+    # Lazy: templates that never touch ``site_profile`` never hit the cache or database.
+    return {"site_profile": SimpleLazyObject(get_site_profile)}
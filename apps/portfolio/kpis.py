@@ -0,0 +1,47 @@
+"""
+Dashboard KPI counters: one conditional ``aggregate()`` per table, cached briefly.
+
+Saves and deletes of the counted models drop the cached block (see
+``signals.py``); bulk ``update()`` paths call ``invalidate_dashboard_kpis``
+themselves, and the short TTL bounds anything else.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.blog.models import BlogPost
+from apps.comments.models import Comment
+from apps.subscriptions.models import Subscriber
+
+from .models import ContactMessage, Project
+
+KPI_CACHE_KEY = "dashboard-kpis"
+
+
+def _timeout() -> int:
+    return getattr(settings, "DASHBOARD_KPI_TIMEOUT", 30)
+
+
+def _compute_kpis() -> dict:
+    kpis = BlogPost.objects.aggregate(
+        post_count=Count("pk"),
+        published_count=Count("pk", filter=Q(status=BlogPost.Status.PUBLISHED)),
+        draft_count=Count("pk", filter=Q(status=BlogPost.Status.DRAFT)),
+    )
+    kpis.update(Subscriber.objects.aggregate(subscriber_count=Count("pk", filter=Q(is_active=True))))
+    kpis.update(Comment.objects.aggregate(pending_comments=Count("pk", filter=Q(is_approved=False))))
+    kpis.update(Project.objects.aggregate(project_count=Count("pk")))
+    kpis.update(ContactMessage.objects.aggregate(unread_messages=Count("pk", filter=Q(is_read=False))))
+    return kpis
+
+
+def dashboard_kpis() -> dict:
+    kpis = cache.get(KPI_CACHE_KEY)
+    if kpis is None:
+        kpis = _compute_kpis()
+        cache.set(KPI_CACHE_KEY, kpis, _timeout())
+    return kpis
+
+
+def invalidate_dashboard_kpis():
+    cache.delete(KPI_CACHE_KEY)
@@ -0,0 +1,104 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.blog.models import BlogPost
+from apps.comments.models import Comment
+from apps.subscriptions.models import Subscriber
+from apps.subscriptions.services import email_prefix_filter
+
+PUBLISHED = BlogPost.Status.PUBLISHED
+
+# (label, queryset factory, index that must serve it: a name, or one per database vendor)
+HOT_QUERIES = [
+    (
+        "Published posts, default ordering",
+        lambda: BlogPost.objects.filter(status=PUBLISHED)[:10],
+        "blog_post_status_recent",
+    ),
+    (
+        "Blog list keyset page",
+        lambda: BlogPost.objects.filter(status=PUBLISHED).order_by("-published_at", "-id")[:10],
+        "blog_post_published_keyset",
+    ),
+    (
+        "Category page",
+        lambda: BlogPost.objects.filter(category_id=1, status=PUBLISHED).order_by("-published_at", "-id")[:10],
+        "blog_post_cat_status_pub",
+    ),
+    (
+        "Approved comments on a post",
+        lambda: Comment.objects.filter(post_id=1, is_approved=True),
+        "comment_post_approved_recent",
+    ),
+    ("Pending comments queue", lambda: Comment.objects.filter(is_approved=False)[:10], "comment_pending_recent"),
+    (
+        "Active subscriber shard",
+        lambda: Subscriber.objects.filter(is_active=True, pk__gte=1, pk__lt=5000).order_by("pk"),
+        "subscriber_active_id",
+    ),
+    ("Subscriber list page", lambda: Subscriber.objects.order_by("-created_at", "-id")[:50], "subscriber_recent"),
+    (
+        "Subscriber email prefix search",
+        lambda: Subscriber.objects.filter(email_prefix_filter("ab"))[:50],
+        {"sqlite": "subscriber_email_lower", "postgresql": "subscriber_email_lower_like"},
+    ),
+]
+
+# Full table scans: PostgreSQL "Seq Scan on t", SQLite "SCAN t" without an index
+SEQ_SCAN_PATTERNS = {
+    "postgresql": re.compile(r"Seq Scan on (\w+)"),
+    "sqlite": re.compile(r"\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)(?:\s|$)"),
+}
+# A sort step for ORDER BY that the index should have made unnecessary
+SORT_PATTERNS = {
+    "postgresql": re.compile(r"^\s*(?:->\s*)?(?:Incremental )?Sort\b", re.MULTILINE),
+    "sqlite": re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF |LAST TERM OF )?ORDER BY"),
+}
+
+
+def plan_problems(plan: str, vendor: str, index: str) -> list:
+    """Why ``plan`` is not the intended one: a sequential scan, another index, or a sort."""
+    problems = [f"sequential scan on {table}" for table in SEQ_SCAN_PATTERNS[vendor].findall(plan)]
+    if not re.search(rf"\b{re.escape(index)}\b", plan):
+        problems.append(f"does not use {index}")
+    if SORT_PATTERNS[vendor].search(plan):
+        problems.append("sorts for ORDER BY")
+    return problems
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN each hot query and fail unless it is served by its intended index without a sort."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every query plan.")
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor not in SEQ_SCAN_PATTERNS:
+            raise CommandError(f"Query plan checks are not supported on {vendor}.")
+
+        failures = []
+        for label, build, index in HOT_QUERIES:
+            plan = self._explain(build())
+            if options["verbose_plans"]:
+                self.stdout.write(f"-- {label}\n{plan}\n")
+            problems = plan_problems(plan, vendor, index if isinstance(index, str) else index[vendor])
+            if problems:
+                failures.append(label)
+                self.stdout.write(self.style.ERROR(f"✗ {label}: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {label}"))
+
+        if failures:
+            raise CommandError(f"{len(failures)} hot queries are not served by their intended index.")
+
+    def _explain(self, queryset):
+        if connection.vendor != "postgresql":
+            return queryset.explain()
+        # Tiny tables make a seq scan the cheapest plan; forbid it to see whether an index *can* serve the query.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
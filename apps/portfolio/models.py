@@ -50,6 +50,11 @@ class Skill(models.Model):
 
 
 class ContactMessage(models.Model):
+    class EmailStatus(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENT = "sent", "Sent"
+        FAILED = "failed", "Failed"
+
     name       = models.CharField(max_length=120)
     email      = models.EmailField()
     subject    = models.CharField(max_length=160)
@@ -57,8 +62,22 @@ class ContactMessage(models.Model):
     is_read    = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Delivery of the admin notification + user confirmation (see portfolio.tasks)
+    email_status   = models.CharField(max_length=20, choices=EmailStatus.choices, default=EmailStatus.PENDING)
+    email_attempts = models.PositiveIntegerField(default=0)
+    email_error    = models.TextField(blank=True)
+    # Each copy is recorded as it goes out, so a retry resends only the one that failed
+    admin_email_sent_at = models.DateTimeField(blank=True, null=True)
+    user_email_sent_at  = models.DateTimeField(blank=True, null=True)
+
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Inbox "unread" filter and unread counts
+            models.Index(fields=["is_read", "-created_at"], name="contact_read_recent"),
+            # Inbox keyset pages: ORDER BY created_at DESC, id DESC
+            models.Index(fields=["-created_at", "-id"], name="contact_recent"),
+        ]
 
     def __str__(self):
         return f"{self.name} — {self.subject}"
@@ -0,0 +1,204 @@
+"""
+Sliding-window rate limits for the public write endpoints.
+
+``RATE_LIMITS`` gives each scope a per-client budget (``"ip"``) and a budget
+shared by every client (``"global"``), e.g. ``"20/m"``. A budget of N per W
+seconds is checked with the sliding-window counter: the current fixed
+window's count plus the previous window's count weighted by how much of it
+still overlaps the last W seconds. Every attempt counts, so a client that
+keeps hammering stays limited, and a request refused by its per-IP budget
+never reaches (or spends) the global one.
+
+With the Redis cache backend all counters of a request are incremented and
+compared by one Lua script, so concurrent requests cannot slip past the limit
+and a window's TTL is set once instead of on every hit. Otherwise (or if
+Redis errors) counters live in this process as ``itertools.count`` objects,
+whose ``next()`` is atomic, so the request path takes no lock.
+"""
+import itertools
+import logging
+import math
+import time
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.http import JsonResponse
+from django.shortcuts import render
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+LIMITED_MESSAGE = "Too many requests. Please try again in a moment."
+
+# KEYS: (current, previous) window key per budget.
+# ARGV: (window seconds, limit, previous-window weight) per budget.
+# Returns 0 when allowed, else the 1-based index of the exhausted budget.
+_SLIDING_WINDOW_LUA = """
+for i = 1, #KEYS / 2 do
+  local current = redis.call('INCR', KEYS[2 * i - 1])
+  if current == 1 then
+    redis.call('EXPIRE', KEYS[2 * i - 1], 2 * tonumber(ARGV[3 * i - 2]))
+  end
+  local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+  if previous * tonumber(ARGV[3 * i]) + current > tonumber(ARGV[3 * i - 1]) then
+    return i
+  end
+end
+return 0
+"""
+
+
+def parse_rate(rate: str) -> tuple:
+    """``"20/m"`` -> ``(20, 60)``: requests allowed per window of seconds."""
+    count, _, period = rate.partition("/")
+    period = period.strip() or "s"
+    seconds = int(period) if period.isdigit() else PERIODS[period[0]]
+    return int(count), seconds
+
+
+def _budgets(scope: str, ip: str) -> list:
+    """``(key, limit, window)`` for each budget of ``scope``, per-IP first."""
+    config = settings.RATE_LIMITS[scope]
+    budgets = []
+    for name, ident in (("ip", ip), ("global", "*")):
+        if config.get(name):
+            limit, window = parse_rate(config[name])
+            budgets.append((f"ratelimit:{scope}:{ident}", limit, window))
+    return budgets
+
+
+def client_ip(request) -> str:
+    """
+    The caller's address. Behind ``RATE_LIMIT_PROXY_COUNT`` trusted proxies it is
+    the entry they appended to ``X-Forwarded-For``; earlier entries are client-supplied.
+    """
+    proxies = settings.RATE_LIMIT_PROXY_COUNT
+    if proxies:
+        forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "unknown")
+
+
+def _windows(window: int, now: float) -> tuple:
+    """Current window index and the share of the previous window still inside the sliding window."""
+    index, elapsed = divmod(now, window)
+    return int(index), 1 - elapsed / window
+
+
+# ─── Counters ────────────────────────────────────────────────────────────────
+
+def _hit_redis(backend, budgets, now):
+    client = backend._cache.get_client(write=True)
+    keys, args = [], []
+    for key, limit, window in budgets:
+        index, weight = _windows(window, now)
+        keys += [backend.make_and_validate_key(f"{key}:{index}"), backend.make_and_validate_key(f"{key}:{index - 1}")]
+        args += [window, limit, weight]
+    return int(client.register_script(_SLIDING_WINDOW_LUA)(keys=keys, args=args))
+
+
+_counters = {}  # (key, window index, window) -> itertools.count
+_totals = {}    # (key, window index, window) -> last value handed out
+_pruned = {"at": 0.0}
+
+
+def _prune(now):
+    """Drop windows older than the previous one; at most once a second."""
+    if now - _pruned["at"] < 1:
+        return
+    _pruned["at"] = now
+    for entry in list(_counters):
+        _, index, window = entry
+        if index < _windows(window, now)[0] - 1:
+            _counters.pop(entry, None)
+            _totals.pop(entry, None)
+
+
+def _hit_local(budgets, now):
+    _prune(now)
+    for position, (key, limit, window) in enumerate(budgets, start=1):
+        index, weight = _windows(window, now)
+        entry = (key, index, window)
+        counter = _counters.get(entry) or _counters.setdefault(entry, itertools.count(1))
+        current = next(counter)
+        _totals[entry] = current
+        if _totals.get((key, index - 1, window), 0) * weight + current > limit:
+            return position
+    return 0
+
+
+def reset():
+    """Forget this process's counters (Redis windows expire on their own)."""
+    _counters.clear()
+    _totals.clear()
+
+
+def check(scope: str, ip: str, now: float = None):
+    """
+    Count one request against ``scope``'s budgets. ``None`` if it may proceed,
+    else the seconds until the exhausted budget's window rolls over.
+    """
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    budgets = _budgets(scope, ip)
+    now = time.time() if now is None else now
+    backend = caches["default"]
+    exhausted = None
+    if isinstance(backend, RedisCache):
+        try:
+            exhausted = _hit_redis(backend, budgets, now)
+        except Exception:
+            logger.warning("Redis rate limiter unavailable; counting %s in-process", scope, exc_info=True)
+    if exhausted is None:
+        exhausted = _hit_local(budgets, now)
+    if not exhausted:
+        return None
+    window = budgets[exhausted - 1][2]
+    return max(1, math.ceil(window - now % window))
+
+
+# ─── Decorator ───────────────────────────────────────────────────────────────
+
+def _limited_response(request, retry_after: int):
+    if request.content_type == "application/json":
+        response = JsonResponse({"error": "Rate limit exceeded. Try again."}, status=429)
+    else:
+        response = render(request, "429.html", {"message": LIMITED_MESSAGE, "retry_after": retry_after}, status=429)
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def rate_limit(scope: str, methods=("POST",)):
+    """
+    Refuse ``methods`` requests to a view with 429 once ``scope``'s per-IP or
+    global budget is spent: JSON for JSON requests, the ``429.html`` page otherwise.
+    Works on sync and async views; for async views the page is rendered in a
+    thread, since ``base.html`` queries the profile and the session user.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                if request.method in methods:
+                    retry_after = await sync_to_async(check)(scope, client_ip(request))
+                    if retry_after:
+                        return await sync_to_async(_limited_response)(request, retry_after)
+                return await view(request, *args, **kwargs)
+
+            return markcoroutinefunction(async_wrapper)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                retry_after = check(scope, client_ip(request))
+                if retry_after:
+                    return _limited_response(request, retry_after)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,68 @@
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import ContactMessage
+
+
+def build_html_email(subject, template_html, template_txt, context, recipient) -> EmailMultiAlternatives:
+    """Build a dual-format (HTML + plain text) email."""
+    html_body = render_to_string(template_html, context)
+    text_body = render_to_string(template_txt, context)
+    msg = EmailMultiAlternatives(
+        subject=subject,
+        body=text_body,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient],
+    )
+    msg.attach_alternative(html_body, "text/html")
+    return msg
+
+
+def send_contact_emails(contact_msg):
+    """
+    Send the admin notification and the user's confirmation over one SMTP connection,
+    skipping a copy that already went out. Each copy is recorded as it is sent;
+    the first error is re-raised after both have been tried.
+    """
+    ctx = {
+        "name":        contact_msg.name,
+        "email":       contact_msg.email,
+        "subject":     contact_msg.subject,
+        "message":     contact_msg.message,
+        "received_at": timezone.localtime(contact_msg.created_at).strftime("%B %d, %Y at %H:%M UTC"),
+        "site_url":    settings.SITE_BASE_URL,
+    }
+    copies = []
+    if contact_msg.admin_email_sent_at is None:
+        copies.append(("admin_email_sent_at", build_html_email(
+            subject=f"📬 New Contact: {contact_msg.subject}",
+            template_html="emails/contact_admin.html",
+            template_txt="emails/contact_admin.txt",
+            context=ctx,
+            recipient=settings.ADMIN_EMAIL,
+        )))
+    if contact_msg.user_email_sent_at is None:
+        copies.append(("user_email_sent_at", build_html_email(
+            subject="✅ We received your message",
+            template_html="emails/contact_user.html",
+            template_txt="emails/contact_user.txt",
+            context=ctx,
+            recipient=contact_msg.email,
+        )))
+    if not copies:
+        return
+
+    errors = []
+    with get_connection(fail_silently=False) as connection:
+        for field, email in copies:
+            try:
+                connection.send_messages([email])
+            except Exception as exc:
+                errors.append(exc)
+                continue
+            setattr(contact_msg, field, timezone.now())
+            ContactMessage.objects.filter(pk=contact_msg.pk).update(**{field: getattr(contact_msg, field)})
+    if errors:
+        raise errors[0]
@@ -0,0 +1,55 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from apps.blog.models import BlogPost, Category, Tag
+from apps.comments.models import Comment
+from apps.subscriptions.models import Subscriber
+
+from .cache import invalidate_pages
+from .context_processors import invalidate_site_profile
+from .kpis import invalidate_dashboard_kpis
+from .models import ContactMessage, Education, Profile, Project, Skill
+
+# Model -> page-cache groups whose pages render it
+PAGE_CACHE_GROUPS = {
+    BlogPost: ("posts",),
+    Category: ("posts",),
+    Tag: ("posts",),
+    Project: ("projects",),
+    Skill: ("skills",),
+    Education: ("education",),
+    Profile: ("profile",),
+}
+
+
+def _invalidate_page_cache(sender, **kwargs):
+    invalidate_pages(*PAGE_CACHE_GROUPS[sender])
+
+
+for _model in PAGE_CACHE_GROUPS:
+    post_save.connect(_invalidate_page_cache, sender=_model, dispatch_uid=f"page-cache-save-{_model.__name__}")
+    post_delete.connect(_invalidate_page_cache, sender=_model, dispatch_uid=f"page-cache-delete-{_model.__name__}")
+
+
+def _invalidate_post_tags(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_pages("posts")
+
+
+m2m_changed.connect(_invalidate_post_tags, sender=BlogPost.tags.through, dispatch_uid="page-cache-post-tags")
+
+
+def _invalidate_site_profile(sender, **kwargs):
+    invalidate_site_profile()
+
+
+post_save.connect(_invalidate_site_profile, sender=Profile, dispatch_uid="site-profile-save")
+post_delete.connect(_invalidate_site_profile, sender=Profile, dispatch_uid="site-profile-delete")
+
+
+def _invalidate_dashboard_kpis(sender, **kwargs):
+    invalidate_dashboard_kpis()
+
+
+for _model in (BlogPost, Subscriber, Comment, Project, ContactMessage):
+    post_save.connect(_invalidate_dashboard_kpis, sender=_model, dispatch_uid=f"dashboard-kpis-save-{_model.__name__}")
+    post_delete.connect(_invalidate_dashboard_kpis, sender=_model, dispatch_uid=f"dashboard-kpis-delete-{_model.__name__}")
@@ -0,0 +1,39 @@
+import logging
+
+from celery import shared_task
+from django.db.models import F
+
+from apps.taskqueue.queue import DatabaseTask
+
+from .models import ContactMessage
+from .services import send_contact_emails
+
+logger = logging.getLogger(__name__)
+
+
+class ContactEmailTask(DatabaseTask):
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        # An error outside the send (or a worker giving up on it) must not leave the message pending forever.
+        message_id = args[0] if args else kwargs.get("message_id")
+        ContactMessage.objects.filter(pk=message_id, email_status=ContactMessage.EmailStatus.PENDING).update(
+            email_status=ContactMessage.EmailStatus.FAILED, email_error=str(exc)
+        )
+
+
+@shared_task(bind=True, base=ContactEmailTask, max_retries=5)
+def deliver_contact_emails(self, message_id: int):
+    """Send a contact form's emails, retrying with exponential backoff and recording the outcome."""
+    contact_msg = ContactMessage.objects.get(pk=message_id)
+    row = ContactMessage.objects.filter(pk=message_id)
+    row.update(email_attempts=F("email_attempts") + 1)
+    try:
+        send_contact_emails(contact_msg)
+    except Exception as exc:
+        logger.exception("Contact email failed for message=%s (attempt %s)", message_id, self.request.retries + 1)
+        if self.request.retries >= self.max_retries:
+            row.update(email_status=ContactMessage.EmailStatus.FAILED, email_error=str(exc))
+            return ContactMessage.EmailStatus.FAILED
+        row.update(email_error=str(exc))
+        raise self.retry(exc=exc, countdown=30 * 2 ** self.request.retries)
+    row.update(email_status=ContactMessage.EmailStatus.SENT, email_error="")
+    return ContactMessage.EmailStatus.SENT
@@ -0,0 +1,324 @@
+import re
+import threading
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.taskqueue.models import QueuedTask
+from config.celery import app as celery_app
+
+from . import ratelimit
+from .cache import page_cache_stats
+from .context_processors import invalidate_site_profile, site_profile
+from .kpis import dashboard_kpis
+from .management.commands.check_query_plans import SEQ_SCAN_PATTERNS, plan_problems
+from .views import DASHBOARD_PANELS, DASHBOARD_QUERY_BUDGET, INBOX_PAGE_SIZE
+from .models import ContactMessage, Profile, Project, Skill
+from .resume_defaults import DEFAULT_PROFILE
+from .tasks import deliver_contact_emails
+
+
+class ContactFormTest(TestCase):
+    payload = {
+        "name": "Visitor",
+        "email": "visitor@example.com",
+        "subject": "Hello",
+        "message": "Nice portfolio!",
+    }
+
+    def test_contact_emails_are_sent_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.client.post(reverse("contact"), self.payload)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+
+        for callback in callbacks:
+            callback()
+        contact_msg = ContactMessage.objects.get()
+        self.assertEqual(contact_msg.email_status, ContactMessage.EmailStatus.SENT)
+        self.assertEqual(contact_msg.email_attempts, 1)
+        self.assertCountEqual([m.to[0] for m in mail.outbox], [settings.ADMIN_EMAIL, "visitor@example.com"])
+
+    def test_failed_delivery_is_recorded_on_the_message(self):
+        with mock.patch("apps.portfolio.tasks.send_contact_emails", side_effect=OSError("smtp down")):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(reverse("contact"), self.payload)
+            self.assertEqual(response.status_code, 302)
+            contact_msg = ContactMessage.objects.get()
+            self.assertEqual(contact_msg.email_status, ContactMessage.EmailStatus.PENDING)
+            self.assertIn("smtp down", contact_msg.email_error)
+
+            # Last allowed attempt gives up and marks the message as failed.
+            deliver_contact_emails.apply(args=[contact_msg.pk], retries=deliver_contact_emails.max_retries)
+        contact_msg.refresh_from_db()
+        self.assertEqual(contact_msg.email_status, ContactMessage.EmailStatus.FAILED)
+        self.assertEqual(contact_msg.email_attempts, 2)
+
+    @override_settings(TASK_QUEUE_BACKEND="database")
+    def test_database_queue_retries_only_the_failed_copy_then_gives_up(self):
+        celery_app.conf["CELERY_TASK_ALWAYS_EAGER"] = False
+        self.addCleanup(celery_app.conf.__setitem__, "CELERY_TASK_ALWAYS_EAGER", True)
+        contact_msg = ContactMessage.objects.create(**self.payload)
+        deliver_contact_emails.delay(contact_msg.pk)
+
+        def send(backend, messages):
+            if messages[0].to == ["visitor@example.com"]:
+                raise OSError("mailbox unavailable")
+            mail.outbox.extend(messages)
+            return len(messages)
+
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.send_messages", send):
+            for _ in range(deliver_contact_emails.max_retries + 2):
+                QueuedTask.objects.filter(status=QueuedTask.Status.PENDING).update(available_at=timezone.now())
+                call_command("run_task_worker", "--once", stdout=StringIO())
+        contact_msg.refresh_from_db()
+        self.assertEqual(contact_msg.email_status, ContactMessage.EmailStatus.FAILED)
+        self.assertEqual(contact_msg.email_attempts, deliver_contact_emails.max_retries + 1)
+        self.assertIn("mailbox unavailable", contact_msg.email_error)
+        self.assertIsNotNone(contact_msg.admin_email_sent_at)
+        self.assertEqual([m.to for m in mail.outbox], [[settings.ADMIN_EMAIL]])
+        self.assertEqual(QueuedTask.objects.get().status, QueuedTask.Status.DONE)
+
+    def test_unexpected_task_error_marks_message_failed(self):
+        contact_msg = ContactMessage.objects.create(**self.payload)
+        with mock.patch.object(ContactMessage.objects, "get", side_effect=DatabaseError("connection lost")):
+            deliver_contact_emails.apply(args=[contact_msg.pk], throw=False)
+        contact_msg.refresh_from_db()
+        self.assertEqual(contact_msg.email_status, ContactMessage.EmailStatus.FAILED)
+
+
+class PublicPageCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_anonymous_pages_are_cached_until_content_changes(self):
+        self.assertEqual(self.client.get(reverse("projects"))["X-Page-Cache"], "miss")
+        self.assertEqual(self.client.get(reverse("projects"))["X-Page-Cache"], "hit")
+
+        Project.objects.create(title="Fresh project", summary="New")
+        response = self.client.get(reverse("projects"))
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "Fresh project")
+
+        # Unrelated content leaves the projects page cached.
+        Skill.objects.create(name="Rust")
+        self.assertEqual(self.client.get(reverse("projects"))["X-Page-Cache"], "hit")
+        self.assertEqual(page_cache_stats(), {"hits": 2, "misses": 2, "hit_ratio": 0.5})
+
+    def test_unrelated_query_parameters_share_the_cache_entry(self):
+        self.assertEqual(self.client.get(reverse("blog_list"))["X-Page-Cache"], "miss")
+        self.assertEqual(self.client.get(reverse("blog_list"), {"utm_source": "x", "_": "123"})["X-Page-Cache"], "hit")
+        self.assertEqual(self.client.get(reverse("blog_list"), {"cursor": "abc"})["X-Page-Cache"], "miss")
+
+    def test_cached_page_carries_the_visitors_own_csrf_token(self):
+        self.client.get(reverse("home"))
+        client = Client(enforce_csrf_checks=True)
+        response = client.get(reverse("home"))
+        self.assertEqual(response["X-Page-Cache"], "hit")
+        token = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', response.content.decode()).group(1)
+        self.assertNotEqual(token, "__CSRF_TOKEN__")
+        response = client.post(reverse("subscribe"), {"email": "csrf@example.com", "csrfmiddlewaretoken": token})
+        self.assertEqual(response.status_code, 302)
+
+    def test_signed_in_users_bypass_the_cache(self):
+        User.objects.create_user(username="reader", password="pass1234")
+        self.client.login(username="reader", password="pass1234")
+        self.client.get(reverse("about"))
+        self.assertFalse(self.client.get(reverse("about")).has_header("X-Page-Cache"))
+
+
+class SiteProfileContextTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        invalidate_site_profile()
+
+    def test_profile_is_lazy_cached_and_invalidated_on_save(self):
+        with self.assertNumQueries(0):
+            context = site_profile(None)
+        with self.assertNumQueries(1):
+            self.assertEqual(context["site_profile"].full_name, DEFAULT_PROFILE["full_name"])
+        with self.assertNumQueries(0):
+            self.assertEqual(site_profile(None)["site_profile"].full_name, DEFAULT_PROFILE["full_name"])
+
+        Profile.objects.create(full_name="New Name", title="Dev", intro="Hi", about="About", email="me@example.com")
+        with self.assertNumQueries(1):
+            self.assertEqual(site_profile(None)["site_profile"].full_name, "New Name")
+
+
+class QueryPlanCheckTest(TestCase):
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command("check_query_plans", stdout=out)
+        self.assertNotIn("✗", out.getvalue())
+
+    def test_sequential_scans_are_detected(self):
+        sqlite = SEQ_SCAN_PATTERNS["sqlite"]
+        self.assertEqual(sqlite.findall("3 0 0 SCAN blog_blogpost"), ["blog_blogpost"])
+        self.assertEqual(sqlite.findall("3 0 0 SCAN comments_comment USING INDEX comment_pending_recent"), [])
+        postgres = SEQ_SCAN_PATTERNS["postgresql"]
+        self.assertEqual(postgres.findall("Parallel Seq Scan on blog_blogpost  (cost=0.00..1.01)"), ["blog_blogpost"])
+
+    def test_other_index_or_sort_is_reported(self):
+        plan = (
+            "5 0 0 SEARCH blog_blogpost USING INDEX blog_post_status_recent (status=?)\n"
+            "49 0 0 USE TEMP B-TREE FOR RIGHT PART OF ORDER BY"
+        )
+        self.assertEqual(
+            plan_problems(plan, "sqlite", "blog_post_published_keyset"),
+            ["does not use blog_post_published_keyset", "sorts for ORDER BY"],
+        )
+        self.assertEqual(plan_problems(plan.splitlines()[0], "sqlite", "blog_post_status_recent"), [])
+        postgres = (
+            "Limit  (cost=8.17..8.18 rows=1 width=4)\n"
+            "  ->  Sort  (cost=8.17..8.18 rows=1 width=4)\n"
+            "        ->  Index Scan using comments_comment_post_id_96a9ac05 on comments_comment"
+        )
+        self.assertEqual(
+            plan_problems(postgres, "postgresql", "comment_post_approved_recent"),
+            ["does not use comment_post_approved_recent", "sorts for ORDER BY"],
+        )
+
+
+class DashboardQueryBudgetTest(TestCase):
+    def setUp(self):
+        from apps.blog.models import BlogPost
+        from apps.comments.models import Comment
+        from apps.subscriptions.models import NotificationJob, Subscriber
+
+        cache.clear()
+        self.staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        for i in range(3):
+            post = BlogPost.objects.create(
+                title=f"Post {i}", author=self.staff, content="Body", status="published" if i else "draft"
+            )
+            Comment.objects.create(post=post, author=self.staff, body="Pending")
+            NotificationJob.objects.create(post=post)
+            Subscriber.objects.create(email=f"s{i}@example.com", is_active=bool(i))
+            Project.objects.create(title=f"Project {i}", summary="s")
+            Skill.objects.create(name=f"Skill {i}", level=50)
+            ContactMessage.objects.create(name="V", email="v@example.com", subject="Hi", message="m")
+        cache.clear()
+
+    def test_kpis_are_conditional_aggregates_and_cached(self):
+        with self.assertNumQueries(DASHBOARD_QUERY_BUDGET["kpis"]):
+            kpis = dashboard_kpis()
+        self.assertEqual(
+            kpis,
+            {
+                "post_count": 3, "published_count": 2, "draft_count": 1, "subscriber_count": 2,
+                "pending_comments": 3, "project_count": 3, "unread_messages": 3,
+            },
+        )
+        with self.assertNumQueries(0):
+            dashboard_kpis()
+
+    def test_kpis_are_busted_by_saves(self):
+        dashboard_kpis()
+        Project.objects.create(title="Another", summary="s")
+        self.assertEqual(dashboard_kpis()["project_count"], 4)
+
+    def test_each_panel_stays_within_its_budget(self):
+        for panel, rows in DASHBOARD_PANELS.items():
+            with self.subTest(panel=panel), self.assertNumQueries(DASHBOARD_QUERY_BUDGET[panel]):
+                self.assertTrue(rows())
+
+    def test_whole_dashboard_render_stays_within_budget(self):
+        self.client.force_login(self.staff)
+        site_profile(None)["site_profile"].full_name  # warm the (separately cached) site profile
+        # session + user, then every panel; rendering the template must not add lazy loads
+        with self.assertNumQueries(2 + sum(DASHBOARD_QUERY_BUDGET.values())):
+            response = self.client.get(reverse("dashboard"))
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(2 + sum(DASHBOARD_QUERY_BUDGET.values()) - DASHBOARD_QUERY_BUDGET["kpis"]):
+            self.client.get(reverse("dashboard"))
+
+
+class MessagesInboxTest(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        self.client.force_login(self.staff)
+        ContactMessage.objects.bulk_create([
+            ContactMessage(name=f"Sender {i}", email=f"s{i}@example.com", subject="Spam" if i % 2 else "Hire", message="m")
+            for i in range(INBOX_PAGE_SIZE + 5)
+        ])
+
+    def test_pages_cover_every_message_and_mark_only_displayed_rows_read(self):
+        response = self.client.get(reverse("messages_inbox"))
+        first_page = response.context["contact_messages"]
+        self.assertEqual(len(first_page), INBOX_PAGE_SIZE)
+        self.assertTrue(all(not msg.is_read for msg in first_page))  # still badged "New" on this render
+        self.assertEqual(ContactMessage.objects.filter(is_read=False).count(), 5)
+
+        response = self.client.get(reverse("messages_inbox") + "?" + response.context["next_page_query"])
+        self.assertEqual(len(response.context["contact_messages"]), 5)
+        self.assertEqual(response.context["next_page_query"], "")
+        self.assertFalse(ContactMessage.objects.filter(is_read=False).exists())
+
+    def test_unread_and_search_filters(self):
+        ContactMessage.objects.filter(subject="Hire").update(is_read=True)
+        response = self.client.get(reverse("messages_inbox"), {"unread": "1", "q": "spam"})
+        page = response.context["contact_messages"]
+        self.assertTrue(page)
+        self.assertEqual(len(page), 15)
+        self.assertTrue(all(msg.subject == "Spam" for msg in page))
+
+
+@override_settings(RATE_LIMITS={"test": {"ip": "4/m", "global": "6/m"}, "contact": {"ip": "2/h", "global": ""}})
+class RateLimitTest(TestCase):
+    def setUp(self):
+        ratelimit.reset()
+        self.addCleanup(ratelimit.reset)
+
+    def test_previous_window_is_weighted_by_its_overlap(self):
+        self.assertEqual([ratelimit.check("test", "1.1.1.1", now=60.0) for _ in range(5)], [None] * 4 + [60])
+        # Halfway into the next minute half of the previous window's five attempts still count.
+        self.assertIsNone(ratelimit.check("test", "1.1.1.1", now=150.0))
+        self.assertEqual(ratelimit.check("test", "1.1.1.1", now=150.0), 30)
+        self.assertIsNone(ratelimit.check("test", "1.1.1.1", now=190.0))
+
+    def test_global_budget_spans_clients(self):
+        results = [ratelimit.check("test", f"10.0.0.{i}", now=60.0) for i in range(7)]
+        self.assertEqual(results, [None] * 6 + [60])
+
+    def test_concurrent_hits_never_exceed_the_budget(self):
+        allowed = []
+
+        def hit():
+            for _ in range(50):
+                if ratelimit.check("test", "*", now=60.0) is None:
+                    allowed.append(1)
+
+        with self.settings(RATE_LIMITS={"test": {"ip": "100/m"}}):
+            threads = [threading.Thread(target=hit) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(allowed), 100)
+
+    def test_contact_form_gets_429_page_with_retry_after(self):
+        self.client.get(reverse("contact"))
+        payload = {"name": "Visitor", "email": "visitor@example.com", "subject": "Hi", "message": "Hello"}
+        for _ in range(2):
+            self.assertEqual(self.client.post(reverse("contact"), payload).status_code, 302)
+        response = self.client.post(reverse("contact"), payload)
+        self.assertEqual(response.status_code, 429)
+        self.assertTemplateUsed(response, "429.html")
+        self.assertTrue(int(response["Retry-After"]) > 0)
+        self.assertEqual(ContactMessage.objects.count(), 2)
+        self.assertEqual(self.client.get(reverse("contact")).status_code, 200)
+
+    @override_settings(RATE_LIMIT_PROXY_COUNT=1)
+    def test_client_ip_comes_from_the_trusted_proxy_entry(self):
+        request = RequestFactory().post("/", HTTP_X_FORWARDED_FOR="6.6.6.6, 203.0.113.9", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(ratelimit.client_ip(request), "203.0.113.9")
+        self.assertEqual(ratelimit.client_ip(RequestFactory().post("/", REMOTE_ADDR="10.0.0.1")), "10.0.0.1")
@@ -1,18 +1,23 @@
 import logging
+from urllib.parse import urlencode
+
 from django.contrib import messages
 from django.conf import settings
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.core.mail import EmailMultiAlternatives
+from django.db import transaction
+from django.db.models import Q
 from django.shortcuts import get_object_or_404, redirect, render
-from django.template.loader import render_to_string
-from django.utils import timezone
 
 from apps.blog.models import BlogPost
+from apps.blog.pagination import keyset_page
 from apps.comments.models import Comment
-from apps.subscriptions.models import Subscriber
+from apps.subscriptions.models import NotificationJob
 
+from .cache import cache_public_page
 from .forms import ContactForm, EducationForm, ProfileForm, ProjectForm, SkillForm
+from .kpis import dashboard_kpis, invalidate_dashboard_kpis
 from .models import ContactMessage, Education, Profile, Project, Skill
+from .ratelimit import rate_limit
 from .resume_defaults import (
     DEFAULT_ACHIEVEMENTS,
     DEFAULT_EDUCATION,
@@ -20,6 +25,8 @@ from .resume_defaults import (
     DEFAULT_PROJECTS,
     DEFAULT_SKILLS,
 )
+from .services import build_html_email
+from .tasks import deliver_contact_emails
 
 logger = logging.getLogger(__name__)
 
@@ -28,17 +35,19 @@ _staff = lambda u: u.is_staff  # noqa: E731
 
 # ─── Public pages ────────────────────────────────────────────────────────────
 
+@cache_public_page("posts", "projects")
 def home_view(request):
     featured_projects = list(Project.objects.filter(featured=True)[:1])
     if not featured_projects:
         featured_projects = DEFAULT_PROJECTS[:1]
     context = {
         "featured_projects": featured_projects,
-        "latest_posts": BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED)[:1],
+        "latest_posts": BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED).defer("content")[:1],
     }
     return render(request, "portfolio/home.html", context)
 
 
+@cache_public_page("education", "skills", "projects")
 def about_view(request):
     education_items = list(Education.objects.all())
     if not education_items:
@@ -61,6 +70,7 @@ def about_view(request):
     })
 
 
+@cache_public_page("projects")
 def projects_view(request):
     projects = list(Project.objects.all())
     if not projects:
@@ -70,64 +80,35 @@ def projects_view(request):
 
 def _send_html_email(subject, template_html, template_txt, context, recipient):
     """Helper: send a dual-format (HTML + plain text) email."""
-    html_body = render_to_string(template_html, context)
-    text_body = render_to_string(template_txt, context)
-    msg = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[recipient],
-    )
-    msg.attach_alternative(html_body, "text/html")
-    msg.send(fail_silently=False)
+    build_html_email(subject, template_html, template_txt, context, recipient).send(fail_silently=False)
+
+
+def _queue_contact_emails(message_id):
+    try:
+        deliver_contact_emails.delay(message_id)
+    except Exception:
+        # The message is saved either way; the dashboard shows its delivery status.
+        logger.exception("Could not queue contact emails for message=%s", message_id)
 
 
+@rate_limit("contact")
 def contact_view(request):
     if request.method == "POST":
         form = ContactForm(request.POST)
         if form.is_valid():
             data = form.cleaned_data
-            # ── Save to database ──────────────────────────────
-            ContactMessage.objects.create(
+            # ── Save to database, email in the background ─────
+            contact_msg = ContactMessage.objects.create(
                 name=data["name"],
                 email=data["email"],
                 subject=data["subject"],
                 message=data["message"],
             )
-            # ── Send emails ───────────────────────────────────
-            ctx = {
-                "name":        data["name"],
-                "email":       data["email"],
-                "subject":     data["subject"],
-                "message":     data["message"],
-                "received_at": timezone.now().strftime("%B %d, %Y at %H:%M UTC"),
-                "site_url":    settings.SITE_BASE_URL,
-            }
-            try:
-                _send_html_email(
-                    subject=f"📬 New Contact: {data['subject']}",
-                    template_html="emails/contact_admin.html",
-                    template_txt="emails/contact_admin.txt",
-                    context=ctx,
-                    recipient=settings.ADMIN_EMAIL,
-                )
-                _send_html_email(
-                    subject="✅ We received your message",
-                    template_html="emails/contact_user.html",
-                    template_txt="emails/contact_user.txt",
-                    context=ctx,
-                    recipient=data["email"],
-                )
-                messages.success(
-                    request,
-                    "Your message was sent! Check your inbox for a confirmation copy.",
-                )
-            except Exception:
-                logger.exception("Contact email failed")
-                messages.warning(
-                    request,
-                    "Message saved, but email delivery failed. I'll still see it in the dashboard.",
-                )
+            transaction.on_commit(lambda: _queue_contact_emails(contact_msg.pk))
+            messages.success(
+                request,
+                "Your message was sent! A confirmation copy is on its way to your inbox.",
+            )
             return redirect("contact")
     else:
         form = ContactForm()
@@ -136,33 +117,75 @@ def contact_view(request):
 
 # ─── Dashboard ───────────────────────────────────────────────────────────────
 
+# Each list panel on the dashboard: a function returning its rows, and the queries it may cost
+# (enforced in tests, including the queries the template triggers while rendering it).
+DASHBOARD_PANELS = {
+    "recent_posts": lambda: list(
+        BlogPost.objects.only(
+            "title", "slug", "status", "created_at", "approved_comment_count", "pending_comment_count"
+        ).order_by("-created_at")[:8]
+    ),
+    "pending_comment_list": lambda: list(
+        Comment.objects.filter(is_approved=False)
+        .select_related("author", "post")
+        .only("body", "created_at", "author__username", "post__title", "post__slug")[:10]
+    ),
+    "projects": lambda: list(Project.objects.only("title", "tech_stack", "featured").order_by("order", "-id")[:20]),
+    "skills": lambda: list(Skill.objects.only("name", "category", "level").order_by("order")[:20]),
+    "recent_messages": lambda: list(
+        ContactMessage.objects.only("name", "subject", "is_read", "created_at")[:5]
+    ),
+    "notification_jobs": lambda: list(
+        NotificationJob.objects.select_related("post")
+        .only("status", "total", "sent", "failed", "skipped", "created_at", "post__title")[:3]
+    ),
+}
+DASHBOARD_QUERY_BUDGET = {"kpis": 5, **{panel: 1 for panel in DASHBOARD_PANELS}}
+
+
 @login_required
 @user_passes_test(_staff)
 def dashboard_view(request):
-    context = {
-        "post_count":        BlogPost.objects.count(),
-        "published_count":   BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED).count(),
-        "draft_count":       BlogPost.objects.filter(status=BlogPost.Status.DRAFT).count(),
-        "subscriber_count":  Subscriber.objects.filter(is_active=True).count(),
-        "pending_comments":  Comment.objects.filter(is_approved=False).count(),
-        "project_count":     Project.objects.count(),
-        "unread_messages":   ContactMessage.objects.filter(is_read=False).count(),
-        "recent_posts":      BlogPost.objects.order_by("-created_at")[:8],
-        "pending_comment_list": Comment.objects.filter(is_approved=False).select_related("author", "post")[:10],
-        "projects":          Project.objects.order_by("order", "-id")[:20],
-        "skills":            Skill.objects.order_by("order")[:20],
-        "recent_messages":   ContactMessage.objects.all()[:5],
-    }
+    context = dict(dashboard_kpis())
+    context.update((panel, rows()) for panel, rows in DASHBOARD_PANELS.items())
     return render(request, "dashboard/index.html", context)
 
 
+INBOX_PAGE_SIZE = 25
+
+
 @login_required
 @user_passes_test(_staff)
 def messages_inbox_view(request):
     msgs = ContactMessage.objects.all()
-    # mark all as read when inbox is opened
-    ContactMessage.objects.filter(is_read=False).update(is_read=True)
-    return render(request, "dashboard/messages.html", {"contact_messages": msgs})
+    unread_only = request.GET.get("unread") == "1"
+    query = request.GET.get("q", "").strip()
+    if unread_only:
+        msgs = msgs.filter(is_read=False)
+    if query:
+        msgs = msgs.filter(
+            Q(name__icontains=query) | Q(email__icontains=query)
+            | Q(subject__icontains=query) | Q(message__icontains=query)
+        )
+    try:
+        page, next_cursor = keyset_page(msgs, request.GET.get("cursor") or None, INBOX_PAGE_SIZE, "created_at")
+    except ValueError:
+        page, next_cursor = keyset_page(msgs, None, INBOX_PAGE_SIZE, "created_at")
+
+    # Only the messages on screen have been read; the rows keep is_read=False in memory for the "New" badge
+    unread_ids = [msg.pk for msg in page if not msg.is_read]
+    if unread_ids:
+        ContactMessage.objects.filter(pk__in=unread_ids).update(is_read=True)
+        invalidate_dashboard_kpis()
+
+    filters = {key: value for key, value in (("q", query), ("unread", "1" if unread_only else "")) if value}
+    return render(request, "dashboard/messages.html", {
+        "contact_messages": page,
+        "query": query,
+        "unread_only": unread_only,
+        "next_page_query": urlencode({**filters, "cursor": next_cursor}) if next_cursor else "",
+        "is_first_page": not request.GET.get("cursor"),
+    })
 
 
 @login_required
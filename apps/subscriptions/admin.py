@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import PostNotificationLog, Subscriber
+from .models import NotificationJob, PostNotificationLog, Subscriber, SubscriberImportJob
 
 
 @admin.register(Subscriber)
@@ -14,3 +14,15 @@ class SubscriberAdmin(admin.ModelAdmin):
 class PostNotificationLogAdmin(admin.ModelAdmin):
     list_display = ("post", "subscriber", "status", "sent_at")
     list_filter = ("status",)
+
+
+@admin.register(NotificationJob)
+class NotificationJobAdmin(admin.ModelAdmin):
+    list_display = ("post", "status", "total", "sent", "failed", "skipped", "created_at", "finished_at")
+    list_filter = ("status",)
+
+
+@admin.register(SubscriberImportJob)
+class SubscriberImportJobAdmin(admin.ModelAdmin):
+    list_display = ("filename", "status", "rows", "inserted", "duplicates", "invalid", "created_at", "finished_at")
+    list_filter = ("status",)
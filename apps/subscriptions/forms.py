@@ -3,3 +3,8 @@ from django import forms
 
 class SubscribeForm(forms.Form):
     email = forms.EmailField(widget=forms.EmailInput(attrs={"placeholder": "you@example.com"}))
+
+
+class SubscriberImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV with an email column, a JSON array, or JSON Lines.")
+    activate = forms.BooleanField(required=False, initial=True, label="Import as active")
@@ -0,0 +1,170 @@
+"""
+Bulk subscriber import from CSV or JSON.
+
+Rows are streamed from the file, normalised and validated one at a time, and
+written with ``bulk_create(ignore_conflicts=True)`` in fixed-size batches, so
+memory stays flat however long the file is. Repeats inside the file are
+caught with a set of 16-byte email digests; emails that already exist are
+looked up once per batch, ignoring case (``subscriber_email_lower`` index).
+Neither path fires ``post_save``, so no welcome emails go out. The dashboard
+runs imports in the background (``tasks.import_subscribers_job``).
+"""
+import csv
+import hashlib
+import io
+import json
+import secrets
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from apps.portfolio.kpis import invalidate_dashboard_kpis
+
+from .models import Subscriber
+
+IMPORT_BATCH_SIZE = 1000
+READ_CHUNK_SIZE = 64 * 1024
+# A single JSON value larger than this means the file is malformed, not that we should keep buffering.
+MAX_JSON_ITEM = 1024 * 1024
+EMAIL_COLUMNS = ("email", "email_address", "e-mail", "mail")
+JSON_EXTENSIONS = (".json", ".jsonl", ".ndjson")
+_JSON_SEPARATORS = frozenset(" \t\r\n,[]")
+
+
+def detect_format(filename: str) -> str:
+    return "json" if filename.lower().endswith(JSON_EXTENSIONS) else "csv"
+
+
+def normalize_email(value) -> str | None:
+    """The lower-cased email, or ``None`` if ``value`` is not a valid address."""
+    if not isinstance(value, str):
+        return None
+    email = value.strip().lower()
+    if not email or len(email) > 254:
+        return None
+    try:
+        validate_email(email)
+    except ValidationError:
+        return None
+    return email
+
+
+def _csv_values(text):
+    """The email column of each CSV row; a header row picks the column, otherwise the first one is used."""
+    reader = csv.reader(text)
+    first = next(reader, None)
+    if first is None:
+        return
+    header = [cell.strip().lower() for cell in first]
+    column = next((header.index(name) for name in EMAIL_COLUMNS if name in header), None)
+    if column is None:
+        column = 0
+        yield first[0] if first else None
+    for row in reader:
+        yield row[column] if len(row) > column else None
+
+
+def _json_values(text, chunk_size=READ_CHUNK_SIZE):
+    """
+    Each element of a top-level JSON array, or each value of a JSON Lines
+    file, decoded incrementally. Elements are email strings or objects with
+    an ``email`` key.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    while True:
+        while pos < len(buffer) and buffer[pos] in _JSON_SEPARATORS:
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            buffer, pos = text.read(chunk_size), 0
+            eof = not buffer
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            end = None
+        # A value that runs to the end of the buffer may continue in the next chunk (e.g. a number).
+        if end is None or (end == len(buffer) and not eof):
+            if eof or len(buffer) - pos > MAX_JSON_ITEM:
+                raise ValueError(f"Malformed JSON near {buffer[pos:pos + 40]!r}")
+            chunk = text.read(chunk_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield item.get("email") if isinstance(item, dict) else item
+        pos = end
+
+
+def import_subscribers(stream, fmt: str = "csv", *, activate: bool = True, batch_size: int = IMPORT_BATCH_SIZE,
+                       on_progress=None) -> dict:
+    """
+    Import every email in the binary ``stream``; returns
+    ``{"rows", "inserted", "duplicates", "invalid"}``. Duplicates cover both
+    repeats within the file and addresses that are already subscribed.
+    ``on_progress`` is called with the running totals after each batch.
+
+    Raises ``ValueError`` for an unknown format or malformed JSON; batches
+    written before the error are kept.
+    """
+    if fmt not in ("csv", "json"):
+        raise ValueError(f"Unknown import format: {fmt!r}")
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    values = _csv_values(text) if fmt == "csv" else _json_values(text)
+    report = {"rows": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+    seen = set()
+    batch = []
+    now = timezone.now()
+
+    def flush():
+        # Batch emails are already lower-case; stored ones may not be.
+        existing = set(
+            Subscriber.objects.annotate(email_lower=Lower("email"))
+            .filter(email_lower__in=batch)
+            .values_list("email_lower", flat=True)
+        )
+        new = [
+            Subscriber(
+                email=email,
+                is_active=activate,
+                verified_at=now if activate else None,
+                verify_token=secrets.token_urlsafe(32),
+            )
+            for email in batch
+            if email not in existing
+        ]
+        # ignore_conflicts covers rows another request inserted since the lookup; those
+        # are skipped silently, so count what landed by the tokens of this batch.
+        Subscriber.objects.bulk_create(new, ignore_conflicts=True)
+        inserted = Subscriber.objects.filter(verify_token__in=[sub.verify_token for sub in new]).count() if new else 0
+        report["inserted"] += inserted
+        report["duplicates"] += len(batch) - inserted
+        batch.clear()
+        if on_progress:
+            on_progress(dict(report))
+
+    try:
+        for value in values:
+            report["rows"] += 1
+            email = normalize_email(value)
+            if email is None:
+                report["invalid"] += 1
+                continue
+            digest = hashlib.blake2b(email.encode(), digest_size=16).digest()
+            if digest in seen:
+                report["duplicates"] += 1
+                continue
+            seen.add(digest)
+            batch.append(email)
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+    finally:
+        text.detach()  # leave the caller's stream open
+        if report["inserted"]:
+            invalidate_dashboard_kpis()
+    return report
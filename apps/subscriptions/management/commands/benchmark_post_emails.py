@@ -0,0 +1,67 @@
+import secrets
+import time
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from apps.blog.models import BlogPost
+from apps.subscriptions.models import Subscriber
+from apps.subscriptions.services import PostEmailPayload
+
+
+def _render_per_recipient(post, subscriber):
+    """The original path: full template renders for every recipient."""
+    path = reverse("unsubscribe", kwargs={"token": subscriber.verify_token})
+    ctx = {
+        "post":            post,
+        "post_url":        f"{settings.SITE_BASE_URL}{post.get_absolute_url()}",
+        "unsubscribe_url": f"{settings.SITE_BASE_URL}{path}",
+        "site_url":        settings.SITE_BASE_URL,
+    }
+    msg = EmailMultiAlternatives(
+        subject=f"📝 New Post: {post.title}",
+        body=render_to_string("emails/new_post.txt", ctx),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[subscriber.email],
+    )
+    msg.attach_alternative(render_to_string("emails/new_post.html", ctx), "text/html")
+    return msg
+
+
+class Command(BaseCommand):
+    help = "Compare per-recipient template rendering with the render-once notification payload."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        count = options["recipients"]
+        post = BlogPost.objects.filter(status=BlogPost.Status.PUBLISHED).first() or BlogPost(
+            title="Benchmark post",
+            slug="benchmark-post",
+            excerpt="A short excerpt for the benchmark.",
+            content="Lorem ipsum dolor sit amet. " * 200,
+        )
+        subscribers = [
+            Subscriber(email=f"reader{i}@example.com", verify_token=secrets.token_urlsafe(32))
+            for i in range(count)
+        ]
+
+        started = time.perf_counter()
+        for sub in subscribers:
+            _render_per_recipient(post, sub)
+        per_recipient = time.perf_counter() - started
+
+        started = time.perf_counter()
+        payload = PostEmailPayload(post)
+        for sub in subscribers:
+            payload.for_subscriber(sub.email, sub)
+        render_once = time.perf_counter() - started
+
+        self.stdout.write(f"Recipients:          {count}")
+        self.stdout.write(f"Render per recipient: {per_recipient:.3f}s")
+        self.stdout.write(f"Render once + splice: {render_once:.3f}s")
+        self.stdout.write(self.style.SUCCESS(f"Speedup:             {per_recipient / render_once:.1f}x"))
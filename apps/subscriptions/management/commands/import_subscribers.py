@@ -0,0 +1,35 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.subscriptions.imports import IMPORT_BATCH_SIZE, detect_format, import_subscribers
+
+
+class Command(BaseCommand):
+    help = "Import subscribers from a CSV or JSON/JSON Lines file (use - for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "json"], help="Defaults to the file extension.")
+        parser.add_argument("--inactive", action="store_true", help="Import as inactive instead of active.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        fmt = options["format"] or detect_format(path)
+        try:
+            if path == "-":
+                report = self._import(sys.stdin.buffer, fmt, options)
+            else:
+                with open(path, "rb") as stream:
+                    report = self._import(stream, fmt, options)
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(f"Rows read:  {report['rows']}")
+        self.stdout.write(f"Duplicates: {report['duplicates']}")
+        self.stdout.write(f"Invalid:    {report['invalid']}")
+        self.stdout.write(self.style.SUCCESS(f"Inserted:   {report['inserted']}"))
+
+    def _import(self, stream, fmt, options):
+        return import_subscribers(stream, fmt, activate=not options["inactive"], batch_size=options["batch_size"])
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0002_notificationjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscriber',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['id'], name='subscriber_active_id'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0004_subscriber_recent_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postnotificationlog',
+            name='claim',
+            field=models.CharField(blank=True, max_length=32),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 16:09
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0005_notification_log_claim'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubscriberImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='subscriber-imports/')),
+                ('filename', models.CharField(max_length=255)),
+                ('format', models.CharField(default='csv', max_length=10)),
+                ('activate', models.BooleanField(default=True)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('inserted', models.PositiveIntegerField(default=0)),
+                ('duplicates', models.PositiveIntegerField(default=0)),
+                ('invalid', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='subscriber',
+            index=models.Index(django.db.models.functions.text.Lower('email'), name='subscriber_email_lower'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+INDEX_NAME = "subscriber_email_lower_like"
+
+
+def create_index(apps, schema_editor):
+    # Serves ``LOWER(email) LIKE 'prefix%'`` (see ``services.email_prefix_filter``); SQLite uses a range instead.
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX {INDEX_NAME} ON subscriptions_subscriber (LOWER(email) varchar_pattern_ops)"
+        )
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("subscriptions", "0006_subscriber_import_job"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
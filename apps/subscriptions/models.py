@@ -1,6 +1,7 @@
 import secrets
 
 from django.db import models
+from django.db.models.functions import Lower
 
 
 class Subscriber(models.Model):
@@ -10,6 +11,16 @@ class Subscriber(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     verified_at = models.DateTimeField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Notification shards scan active subscribers by primary-key range
+            models.Index(fields=["id"], condition=models.Q(is_active=True), name="subscriber_active_id"),
+            # Dashboard list: keyset pages over (created_at, id), newest first
+            models.Index(fields=["-created_at", "-id"], name="subscriber_recent"),
+            # Bulk import: existing-address lookups ignore case
+            models.Index(Lower("email"), name="subscriber_email_lower"),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.verify_token:
             self.verify_token = secrets.token_urlsafe(32)
@@ -25,9 +36,98 @@ class PostNotificationLog(models.Model):
     sent_at = models.DateTimeField(auto_now_add=True)
     status = models.CharField(max_length=20, default="sent")
     error = models.TextField(blank=True)
+    # Random token of the delivery run that inserted this row (see services._send_chunk),
+    # and when it did; a pending row older than NOTIFY_CLAIM_TIMEOUT may be taken over.
+    claim = models.CharField(max_length=32, blank=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
 
     class Meta:
         unique_together = ("post", "subscriber")
 
     def __str__(self):
         return f"{self.post_id} -> {self.subscriber.email}"
+
+
+class NotificationJob(models.Model):
+    """Tracks one fan-out of a post to subscribers so the dashboard can poll its progress."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    post = models.ForeignKey("blog.BlogPost", on_delete=models.CASCADE, related_name="notification_jobs")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    total = models.PositiveIntegerField(default=0)
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    @property
+    def processed(self):
+        return self.sent + self.failed + self.skipped
+
+    def as_dict(self):
+        return {
+            "id": self.pk,
+            "post": self.post_id,
+            "status": self.status,
+            "total": self.total,
+            "sent": self.sent,
+            "failed": self.failed,
+            "skipped": self.skipped,
+            "processed": self.processed,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __str__(self):
+        return f"Notify post {self.post_id} ({self.status})"
+
+
+class SubscriberImportJob(models.Model):
+    """An uploaded subscriber file imported in the background; the subscriber page polls its progress."""
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    # Deleted once imported. Workers on other hosts need shared media storage to read it.
+    file = models.FileField(upload_to="subscriber-imports/")
+    filename = models.CharField(max_length=255)
+    format = models.CharField(max_length=10, default="csv")
+    activate = models.BooleanField(default=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    rows = models.PositiveIntegerField(default=0)
+    inserted = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    invalid = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+    def as_dict(self):
+        return {
+            "id": self.pk,
+            "filename": self.filename,
+            "status": self.status,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "invalid": self.invalid,
+            "error": self.error,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+    def __str__(self):
+        return f"Import {self.filename} ({self.status})"
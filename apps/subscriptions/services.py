@@ -1,39 +1,202 @@
 import logging
+import time
+import uuid
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import connection
+from django.db.models import Max, Min, Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import GreaterThanOrEqual, LessThan, StartsWith
 from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+from .models import PostNotificationLog, Subscriber
 
 logger = logging.getLogger(__name__)
 
+NOTIFY_CHUNK_SIZE = 200
+NOTIFY_SHARD_SIZE = 5000
+# A run holds its pending rows while it sends a chunk; after this they count as abandoned.
+NOTIFY_CLAIM_TIMEOUT = timedelta(minutes=30)
+
+
+def email_prefix_filter(prefix: str) -> Q:
+    """
+    Subscribers whose email, ignoring case, starts with ``prefix``.
+
+    Emails are stored as typed, so the match is on ``LOWER(email)``. PostgreSQL
+    answers the ``LIKE 'prefix%'`` from the ``varchar_pattern_ops`` index on that
+    expression (migration 0007). SQLite will not use an index for ``LIKE ...
+    ESCAPE``, so there the same prefix is also given as a range, which seeks the
+    ``subscriber_email_lower`` index (exact under its binary collation).
+    """
+    prefix = prefix.strip().lower()
+    email = Lower("email")
+    q = Q(StartsWith(email, prefix))
+    if connection.vendor == "sqlite":
+        q &= Q(GreaterThanOrEqual(email, prefix), LessThan(email, prefix + "\U0010ffff"))
+    return q
+
+
+class PostEmailPayload:
+    """
+    A post's notification email rendered once, with a placeholder where the
+    per-subscriber unsubscribe link goes. ``for_subscriber`` only splices.
+    """
+
+    PLACEHOLDER = "__UNSUBSCRIBE_URL__"
+    TOKEN_PLACEHOLDER = "__TOKEN__"
+
+    def __init__(self, post):
+        ctx = {
+            "post":            post,
+            "post_url":        f"{settings.SITE_BASE_URL}{post.get_absolute_url()}",
+            "unsubscribe_url": self.PLACEHOLDER,
+            "site_url":        settings.SITE_BASE_URL,
+        }
+        self.subject   = f"📝 New Post: {post.title}"
+        self.html_body = render_to_string("emails/new_post.html", ctx)
+        self.text_body = render_to_string("emails/new_post.txt",  ctx)
+        path = reverse("unsubscribe", kwargs={"token": self.TOKEN_PLACEHOLDER})
+        self._unsubscribe_url = f"{settings.SITE_BASE_URL}{path}"
+
+    def unsubscribe_url(self, subscriber=None) -> str:
+        if subscriber and subscriber.verify_token:
+            return self._unsubscribe_url.replace(self.TOKEN_PLACEHOLDER, subscriber.verify_token)
+        return ""
+
+    def for_subscriber(self, subscriber_email: str, subscriber=None) -> EmailMultiAlternatives:
+        # Templates autoescape ``unsubscribe_url``, so escape the spliced value the same way.
+        url = escape(self.unsubscribe_url(subscriber))
+        msg = EmailMultiAlternatives(
+            subject=self.subject,
+            body=self.text_body.replace(self.PLACEHOLDER, url),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[subscriber_email],
+        )
+        msg.attach_alternative(self.html_body.replace(self.PLACEHOLDER, url), "text/html")
+        return msg
+
+
+def build_post_email(*, subscriber_email: str, post, subscriber=None) -> EmailMultiAlternatives:
+    return PostEmailPayload(post).for_subscriber(subscriber_email, subscriber)
+
 
 def send_post_email(*, subscriber_email: str, post, subscriber=None):
-    post_url = f"{settings.SITE_BASE_URL}{post.get_absolute_url()}"
-
-    unsubscribe_url = ""
-    if subscriber and subscriber.verify_token:
-        path = reverse("unsubscribe", kwargs={"token": subscriber.verify_token})
-        unsubscribe_url = f"{settings.SITE_BASE_URL}{path}"
-
-    ctx = {
-        "post":            post,
-        "post_url":        post_url,
-        "unsubscribe_url": unsubscribe_url,
-        "site_url":        settings.SITE_BASE_URL,
-    }
-
-    subject   = f"📝 New Post: {post.title}"
-    html_body = render_to_string("emails/new_post.html", ctx)
-    text_body = render_to_string("emails/new_post.txt",  ctx)
-
-    msg = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        to=[subscriber_email],
-    )
-    msg.attach_alternative(html_body, "text/html")
+    msg = build_post_email(subscriber_email=subscriber_email, post=post, subscriber=subscriber)
     msg.send(fail_silently=False)
 
     logger.info("New post email sent to %s for post=%s", subscriber_email, post.id)
+
+
+def _send_chunk(post, subscribers, payload) -> dict:
+    """Send one chunk of emails over a single SMTP session and log the results in bulk."""
+    mail_connection = get_connection(fail_silently=False)
+    # Connect before claiming anyone, so a connection error leaves nothing behind for the retry to skip.
+    mail_connection.open()
+
+    sent_ids = []
+    failures = {}
+    claim = uuid.uuid4().hex
+    now = timezone.now()
+    claimed = PostNotificationLog.objects.filter(post=post, claim=claim, status="pending")
+    try:
+        # Rows left pending by a run that was killed before its ``finally`` are taken over once stale.
+        PostNotificationLog.objects.filter(
+            Q(claimed_at__lt=now - NOTIFY_CLAIM_TIMEOUT) | Q(claimed_at__isnull=True),
+            post=post,
+            subscriber__in=[sub.pk for sub in subscribers],
+            status="pending",
+        ).update(claim=claim, claimed_at=now)
+        # The (post, subscriber) unique constraint lets only one run insert each row;
+        # subscribers whose row another run holds are left to that run.
+        PostNotificationLog.objects.bulk_create(
+            [
+                PostNotificationLog(post=post, subscriber=sub, status="pending", claim=claim, claimed_at=now)
+                for sub in subscribers
+            ],
+            ignore_conflicts=True,
+        )
+        mine = set(claimed.values_list("subscriber_id", flat=True))
+        for sub in subscribers:
+            if sub.pk not in mine:
+                continue
+            try:
+                msg = payload.for_subscriber(sub.email, sub)
+                mail_connection.send_messages([msg])
+                sent_ids.append(sub.pk)
+            except Exception as exc:
+                logger.exception("Post email failed for %s (post=%s)", sub.email, post.id)
+                failures[sub.pk] = str(exc)
+    finally:
+        mail_connection.close()
+        claimed.filter(subscriber_id__in=sent_ids).update(status="sent", sent_at=timezone.now())
+        for subscriber_id, error in failures.items():
+            claimed.filter(subscriber_id=subscriber_id).update(status="failed", error=error)
+        # Whoever is still pending was never attempted (the run was interrupted): release them for the retry.
+        claimed.delete()
+    return {"sent": len(sent_ids), "failed": len(failures), "skipped": len(subscribers) - len(mine)}
+
+
+def subscriber_shards(shard_size: int = NOTIFY_SHARD_SIZE) -> list:
+    """Split active subscribers into half-open ``(start_id, end_id)`` primary-key ranges."""
+    bounds = Subscriber.objects.filter(is_active=True).aggregate(lo=Min("pk"), hi=Max("pk"))
+    if bounds["lo"] is None:
+        return []
+    return [
+        (start, min(start + shard_size, bounds["hi"] + 1))
+        for start in range(bounds["lo"], bounds["hi"] + 1, shard_size)
+    ]
+
+
+def deliver_post_notifications(post, *, subscribers=None, chunk_size: int = NOTIFY_CHUNK_SIZE,
+                               on_progress=None) -> dict:
+    """
+    Email ``post`` to every active subscriber that has not been notified yet.
+
+    Already-notified subscriber IDs are loaded in one query, subscribers are
+    streamed in chunks, and each chunk shares one mail connection. Returns
+    ``sent`` / ``failed`` / ``skipped`` counts plus throughput numbers.
+    ``on_progress`` is called with each chunk's counts as it completes.
+    """
+    if subscribers is None:
+        subscribers = Subscriber.objects.filter(is_active=True)
+    subscribers = subscribers.only("id", "email", "verify_token").order_by("pk")
+
+    # Pending rows belong to a run still in flight; _send_chunk leaves those subscribers to it.
+    notified = set(
+        PostNotificationLog.objects.filter(post=post, status__in=("sent", "failed"))
+        .values_list("subscriber_id", flat=True)
+    )
+    stats = {"sent": 0, "failed": 0, "skipped": 0}
+    started = time.monotonic()
+    payload = PostEmailPayload(post)
+
+    def flush(chunk, skipped):
+        delta = _send_chunk(post, chunk, payload) if chunk else {"sent": 0, "failed": 0, "skipped": 0}
+        delta["skipped"] += skipped
+        for key, value in delta.items():
+            stats[key] += value
+        if on_progress and any(delta.values()):
+            on_progress(delta)
+
+    chunk = []
+    skipped = 0
+    for sub in subscribers.iterator(chunk_size=chunk_size):
+        if sub.pk in notified:
+            skipped += 1
+            continue
+        chunk.append(sub)
+        if len(chunk) >= chunk_size:
+            flush(chunk, skipped)
+            chunk, skipped = [], 0
+    flush(chunk, skipped)
+
+    elapsed = time.monotonic() - started
+    stats["elapsed_seconds"] = round(elapsed, 3)
+    stats["emails_per_second"] = round(stats["sent"] / elapsed, 1) if elapsed else 0.0
+    return stats
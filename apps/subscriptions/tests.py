@@ -1,7 +1,27 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+
+from apps.blog.models import BlogPost
 
-from .models import Subscriber
+from .imports import _json_values, import_subscribers
+from .models import NotificationJob, PostNotificationLog, Subscriber, SubscriberImportJob
+from .services import NOTIFY_CLAIM_TIMEOUT, PostEmailPayload, deliver_post_notifications, subscriber_shards
+from .tasks import send_new_post_notifications, send_notification_shard
+from .views import SUBSCRIBERS_PAGE_SIZE
 
 
 class SubscriptionFlowTest(TestCase):
@@ -11,3 +31,294 @@ class SubscriptionFlowTest(TestCase):
         subscriber.refresh_from_db()
         self.assertEqual(response.status_code, 302)
         self.assertTrue(subscriber.is_active)
+
+
+class PostNotificationTest(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(username="writer", password="pass1234")
+        self.post = BlogPost.objects.create(
+            title="Launch",
+            author=author,
+            content="Hello subscribers",
+            status=BlogPost.Status.PUBLISHED,
+        )
+        for i in range(5):
+            Subscriber.objects.create(email=f"reader{i}@example.com", is_active=True)
+        Subscriber.objects.create(email="inactive@example.com", is_active=False)
+
+    def test_notifies_each_active_subscriber_once(self):
+        send_new_post_notifications.delay(self.post.id)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.notified_sent, 5)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(PostNotificationLog.objects.filter(post=self.post, status="sent").count(), 5)
+
+        mail.outbox.clear()
+        send_new_post_notifications.delay(self.post.id)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.notified_sent, 0)
+        self.assertEqual(self.post.notified_skipped, 5)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_shards_cover_every_active_subscriber(self):
+        shards = subscriber_shards(shard_size=2)
+        self.assertEqual(len(shards), 3)
+        active = Subscriber.objects.filter(is_active=True)
+        covered = sum(active.filter(pk__gte=lo, pk__lt=hi).count() for lo, hi in shards)
+        self.assertEqual(covered, 5)
+
+    def test_retried_shard_does_not_resend_claimed_subscribers(self):
+        first = Subscriber.objects.filter(is_active=True).order_by("pk").first()
+        PostNotificationLog.objects.create(
+            post=self.post, subscriber=first, status="pending", claim="other", claimed_at=timezone.now()
+        )
+        stats = send_notification_shard(self.post.id, first.pk, first.pk + 100)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual(stats["sent"], 4)
+        self.assertNotIn(first.email, [m.to[0] for m in mail.outbox])
+
+    def test_claims_of_a_killed_run_are_taken_over_once_stale(self):
+        first = Subscriber.objects.filter(is_active=True).order_by("pk").first()
+        PostNotificationLog.objects.create(
+            post=self.post,
+            subscriber=first,
+            status="pending",
+            claim="killed",
+            claimed_at=timezone.now() - NOTIFY_CLAIM_TIMEOUT - timedelta(minutes=1),
+        )
+        stats = deliver_post_notifications(self.post)
+        self.assertEqual((stats["sent"], stats["skipped"]), (5, 0))
+        self.assertIn(first.email, [m.to[0] for m in mail.outbox])
+        self.assertEqual(PostNotificationLog.objects.get(subscriber=first).status, "sent")
+
+    def test_connection_failure_leaves_nothing_claimed_for_the_retry(self):
+        with mock.patch("django.core.mail.backends.locmem.EmailBackend.open", side_effect=OSError("smtp down")):
+            with self.assertRaises(OSError):
+                deliver_post_notifications(self.post)
+        self.assertFalse(PostNotificationLog.objects.exists())
+
+        stats = deliver_post_notifications(self.post)
+        self.assertEqual((stats["sent"], stats["skipped"]), (5, 0))
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_interrupted_chunk_releases_unsent_claims(self):
+        with mock.patch(
+            "django.core.mail.backends.locmem.EmailBackend.send_messages",
+            side_effect=[1, 1, KeyboardInterrupt],
+        ):
+            with self.assertRaises(KeyboardInterrupt):
+                deliver_post_notifications(self.post)
+        self.assertEqual(list(PostNotificationLog.objects.values_list("status", flat=True)), ["sent", "sent"])
+
+        stats = deliver_post_notifications(self.post)
+        self.assertEqual((stats["sent"], stats["skipped"]), (3, 2))
+
+    def test_render_once_payload_matches_full_render(self):
+        subscriber = Subscriber.objects.filter(is_active=True).first()
+        unsubscribe_path = reverse("unsubscribe", kwargs={"token": subscriber.verify_token})
+        ctx = {
+            "post": self.post,
+            "post_url": f"{settings.SITE_BASE_URL}{self.post.get_absolute_url()}",
+            "unsubscribe_url": f"{settings.SITE_BASE_URL}{unsubscribe_path}",
+            "site_url": settings.SITE_BASE_URL,
+        }
+        msg = PostEmailPayload(self.post).for_subscriber(subscriber.email, subscriber)
+        self.assertEqual(msg.body, render_to_string("emails/new_post.txt", ctx))
+        self.assertEqual(msg.alternatives[0][0], render_to_string("emails/new_post.html", ctx))
+
+
+class NotifySubscribersViewTest(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        self.post = BlogPost.objects.create(
+            title="Queued",
+            author=self.staff,
+            content="Body",
+            status=BlogPost.Status.PUBLISHED,
+        )
+        for i in range(3):
+            Subscriber.objects.create(email=f"fan{i}@example.com", is_active=True)
+        self.client.login(username="staff", password="pass1234")
+
+    def test_notify_queues_job_and_reports_progress(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.get(reverse("notify_subscribers", kwargs={"post_id": self.post.pk}))
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 3)
+
+        job = NotificationJob.objects.get(post=self.post)
+        progress = self.client.get(reverse("notification_job_progress", kwargs={"job_id": job.pk})).json()
+        self.assertEqual(progress["status"], NotificationJob.Status.DONE)
+        self.assertEqual(progress["total"], 3)
+        self.assertEqual(progress["sent"], 3)
+        self.assertEqual(progress["processed"], 3)
+        self.assertContains(self.client.get(reverse("dashboard")), "Subscriber Notifications")
+
+
+class SubscriberDashboardTest(TestCase):
+    def setUp(self):
+        staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        Subscriber.objects.bulk_create(
+            Subscriber(email=f"reader{i:03d}@example.com", is_active=i % 3 != 0, verify_token=f"token-{i}")
+            for i in range(SUBSCRIBERS_PAGE_SIZE + 10)
+        )
+        Subscriber.objects.create(email="alice@example.org", is_active=True)
+        self.client.login(username=staff.username, password="pass1234")
+
+    def test_list_pages_through_every_subscriber(self):
+        response = self.client.get(reverse("subscribers_list"))
+        self.assertEqual(len(response.context["subscribers"]), SUBSCRIBERS_PAGE_SIZE)
+        self.assertEqual(response.context["active_count"], Subscriber.objects.filter(is_active=True).count())
+        self.assertEqual(response.context["inactive_count"], Subscriber.objects.filter(is_active=False).count())
+
+        second = self.client.get(f"{reverse('subscribers_list')}?{response.context['next_page_query']}")
+        seen = {s.pk for s in response.context["subscribers"]} | {s.pk for s in second.context["subscribers"]}
+        self.assertEqual(seen, set(Subscriber.objects.values_list("pk", flat=True)))
+        self.assertEqual(second.context["next_page_query"], "")
+
+    def test_search_matches_email_prefix_only(self):
+        response = self.client.get(reverse("subscribers_list"), {"q": "ALI"})
+        self.assertEqual([s.email for s in response.context["subscribers"]], ["alice@example.org"])
+        response = self.client.get(reverse("subscribers_list"), {"q": "example"})
+        self.assertEqual(response.context["subscribers"], [])
+
+    def test_search_ignores_case_of_stored_email(self):
+        Subscriber.objects.create(email="Alicia@Example.com", is_active=True)
+        response = self.client.get(reverse("subscribers_list"), {"q": "alicia"})
+        self.assertEqual([s.email for s in response.context["subscribers"]], ["Alicia@Example.com"])
+        response = self.client.get(reverse("subscribers_list"), {"q": "ALICIA@ex"})
+        self.assertEqual([s.email for s in response.context["subscribers"]], ["Alicia@Example.com"])
+
+    def test_list_uses_constant_queries(self):
+        self.client.get(reverse("subscribers_list"))  # warm the cached site profile
+        # session, user, one page, one counts aggregate, recent import jobs
+        with self.assertNumQueries(5):
+            self.client.get(reverse("subscribers_list"), {"q": "reader", "status": "active"})
+
+    @mock.patch("apps.subscriptions.views.EXPORT_CHUNK_SIZE", 7)
+    async def test_export_streams_filtered_csv(self):
+        await self.async_client.alogin(username="staff", password="pass1234")
+        response = await self.async_client.get(reverse("subscribers_export"), {"status": "inactive"})
+        self.assertTrue(response.is_async)
+        lines = b"".join([chunk async for chunk in response.streaming_content]).decode().splitlines()
+        self.assertEqual(lines[0], "email,is_active,created_at,verified_at")
+        self.assertEqual(len(lines) - 1, await Subscriber.objects.filter(is_active=False).acount())
+        self.assertTrue(all(line.split(",")[1] == "no" for line in lines[1:]))
+
+    def test_export_requires_staff(self):
+        self.client.logout()
+        response = self.client.get(reverse("subscribers_export"))
+        self.assertEqual(response.status_code, 302)
+
+
+class SubscriberImportTest(TestCase):
+    def setUp(self):
+        Subscriber.objects.create(email="existing@example.com", is_active=True)
+
+    def test_csv_import_normalizes_dedupes_and_reports(self):
+        data = (
+            "name,Email\n"
+            "A, Reader@Example.com \n"
+            "B,reader@example.com\n"
+            "C,existing@example.com\n"
+            "D,not-an-email\n"
+            "E\n"
+            "F,second@example.com\n"
+        ).encode()
+        report = import_subscribers(io.BytesIO(data), "csv", batch_size=2)
+        self.assertEqual(report, {"rows": 6, "inserted": 2, "duplicates": 2, "invalid": 2})
+        imported = Subscriber.objects.get(email="reader@example.com")
+        self.assertTrue(imported.is_active)
+        self.assertTrue(imported.verify_token)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_rows_lost_to_a_concurrent_insert_count_as_duplicates(self):
+        bulk_create = Subscriber.objects.bulk_create
+
+        def racing_bulk_create(objs, **kwargs):
+            Subscriber.objects.create(email="racer@example.com")  # another request wins the race
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(Subscriber.objects, "bulk_create", side_effect=racing_bulk_create):
+            report = import_subscribers(io.BytesIO(b"racer@example.com\nslow@example.com\n"), "csv")
+        self.assertEqual(report, {"rows": 2, "inserted": 1, "duplicates": 1, "invalid": 0})
+
+    def test_headerless_csv_uses_first_column(self):
+        report = import_subscribers(io.BytesIO(b"one@example.com\ntwo@example.com,x\n"), "csv")
+        self.assertEqual(report["inserted"], 2)
+
+    def test_json_array_and_lines(self):
+        array = json.dumps(["a@example.com", {"email": "B@example.com"}, {"name": "no email"}, 42]).encode()
+        self.assertEqual(
+            import_subscribers(io.BytesIO(array), "json", activate=False),
+            {"rows": 4, "inserted": 2, "duplicates": 0, "invalid": 2},
+        )
+        self.assertFalse(Subscriber.objects.get(email="b@example.com").is_active)
+
+        lines = b'{"email": "c@example.com"}\n{"email": "a@example.com"}\n'
+        self.assertEqual(import_subscribers(io.BytesIO(lines), "json")["inserted"], 1)
+
+    def test_json_values_survive_chunk_boundaries(self):
+        items = [{"email": f"user{i}@example.com", "n": i * 1000} for i in range(20)] + [12345]
+        text = io.StringIO(json.dumps(items))
+        self.assertEqual(list(_json_values(text, chunk_size=7)), [item["email"] for item in items[:-1]] + [12345])
+
+    def test_malformed_json_raises(self):
+        with self.assertRaises(ValueError):
+            import_subscribers(io.BytesIO(b'["a@example.com", {"email": '), "json", batch_size=1)
+        self.assertTrue(Subscriber.objects.filter(email="a@example.com").exists())
+
+    def test_management_command(self):
+        out = io.StringIO()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / "list.jsonl"
+        path.write_bytes(b'"cmd@example.com"\n"cmd@example.com"\n')
+        call_command("import_subscribers", str(path), stdout=out)
+        self.assertIn("Inserted:   1", out.getvalue())
+        self.assertIn("Duplicates: 1", out.getvalue())
+
+    def test_existing_addresses_match_regardless_of_case(self):
+        Subscriber.objects.create(email="Mixed@Example.com", is_active=False)
+        report = import_subscribers(io.BytesIO(b"email\nmixed@example.com\nEXISTING@example.com\n"), "csv")
+        self.assertEqual((report["inserted"], report["duplicates"]), (0, 2))
+        self.assertFalse(Subscriber.objects.get(email="Mixed@Example.com").is_active)
+        self.assertEqual(Subscriber.objects.count(), 2)
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=0)
+    def test_dashboard_upload_is_imported_in_the_background(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        self.client.login(username=staff.username, password="pass1234")
+        upload = SimpleUploadedFile("list.csv", b"email\nup@example.com\nexisting@example.com\n", "text/csv")
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse("subscribers_import"), {"file": upload, "activate": "on"}, follow=True)
+        self.assertContains(response, "Import queued")
+        job = SubscriberImportJob.objects.get()
+        self.assertEqual((job.status, job.filename), (SubscriberImportJob.Status.QUEUED, "list.csv"))
+        self.assertFalse(Subscriber.objects.filter(email="up@example.com").exists())
+
+        for callback in callbacks:
+            callback()
+        progress = self.client.get(reverse("subscriber_import_progress", kwargs={"job_id": job.pk})).json()
+        self.assertEqual(progress["status"], SubscriberImportJob.Status.DONE)
+        self.assertEqual((progress["rows"], progress["inserted"], progress["duplicates"]), (2, 1, 1))
+        self.assertTrue(Subscriber.objects.get(email="up@example.com").is_active)
+        self.assertEqual(list(Path(media.name).rglob("*.csv")), [])
+        self.assertContains(self.client.get(reverse("subscribers_list")), "list.csv")
+
+    def test_malformed_upload_marks_the_job_failed(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        staff = User.objects.create_user(username="staff", password="pass1234", is_staff=True)
+        self.client.login(username=staff.username, password="pass1234")
+        upload = SimpleUploadedFile("list.json", b'["a@example.com", {"email": ', "application/json")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("subscribers_import"), {"file": upload})
+        job = SubscriberImportJob.objects.get()
+        self.assertEqual(job.status, SubscriberImportJob.Status.FAILED)
+        self.assertIn("Malformed JSON", job.error)
\ No newline at end of file
@@ -1,10 +1,14 @@
 from django.urls import path
 
 from .views import (
+    notification_job_progress_view,
     notify_subscribers_view,
     subscribe_view,
     subscriber_delete_view,
+    subscriber_import_job_progress_view,
     subscriber_toggle_view,
+    subscribers_export_view,
+    subscribers_import_view,
     subscribers_list_view,
     unsubscribe_view,
     verify_subscription_view,
@@ -17,7 +21,11 @@ urlpatterns = [
 
     # Dashboard subscriber management
     path("dashboard/", subscribers_list_view, name="subscribers_list"),
+    path("dashboard/import/", subscribers_import_view, name="subscribers_import"),
+    path("dashboard/import/<int:job_id>/", subscriber_import_job_progress_view, name="subscriber_import_progress"),
+    path("dashboard/export.csv", subscribers_export_view, name="subscribers_export"),
     path("dashboard/<int:pk>/toggle/", subscriber_toggle_view, name="subscriber_toggle"),
     path("dashboard/<int:pk>/delete/", subscriber_delete_view, name="subscriber_delete"),
     path("notify/<int:post_id>/", notify_subscribers_view, name="notify_subscribers"),
+    path("notify/jobs/<int:job_id>/", notification_job_progress_view, name="notification_job_progress"),
 ]
@@ -1,16 +1,26 @@
+import csv
 import logging
+from urllib.parse import urlencode
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.core.mail import EmailMultiAlternatives
+from django.db.models import Count, Q
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
+from django.views.decorators.http import require_POST
 
-from .forms import SubscribeForm
-from .models import PostNotificationLog, Subscriber
+from apps.blog.pagination import keyset_page
+from apps.portfolio.ratelimit import rate_limit
+
+from .forms import SubscribeForm, SubscriberImportForm
+from .models import NotificationJob, Subscriber, SubscriberImportJob
+from .services import email_prefix_filter
 
 logger = logging.getLogger(__name__)
 _staff = lambda u: u.is_staff  # noqa: E731
@@ -18,6 +28,7 @@ _staff = lambda u: u.is_staff  # noqa: E731
 
 # ─── Public ──────────────────────────────────────────────────────────────────
 
+@rate_limit("subscribe")
 def subscribe_view(request):
     if request.method == "POST":
         form = SubscribeForm(request.POST)
@@ -87,10 +98,28 @@ def unsubscribe_view(request, token):
 
 # ─── Dashboard subscriber management ─────────────────────────────────────────
 
+SUBSCRIBERS_PAGE_SIZE = 50
+EXPORT_CHUNK_SIZE = 2000
+
+
+def _filtered_subscribers(request):
+    """Subscribers matching the ``?q=`` email prefix and ``?status=`` filters, plus the filters applied."""
+    subs = Subscriber.objects.all()
+    query = request.GET.get("q", "").strip().lower()
+    status = request.GET.get("status", "")
+    if query:
+        subs = subs.filter(email_prefix_filter(query))
+    if status in ("active", "inactive"):
+        subs = subs.filter(is_active=status == "active")
+    else:
+        status = ""
+    return subs, {key: value for key, value in (("q", query), ("status", status)) if value}
+
+
 @login_required
 @user_passes_test(_staff)
 def subscribers_list_view(request):
-    """Dashboard: list all subscribers, add new ones directly as active."""
+    """Dashboard: page through subscribers (email-prefix search), add new ones directly as active."""
     if request.method == "POST":
         email = request.POST.get("email", "").strip().lower()
         if email:
@@ -105,14 +134,94 @@ def subscribers_list_view(request):
                 messages.success(request, f"{email} already exists — marked as active.")
         return redirect("subscribers_list")
 
-    subs = Subscriber.objects.order_by("-created_at")
+    subs, filters = _filtered_subscribers(request)
+    try:
+        page, next_cursor = keyset_page(subs, request.GET.get("cursor") or None, SUBSCRIBERS_PAGE_SIZE, "created_at")
+    except ValueError:
+        page, next_cursor = keyset_page(subs, None, SUBSCRIBERS_PAGE_SIZE, "created_at")
+
+    counts = Subscriber.objects.aggregate(
+        active_count=Count("pk", filter=Q(is_active=True)),
+        inactive_count=Count("pk", filter=Q(is_active=False)),
+    )
     return render(request, "dashboard/subscribers.html", {
-        "subscribers": subs,
-        "active_count":   subs.filter(is_active=True).count(),
-        "inactive_count": subs.filter(is_active=False).count(),
+        "subscribers": page,
+        **counts,
+        "query": filters.get("q", ""),
+        "status": filters.get("status", ""),
+        "filter_query": urlencode(filters),
+        "next_page_query": urlencode({**filters, "cursor": next_cursor}) if next_cursor else "",
+        "is_first_page": not request.GET.get("cursor"),
+        "import_form": SubscriberImportForm(),
+        "import_jobs": SubscriberImportJob.objects.all()[:5],
     })
 
 
+@login_required
+@user_passes_test(_staff)
+@require_POST
+def subscribers_import_view(request):
+    """Queue an uploaded CSV/JSON file for a background import; the subscriber page polls its progress."""
+    from .tasks import queue_subscriber_import
+
+    form = SubscriberImportForm(request.POST, request.FILES)
+    if not form.is_valid():
+        messages.error(request, "Choose a CSV or JSON file to import.")
+        return redirect("subscribers_list")
+
+    queue_subscriber_import(form.cleaned_data["file"], activate=form.cleaned_data["activate"])
+    messages.success(request, "Import queued — progress is shown below.")
+    return redirect("subscribers_list")
+
+
+@login_required
+@user_passes_test(_staff)
+def subscriber_import_job_progress_view(request, job_id):
+    """JSON progress for an import job (polled by the subscriber page)."""
+    job = get_object_or_404(SubscriberImportJob, pk=job_id)
+    return JsonResponse(job.as_dict())
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the CSV row straight back to the response."""
+
+    def write(self, value):
+        return value
+
+
+@login_required
+@user_passes_test(_staff)
+def subscribers_export_view(request):
+    """
+    Stream the (filtered) subscriber list as CSV without materialising it. The
+    body is an async iterator reading keyset chunks of ``EXPORT_CHUNK_SIZE``
+    rows, so the ASGI handler sends each chunk as it is read instead of
+    collecting a sync iterator into a list first.
+    """
+    subs, _ = _filtered_subscribers(request)
+    rows = subs.order_by("pk").values_list("pk", "email", "is_active", "created_at", "verified_at")
+    writer = csv.writer(_Echo())
+
+    async def stream():
+        yield writer.writerow(["email", "is_active", "created_at", "verified_at"])
+        last_pk = 0
+        while chunk := await sync_to_async(list)(rows.filter(pk__gt=last_pk)[:EXPORT_CHUNK_SIZE]):
+            last_pk = chunk[-1][0]
+            yield "".join(
+                writer.writerow([
+                    email,
+                    "yes" if is_active else "no",
+                    created_at.isoformat(),
+                    verified_at.isoformat() if verified_at else "",
+                ])
+                for _, email, is_active, created_at, verified_at in chunk
+            )
+
+    response = StreamingHttpResponse(stream(), content_type="text/csv")
+    response["Content-Disposition"] = 'attachment; filename="subscribers.csv"'
+    return response
+
+
 @login_required
 @user_passes_test(_staff)
 def subscriber_toggle_view(request, pk):
@@ -143,9 +252,9 @@ def subscriber_delete_view(request, pk):
 @login_required
 @user_passes_test(_staff)
 def notify_subscribers_view(request, post_id):
-    """Manually trigger notification emails for a specific post."""
+    """Queue notification emails for a specific post; the dashboard polls the job's progress."""
     from apps.blog.models import BlogPost
-    from .services import send_post_email
+    from .tasks import queue_post_notifications
 
     post = get_object_or_404(BlogPost, pk=post_id)
 
@@ -153,38 +262,21 @@ def notify_subscribers_view(request, post_id):
         messages.error(request, "Only published posts can be sent to subscribers. Publish it first.")
         return redirect("dashboard")
 
-    subscribers = Subscriber.objects.filter(is_active=True)
-    if not subscribers.exists():
+    if not Subscriber.objects.filter(is_active=True).exists():
         messages.warning(request, "No active subscribers yet.")
         return redirect("dashboard")
 
-    sent = 0
-    skipped = 0
-    failed = 0
-
-    for sub in subscribers:
-        already_sent = PostNotificationLog.objects.filter(post=post, subscriber=sub).exists()
-        if already_sent:
-            skipped += 1
-            continue
-        try:
-            send_post_email(subscriber_email=sub.email, post=post, subscriber=sub)
-            PostNotificationLog.objects.create(post=post, subscriber=sub, status="sent")
-            sent += 1
-        except Exception as exc:
-            logger.exception("Manual notify failed for %s", sub.email)
-            PostNotificationLog.objects.create(post=post, subscriber=sub, status="failed", error=str(exc))
-            failed += 1
-
-    parts = []
-    if sent:    parts.append(f"{sent} email{'s' if sent != 1 else ''} sent")
-    if skipped: parts.append(f"{skipped} already notified")
-    if failed:  parts.append(f"{failed} failed")
-
-    msg_text = " · ".join(parts) if parts else "Nothing to send"
-    if failed:
-        messages.warning(request, f"Notification done — {msg_text}. Check email settings for failures.")
-    else:
-        messages.success(request, f"Notification done — {msg_text}.")
-
+    job = queue_post_notifications(post.pk)
+    messages.success(
+        request,
+        f"Notification queued for {job.total} subscriber{'s' if job.total != 1 else ''} — progress is shown below.",
+    )
     return redirect("dashboard")
+
+
+@login_required
+@user_passes_test(_staff)
+def notification_job_progress_view(request, job_id):
+    """JSON progress for a notification job (polled by the dashboard)."""
+    job = get_object_or_404(NotificationJob, pk=job_id)
+    return JsonResponse(job.as_dict())
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from .models import QueuedTask
+
+
+@admin.register(QueuedTask)
+class QueuedTaskAdmin(admin.ModelAdmin):
+    list_display = ("task_name", "status", "attempts", "retries", "available_at", "created_at", "finished_at")
+    list_filter = ("status", "task_name")
+    readonly_fields = ("args", "kwargs", "last_error")
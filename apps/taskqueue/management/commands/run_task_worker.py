@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.taskqueue.queue import run_pending
+
+
+class Command(BaseCommand):
+    help = "Run tasks queued in the database (used when no Redis broker is configured)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Drain due tasks, then exit.")
+        parser.add_argument("--sleep", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+
+    def handle(self, *args, **options):
+        if options["once"]:
+            ran = run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} queued task(s)."))
+            return
+
+        self.stdout.write("Task worker started. Press Ctrl+C to stop.")
+        try:
+            while True:
+                if not run_pending(limit=50):
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            self.stdout.write("Task worker stopped.")
@@ -0,0 +1,194 @@
+"""
+Database-backed fallback for Celery.
+
+When ``TASK_QUEUE_BACKEND = "database"`` (production without ``REDIS_URL``),
+``task.delay()`` / ``apply_async()`` write a ``QueuedTask`` row instead of
+publishing to a broker, and ``manage.py run_task_worker`` executes the rows.
+Inside the worker tasks run eagerly, so anything they dispatch (chords,
+nested ``delay()`` calls) runs in the worker process rather than the web one.
+A task's own ``self.retry()`` reschedules its row at the requested countdown
+and the next run sees the incremented ``self.request.retries``; a retry raised
+by something the task ran inline counts as a failed attempt of the row. While
+a row runs, its lease (``locked_at``) is renewed every ``HEARTBEAT_INTERVAL``
+so another worker does not take over a long fan-out.
+"""
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from celery import Task, current_app
+from celery.exceptions import Retry
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+RETRY_BACKOFF_SECONDS = 30
+STALE_AFTER = timedelta(minutes=15)
+HEARTBEAT_INTERVAL = STALE_AFTER / 3
+
+
+def database_queue_enabled() -> bool:
+    return getattr(settings, "TASK_QUEUE_BACKEND", "celery") == "database"
+
+
+class DatabaseTask(Task):
+    """Default task class for the project's Celery app (see ``config/celery.py``)."""
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        if self.app.conf.task_always_eager or not database_queue_enabled():
+            return super().apply_async(args, kwargs, **options)
+        return enqueue(self.name, args, kwargs, countdown=options.get("countdown"), eta=options.get("eta"))
+
+
+def enqueue(task_name: str, args=None, kwargs=None, *, countdown=None, eta=None):
+    from .models import QueuedTask
+
+    available_at = eta or timezone.now()
+    if countdown:
+        available_at += timedelta(seconds=countdown)
+    return QueuedTask.objects.create(
+        task_name=task_name,
+        args=list(args or ()),
+        kwargs=dict(kwargs or {}),
+        available_at=available_at,
+    )
+
+
+def claim_next():
+    """
+    Atomically claim the next due task, or return ``None``.
+
+    The conditional ``update()`` is the lock: only one worker can flip a row
+    from its observed state to running. Rows left running by a crashed worker
+    become claimable again after ``STALE_AFTER``.
+    """
+    from .models import QueuedTask
+
+    now = timezone.now()
+    due = QueuedTask.objects.filter(
+        Q(status=QueuedTask.Status.PENDING, available_at__lte=now)
+        | Q(status=QueuedTask.Status.RUNNING, locked_at__lt=now - STALE_AFTER)
+    )
+    for row in due.only("id", "status", "locked_at")[:10]:
+        claimed = QueuedTask.objects.filter(pk=row.pk, status=row.status, locked_at=row.locked_at).update(
+            status=QueuedTask.Status.RUNNING, locked_at=now
+        )
+        if claimed:
+            return QueuedTask.objects.get(pk=row.pk)
+    return None
+
+
+def _conf_key(app, name: str) -> str:
+    # With ``namespace="CELERY"`` the prefixed Django setting shadows the plain key.
+    return f"{app.namespace}_{name.upper()}" if app.namespace else name
+
+
+@contextmanager
+def eager_execution(app=None):
+    """Run tasks (and everything they dispatch) inline for the duration of the block."""
+    app = app or current_app
+    keys = [_conf_key(app, "task_always_eager"), _conf_key(app, "task_eager_propagates")]
+    previous = [app.conf.get(key) for key in keys]
+    for key in keys:
+        app.conf[key] = True
+    try:
+        yield
+    finally:
+        for key, value in zip(keys, previous):
+            app.conf[key] = value
+
+
+@contextmanager
+def _lease(row):
+    """Keep ``row`` claimed while the block runs by bumping ``locked_at`` in a background thread."""
+    from .models import QueuedTask
+
+    stop = threading.Event()
+
+    def renew():
+        try:
+            while not stop.wait(HEARTBEAT_INTERVAL.total_seconds()):
+                QueuedTask.objects.filter(pk=row.pk, status=QueuedTask.Status.RUNNING).update(
+                    locked_at=timezone.now()
+                )
+        except Exception:
+            logger.warning("Could not renew the lease of queued task %s", row.pk, exc_info=True)
+        finally:
+            connection.close()
+
+    heartbeat = threading.Thread(target=renew, name=f"lease-{row.pk}", daemon=True)
+    heartbeat.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        heartbeat.join()
+
+
+def run_task(row) -> bool:
+    """Execute a claimed row. Returns ``True`` on success; failures are rescheduled with backoff."""
+    from .models import QueuedTask
+
+    row.attempts += 1
+    task_id = str(uuid.uuid4())
+    try:
+        task = current_app.tasks[row.task_name]
+        with _lease(row), eager_execution():
+            task.apply(args=row.args, kwargs=row.kwargs, task_id=task_id, retries=row.retries, throw=True)
+    except Retry as exc:
+        if exc.sig is None or exc.sig.id != task_id:
+            # A subtask that ran inline (e.g. a chord shard) asked to retry: the row failed.
+            return _fail(row, exc)
+        logger.info("Queued task %s (id=%s) asked to retry: %s", row.task_name, row.pk, exc.humanize())
+        row.retries += 1
+        row.last_error = repr(exc.exc) if exc.exc else ""
+        row.status = QueuedTask.Status.PENDING
+        if isinstance(exc.when, datetime):
+            row.available_at = exc.when
+        else:
+            row.available_at = timezone.now() + timedelta(seconds=exc.when or 0)
+        row.save(update_fields=["attempts", "retries", "status", "available_at", "last_error"])
+        return False
+    except Exception as exc:
+        return _fail(row, exc)
+
+    row.status = QueuedTask.Status.DONE
+    row.finished_at = timezone.now()
+    row.save(update_fields=["attempts", "status", "finished_at"])
+    return True
+
+
+def _fail(row, exc) -> bool:
+    """Reschedule ``row`` with backoff, or mark it failed once ``max_attempts`` is reached."""
+    from .models import QueuedTask
+
+    logger.error(
+        "Queued task %s (id=%s) failed on attempt %s", row.task_name, row.pk, row.attempts, exc_info=exc
+    )
+    row.last_error = repr(exc.exc if isinstance(exc, Retry) and exc.exc else exc)
+    # A task that retries itself has already spent its own ``max_retries`` when it raises.
+    if not row.retries and row.attempts < row.max_attempts:
+        row.status = QueuedTask.Status.PENDING
+        row.available_at = timezone.now() + timedelta(seconds=RETRY_BACKOFF_SECONDS * 2 ** (row.attempts - 1))
+    else:
+        row.status = QueuedTask.Status.FAILED
+        row.finished_at = timezone.now()
+    row.save(update_fields=["attempts", "status", "available_at", "last_error", "finished_at"])
+    return False
+
+
+def run_pending(limit: int | None = None) -> int:
+    """Run due tasks until the queue is empty (or ``limit`` is reached). Returns how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        row = claim_next()
+        if row is None:
+            break
+        run_task(row)
+        ran += 1
+    return ran
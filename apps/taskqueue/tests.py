@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+from smtplib import SMTPException
+from unittest import mock
+
+from celery import shared_task
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from apps.blog.models import BlogPost
+from apps.subscriptions.models import NotificationJob, Subscriber
+from apps.subscriptions.tasks import send_new_post_notifications
+from config.celery import app as celery_app
+
+from . import queue
+from .models import QueuedTask
+
+RETRY_CALLS = []
+
+
+@shared_task(bind=True, max_retries=1, default_retry_delay=120)
+def always_retries(self):
+    RETRY_CALLS.append(self.request.retries)
+    raise self.retry(exc=ValueError("still down"))
+
+
+@override_settings(TASK_QUEUE_BACKEND="database")
+class DatabaseQueueTest(TestCase):
+    def setUp(self):
+        # The test settings force eager execution; the queue only kicks in without it.
+        celery_app.conf["CELERY_TASK_ALWAYS_EAGER"] = False
+        self.addCleanup(celery_app.conf.__setitem__, "CELERY_TASK_ALWAYS_EAGER", True)
+
+        author = User.objects.create_user(username="writer", password="pass1234")
+        self.post = BlogPost.objects.create(
+            title="Queued post",
+            author=author,
+            content="Body",
+            status=BlogPost.Status.PUBLISHED,
+        )
+        Subscriber.objects.create(email="reader@example.com", is_active=True)
+
+    def test_delay_enqueues_and_worker_runs_task(self):
+        send_new_post_notifications.delay(self.post.id)
+        row = QueuedTask.objects.get()
+        self.assertEqual(row.task_name, send_new_post_notifications.name)
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command("run_task_worker", "--once", stdout=open("/dev/null", "w"))
+        row.refresh_from_db()
+        self.assertEqual(row.status, QueuedTask.Status.DONE)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertFalse(celery_app.conf.task_always_eager)
+
+    def test_failed_task_is_rescheduled(self):
+        send_new_post_notifications.delay(999999)
+        call_command("run_task_worker", "--once", stdout=open("/dev/null", "w"))
+        row = QueuedTask.objects.get()
+        self.assertEqual(row.status, QueuedTask.Status.PENDING)
+        self.assertEqual(row.attempts, 1)
+        self.assertIn("DoesNotExist", row.last_error)
+
+    def test_task_retry_uses_its_own_countdown_and_max_retries(self):
+        RETRY_CALLS.clear()
+        always_retries.delay()
+        call_command("run_task_worker", "--once", stdout=open("/dev/null", "w"))
+        row = QueuedTask.objects.get()
+        self.assertEqual((row.status, row.retries), (QueuedTask.Status.PENDING, 1))
+        self.assertGreater(row.available_at, timezone.now() + timedelta(seconds=100))
+
+        QueuedTask.objects.update(available_at=timezone.now())
+        call_command("run_task_worker", "--once", stdout=open("/dev/null", "w"))
+        row.refresh_from_db()
+        self.assertEqual(RETRY_CALLS, [0, 1])
+        self.assertEqual(row.status, QueuedTask.Status.FAILED)
+        self.assertIn("still down", row.last_error)
+
+    @mock.patch("apps.subscriptions.tasks.deliver_post_notifications", side_effect=SMTPException("down"))
+    def test_inline_subtask_retry_fails_the_row_after_max_attempts(self, deliver):
+        send_new_post_notifications.delay(self.post.id)
+        call_command("run_task_worker", "--once", stdout=open("/dev/null", "w"))
+        row = QueuedTask.objects.get()
+        # The shard's self.retry() is not the row's own retry.
+        self.assertEqual((row.status, row.attempts, row.retries), (QueuedTask.Status.PENDING, 1, 0))
+        self.assertIn("down", row.last_error)
+
+        for _ in range(row.max_attempts - 1):
+            QueuedTask.objects.update(available_at=timezone.now())
+            call_command("run_task_worker", "--once", stdout=open("/dev/null", "w"))
+        row.refresh_from_db()
+        self.assertEqual(row.status, QueuedTask.Status.FAILED)
+        self.assertEqual(row.attempts, row.max_attempts)
+        self.assertFalse(NotificationJob.objects.filter(status=NotificationJob.Status.RUNNING).exists())
+
+
+class LeaseTest(TransactionTestCase):
+    # The heartbeat thread has its own connection, so the row must be committed.
+    def test_running_task_renews_its_lease(self):
+        stale = timezone.now() - queue.STALE_AFTER * 2
+        row = QueuedTask.objects.create(
+            task_name="x", status=QueuedTask.Status.RUNNING, available_at=stale, locked_at=stale
+        )
+        with mock.patch.object(queue, "HEARTBEAT_INTERVAL", timedelta(milliseconds=10)), queue._lease(row):
+            for _ in range(200):
+                row.refresh_from_db()
+                if row.locked_at > stale:
+                    break
+                time.sleep(0.01)
+        self.assertGreater(row.locked_at, timezone.now() - queue.STALE_AFTER)
+        self.assertIsNone(queue.claim_next())
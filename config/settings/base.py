@@ -31,6 +31,7 @@ INSTALLED_APPS = [
     "apps.subscriptions",
     "apps.chatbot",
     "apps.api",
+    "apps.taskqueue",
 ]
 
 MIDDLEWARE = [
@@ -127,6 +128,11 @@ else:
         }
     }
 
+# Anonymous full-page cache (apps/portfolio/cache.py); entries are also invalidated on save
+PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "600"))
+# Staff dashboard KPI counters (apps/portfolio/kpis.py); also dropped when the counted models change
+DASHBOARD_KPI_TIMEOUT = int(os.getenv("DASHBOARD_KPI_TIMEOUT", "30"))
+
 CELERY_BROKER_URL = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
 CELERY_ACCEPT_CONTENT = ["json"]
@@ -136,9 +142,41 @@ CELERY_TIMEZONE = TIME_ZONE
 CELERY_TASK_ALWAYS_EAGER = _env_bool("CELERY_TASK_ALWAYS_EAGER", "False")
 CELERY_TASK_EAGER_PROPAGATES = True
 CELERY_TASK_STORE_EAGER_RESULT = False
+# "celery" publishes to the broker; "database" stores tasks for `manage.py run_task_worker`
+TASK_QUEUE_BACKEND = os.getenv("TASK_QUEUE_BACKEND", "celery")
+
+# Blog search: "builtin" (in-memory BM25 index, apps/blog/search.py) or "postgres" (GIN-indexed SearchVector)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "builtin")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Pooled clients in apps/chatbot/services/openai_client.py; OPENAI_BASE_URL points at a proxy or stub server
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "")
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "30"))
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+# Completions in flight per process; further requests wait up to OPENAI_QUEUE_TIMEOUT seconds for a slot
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+OPENAI_QUEUE_TIMEOUT = float(os.getenv("OPENAI_QUEUE_TIMEOUT", "10"))
+# Chatbot answer cache (apps/chatbot/services/answer_cache.py); CHAT_CACHE_TIMEOUT=0 turns it off
+CHAT_CACHE_TIMEOUT = int(os.getenv("CHAT_CACHE_TIMEOUT", "3600"))
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", "500"))
+# Opt-in: cosine similarity at which a near-duplicate prompt reuses a cached answer (0 = exact matches only).
+# Hashed term vectors score prompts that differ in one entity ("Python" vs "Java") above 0.9, so keep it high.
+CHAT_CACHE_SIMILARITY = float(os.getenv("CHAT_CACHE_SIMILARITY", "0"))
+# Retrieval index for chatbot answers (apps/chatbot/services/retrieval.py): memory-mapped vectors, passages per prompt
+CHAT_INDEX_PATH = os.getenv("CHAT_INDEX_PATH") or str(BASE_DIR / "var" / "chat_index.npy")
+CHAT_CONTEXT_CHUNKS = int(os.getenv("CHAT_CONTEXT_CHUNKS", "4"))
+# Sliding-window request budgets per endpoint (apps/portfolio/ratelimit.py): "<count>/<s|m|h|d>" per client IP and site-wide
+RATE_LIMIT_ENABLED = _env_bool("RATE_LIMIT_ENABLED", "True")
+RATE_LIMITS = {
+    "chat": {"ip": "20/m", "global": "300/m"},
+    "contact": {"ip": "5/h", "global": "100/h"},
+    "subscribe": {"ip": "10/h", "global": "300/h"},
+    "comment": {"ip": "10/m", "global": "200/m"},
+}
+# Reverse proxies in front of the app; the client IP is the X-Forwarded-For entry the outermost one added
+RATE_LIMIT_PROXY_COUNT = int(os.getenv("RATE_LIMIT_PROXY_COUNT", "0"))
 SITE_BASE_URL = os.getenv("SITE_BASE_URL", "http://127.0.0.1:8000")
 
 LOGGING = {
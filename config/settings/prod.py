@@ -20,9 +20,12 @@ else:
             "LOCATION": "prod-cache",
         }
     }
-    # No Redis → run Celery tasks synchronously so emails send immediately
-    CELERY_TASK_ALWAYS_EAGER = True
-    CELERY_TASK_EAGER_PROPAGATES = True
+    # LocMem is per-process: a save only invalidates the worker that handled it,
+    # so keep other workers' cached pages short-lived.
+    PAGE_CACHE_TIMEOUT = int(os.getenv("PAGE_CACHE_TIMEOUT", "60"))
+    # No Redis → queue tasks in the database; `manage.py run_task_worker` runs them
+    TASK_QUEUE_BACKEND = os.getenv("TASK_QUEUE_BACKEND", "database")
+    CELERY_TASK_ALWAYS_EAGER = TASK_QUEUE_BACKEND != "database"
 
 # ── Security ────────────────────────────────────────────────────
 SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
@@ -46,6 +46,37 @@ document.addEventListener("DOMContentLoaded", () => {
     return row;
   }
 
+  /* ── Server-sent events reader ───────────────────── */
+  // Appends each `data: {"delta": …}` event to `row` as it arrives; resolves on `event: done`.
+  async function readStream(body, row) {
+    const reader  = body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+        const frame = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        if (frame.startsWith("event: done")) return;
+
+        const data = frame.split("\n").find((line) => line.startsWith("data: "));
+        if (!data) continue;
+        const { delta } = JSON.parse(data.slice(6));
+        if (row.classList.contains("typing")) {
+          row.classList.remove("typing");
+          row.textContent = "";
+        }
+        row.textContent += delta;
+        log.scrollTop = log.scrollHeight;
+      }
+    }
+  }
+
   /* ── Submit ─────────────────────────────────────── */
   form.addEventListener("submit", async (e) => {
     e.preventDefault();
@@ -56,22 +87,31 @@ document.addEventListener("DOMContentLoaded", () => {
     input.value = "";
     input.disabled = true;
 
-    const thinking = addMsg("Thinking…", "bot typing");
+    const reply = addMsg("Thinking…", "bot typing");
 
     try {
-      const res  = await fetch("/chatbot/", {
+      const res = await fetch("/chatbot/stream/", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: { "Content-Type": "application/json", Accept: "text/event-stream" },
         body: JSON.stringify({ message }),
       });
 
-      let data = {};
-      try { data = await res.json(); } catch { data = { error: "Invalid response." }; }
+      // Validation and rate-limit errors come back as plain JSON
+      if (!res.ok || !res.body || !(res.headers.get("Content-Type") || "").startsWith("text/event-stream")) {
+        let data = {};
+        try { data = await res.json(); } catch { data = { error: "Invalid response." }; }
+        reply.remove();
+        addMsg(data.reply || data.error || "No response.", "bot");
+        return;
+      }
 
-      thinking.remove();
-      addMsg(data.reply || data.error || "No response.", "bot");
+      await readStream(res.body, reply);
+      if (reply.classList.contains("typing")) {
+        reply.classList.remove("typing");
+        reply.textContent = "No response.";
+      }
     } catch {
-      thinking.remove();
+      if (reply.classList.contains("typing")) reply.remove();
       addMsg("Network error. Please try again.", "bot");
     } finally {
       input.disabled = false;